@@ -0,0 +1,55 @@
+import logging
+
+import websockets
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+from ..core.audio_format import AudioFormatError
+from ..core.config import get_settings
+from ..services.admission import get_admission_controller
+from ..services.batch import decode_audio, process_recording
+from ..services.key_validator import get_key_validator
+
+log = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/v1")
+
+
+@router.post("/batch")
+async def batch_endpoint(
+    audio: UploadFile = File(...),
+    recipe: str = Form(...),
+    replies: bool = Form(True),
+):
+    """
+    Process a recorded session faster than real time: transcript, intents,
+    replies and step transitions per utterance (see services/batch.py).
+    """
+    if not get_key_validator().configured:
+        raise HTTPException(503, "OpenAI API key not configured")
+
+    max_bytes = int(get_settings().batch_max_upload_mb * 1024 * 1024)
+    data = await audio.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise HTTPException(413, f"Audio larger than {max_bytes} bytes")
+    try:
+        samples, fmt = decode_audio(data)
+    except AudioFormatError as e:
+        raise HTTPException(400, str(e))
+    log.info(f"📼 Batch upload '{audio.filename}': {len(samples) / fmt.sample_rate:.1f}s, {fmt}")
+
+    # A batch holds an upstream socket like a live session does
+    admission_control = get_admission_controller()
+    admission = await admission_control.admit()
+    if not admission.admitted:
+        return JSONResponse(
+            {"error": f"Server busy ({admission.reason}), please retry.", "retry_after": admission.retry_after_s},
+            status_code=503,
+            headers={"Retry-After": str(int(admission.retry_after_s))},
+        )
+    try:
+        return await process_recording(samples, fmt, recipe, replies)
+    except (OSError, websockets.WebSocketException) as openai_error:
+        log.error(f"💥 Batch upstream error: {openai_error}")
+        raise HTTPException(502, f"OpenAI connection failed: {openai_error}")
+    finally:
+        admission_control.release()
@@ -0,0 +1,98 @@
+"""
+Per-session outbound writer for the browser WebSocket.
+
+Token-sized response deltas are coalesced into one ``{"delta": ...}``
+frame per time window or byte budget. Control messages (tts,
+transcription, error, ...) are never delayed: pending deltas are flushed
+first so the transcript stays in order, then the control message goes out.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import WebSocket
+from starlette.websockets import WebSocketState
+
+log = logging.getLogger(__name__)
+
+# Bytes a separate {"delta":"..."} text frame costs beyond its payload
+DELTA_FRAME_OVERHEAD = len('{"delta":""}') + 2
+
+
+class OutboundWriter:
+    def __init__(self, ws: WebSocket, window_ms: int, max_bytes: int) -> None:
+        self.ws = ws
+        self.window_s = window_ms / 1000
+        self.max_bytes = max_bytes
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+        self.frames_sent = 0
+        self.deltas_in = 0
+        self.delta_frames = 0
+        self.bytes_saved = 0
+        self.dropped = 0
+
+    async def _write(self, message: Dict[str, Any]) -> bool:
+        async with self._lock:
+            if self.ws.application_state != WebSocketState.CONNECTED:
+                self.dropped += 1
+                return False
+            await self.ws.send_json(message)
+            self.frames_sent += 1
+            return True
+
+    async def delta(self, text: str) -> None:
+        """Queue a response delta; sent within ``window_ms`` or ``max_bytes``."""
+        self.deltas_in += 1
+        if self.window_s <= 0:
+            if await self._write({"delta": text}):
+                self.delta_frames += 1
+            return
+
+        self._pending.append(text)
+        self._pending_bytes += len(text)
+        if self._pending_bytes >= self.max_bytes:
+            await self.flush()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.window_s, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_bytes = self._pending, [], 0
+        text = "".join(batch)
+        if await self._write({"delta": text}):
+            self.delta_frames += 1
+            self.bytes_saved += (len(batch) - 1) * DELTA_FRAME_OVERHEAD
+
+    async def send(self, message: Dict[str, Any]) -> bool:
+        """Send a control message immediately, after any pending deltas."""
+        await self.flush()
+        return await self._write(message)
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "frames_sent": self.frames_sent,
+            "deltas_in": self.deltas_in,
+            "delta_frames": self.delta_frames,
+            "bytes_saved": self.bytes_saved,
+            "dropped": self.dropped,
+        }
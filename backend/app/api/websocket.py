@@ -2,50 +2,33 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 import logging
 import asyncio
+import json
 import re
+import time
+import uuid
 
 from ..core.audio_processor import AudioProcessor
+from ..core.audio_pipeline import AudioPipeline
+from ..core import metrics
+from ..core.config import get_settings
+from ..core.hotlog import SampledLogger
 from ..core.state_machine import StateMachine, Intent
+from ..core.intent import NAVIGATION_INTENTS, IncrementalIntentDetector, classify_intent
 from ..core.timer_manager import TimerManager
-from ..services.openai_client import OpenAIRealtimeClient
-from ..services.recipe_parser import RecipeParser
-from ..core.config import get_settings
+from ..core.tracing import new_tracer
+from ..services.realtime_pool import get_realtime_pool
+from ..services.recipe_parser import RecipeParser, get_recipe_cache, normalize_recipe
+from ..services.session_store import SessionSnapshot, get_session_store
+from ..services.session_capture import new_capture
+from ..services.admission import get_admission_controller
+from ..services.answer_cache import answer_key, get_answer_cache
+from ..services.key_validator import get_key_validator
+from .outbound import OutboundWriter
 
 log = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1")
 
 
-def classify_intent(text: str) -> Intent:
-    """Simple keyword-based intent classification for English cooking commands"""
-    text = text.lower().strip()
-    
-    # Next step keywords
-    if any(keyword in text for keyword in ["next step", "next", "continue", "start", "begin", "go", "proceed"]):
-        return Intent.NEXT
-    
-    # Repeat keywords  
-    if any(keyword in text for keyword in ["repeat", "again", "what", "current", "now", "say that again"]):
-        return Intent.REPEAT
-        
-    # Timer related
-    if any(keyword in text for keyword in ["timer", "time", "how long", "how much time", "minutes", "remaining"]):
-        return Intent.TIMER_QUERY
-        
-    # Ingredient questions
-    if any(keyword in text for keyword in ["ingredients", "what do i need", "what ingredients", "shopping", "buy", "materials"]):
-        return Intent.INGREDIENT_QUESTION
-        
-    # Recipe overview questions
-    if any(keyword in text for keyword in ["how many steps", "steps", "how to make", "recipe", "overview", "process"]):
-        return Intent.RECIPE_QUESTION
-        
-    # Current step questions
-    if any(keyword in text for keyword in ["which step", "what step", "where are we", "progress", "current step"]):
-        return Intent.STEP_QUESTION
-    
-    return Intent.UNKNOWN
-
-
 @router.websocket("/test")
 async def test_websocket(websocket: WebSocket):
     """Simple test WebSocket endpoint to verify connection works"""
@@ -139,15 +122,78 @@ async def simple_websocket_test(ws: WebSocket):
         log.error(f"📋 Simple WebSocket traceback: {traceback.format_exc()}")
         
 
+async def open_session(first_frame: str):
+    """
+    The client's first text frame is either the raw recipe (new session) or
+    {"type": "resume", "session_id": ..., "recipe": <fallback text>}.
+    Returns (session_id, recipe, snapshot), snapshot None for a new
+    session, or None if a resume failed and no recipe came with it.
+    """
+    store = get_session_store()
+    request = None
+    if first_frame.lstrip().startswith("{"):
+        try:
+            request = json.loads(first_frame)
+        except json.JSONDecodeError:
+            request = None
+
+    if isinstance(request, dict) and request.get("type") == "resume":
+        snapshot = await store.get(str(request.get("session_id", "")))
+        if snapshot is not None:
+            # Claim the session: saves from the connection being resumed are refused from now on
+            snapshot.generation += 1
+            await store.put(snapshot)
+            # Shared parsed recipe if still cached; the stored text otherwise
+            recipe = get_recipe_cache().get(snapshot.recipe_hash)
+            if recipe is None:
+                text = await store.get_recipe(snapshot.recipe_hash) or request.get("recipe") or ""
+                recipe = await RecipeParser.parse(text)
+            return snapshot.session_id, recipe, snapshot
+        log.info(f"⚠️ Session {request.get('session_id')} unknown or expired, starting a new one")
+        first_frame = request.get("recipe") or ""
+        if not first_frame.strip():
+            return None
+
+    recipe = await RecipeParser.parse(first_frame)
+    await store.put_recipe(recipe.content_hash, normalize_recipe(first_frame))
+    return uuid.uuid4().hex, recipe, None
+
+
 @router.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket):
     log.info("🔗 New WebSocket connection attempt")
     await ws.accept()
     log.info("✅ WebSocket connection accepted")
-    
+
+    # Shed load before spending anything on the session
+    admission_control = get_admission_controller()
+
+    async def on_queued(position: int):
+        await ws.send_json({"type": "queued", "position": position})
+
+    admission = await admission_control.admit(on_queued)
+    if not admission.admitted:
+        await ws.send_json({
+            "error": f"Server busy ({admission.reason}), please retry.",
+            "retry_after": admission.retry_after_s,
+        })
+        await ws.close(code=1013)  # Try Again Later
+        return
+    if admission.waited_s:
+        log.info(f"🚦 Session admitted after {admission.waited_s:.2f}s in queue")
+
+    metrics.ACTIVE_SESSIONS.inc()
+    try:
+        await run_session(ws)
+    finally:
+        metrics.ACTIVE_SESSIONS.dec()
+        admission_control.release()
+
+
+async def run_session(ws: WebSocket):
     # Check if OpenAI API key is configured
-    settings = get_settings()
-    if not settings.openai_api_key or settings.openai_api_key == "your_openai_api_key_here":
+    key_validator = get_key_validator()
+    if not key_validator.configured:
         log.error("❌ OpenAI API key not configured")
         await ws.send_json({
             "error": "OpenAI API key not configured. Please set OPENAI_API_KEY in your .env file."
@@ -157,53 +203,105 @@ async def websocket_endpoint(ws: WebSocket):
     
     log.info("✅ OpenAI API key configured")
     
-    # Test OpenAI API key with a simple validation
-    try:
-        import openai
-        test_client = openai.OpenAI(api_key=settings.openai_api_key)
-        # Simple test to validate API key
-        models = test_client.models.list()
-        log.info("✅ OpenAI API key validation successful")
-    except Exception as api_test_error:
-        log.error(f"❌ OpenAI API key validation failed: {api_test_error}")
+    # Validation result is cached and refreshed in the background, so new
+    # sessions never block on an HTTPS round trip
+    key_status = await key_validator.validate()
+    if key_status.valid is False:
+        log.error(f"❌ OpenAI API key validation failed: {key_status.error}")
         await ws.send_json({
-            "error": f"OpenAI API key validation failed: {str(api_test_error)}"
+            "error": f"OpenAI API key validation failed: {key_status.error}"
         })
         await ws.close()
         return
+    elif key_status.valid is None:
+        log.warning(f"⚠️ Could not verify OpenAI API key ({key_status.error}), continuing")
+    else:
+        log.info("✅ OpenAI API key validation successful")
     
     try:
         audio_processor = AudioProcessor()
         log.info("✅ Audio processor created")
 
-        # Client must send the raw recipe first (text)
+        # Client must send the raw recipe (or a resume request) first (text)
         log.info("⏳ Waiting for recipe text from client...")
-        raw_recipe = await ws.receive_text()
-        log.info(f"✅ Received recipe: {len(raw_recipe)} characters")
-        
-        recipe = await RecipeParser.parse(raw_recipe)
-        log.info(f"✅ Recipe parsed: {len(recipe.steps)} steps")
+        first_frame = await ws.receive_text()
+        log.info(f"✅ Received first frame: {len(first_frame)} characters")
+
+        session = await open_session(first_frame)
+        if session is None:
+            await ws.send_json({"type": "session", "resumed": False, "error": "Session expired, please resend the recipe."})
+            await ws.close()
+            return
+        session_id, recipe, snapshot = session
+        log.info(
+            f"✅ Session {session_id} {'resumed' if snapshot else 'created'}: '{recipe.title}', "
+            f"{len(recipe.steps)} steps, {len(recipe.ingredients)} ingredients, {len(recipe.timers)} timers"
+        )
+
+        # Per-turn latency traces (no-ops unless TRACE_ENABLED)
+        tracer = new_tracer(session_id)
+
+        # Opt-in ring-buffer capture of this session's audio and events
+        capture = new_capture(session_id)
+        if capture is not None:
+            capture.meta = {"recipe_hash": recipe.content_hash, "recipe_title": recipe.title}
+            audio_processor.capture = capture
+
+        async def spill_capture():
+            if capture is not None:
+                try:
+                    await capture.spill()
+                except Exception as capture_error:
+                    log.warning(f"⚠️ Could not write session capture: {capture_error}")
+
+        # Batches response deltas; control messages go out immediately
+        settings = get_settings()
+        outbound = OutboundWriter(ws, settings.delta_batch_window_ms, settings.delta_batch_max_bytes)
 
         async def tts(text: str):
             # Push to browser; client plays speech synthesis
             log.info(f"🔊 Sending TTS message: '{text[:100]}{'...' if len(text) > 100 else ''}'")
-            if ws.application_state == WebSocketState.CONNECTED:
-                await ws.send_json({"tts": text})
+            if capture is not None:
+                capture.event({"type": "tts", "text": text}, direction="out")
+            if await outbound.send(tracer.tag({"tts": text})):
+                tracer.mark("tts_sent")
                 log.info("✅ TTS message sent successfully")
             else:
                 log.warning("❌ WebSocket not connected, TTS message dropped")
 
-        sm = StateMachine(recipe, tts)
+        # Timers run on the shared scheduler and start when their step is reached
         timers = TimerManager(recipe, tts)
-        timers.start_all()
+        sm = StateMachine(recipe, tts, timers)
+        finished_timers = timers.restore(snapshot.timers) if snapshot else []
         log.info("✅ State machine and timers initialized")
+
+        store = get_session_store()
+
+        generation = snapshot.generation if snapshot else 0
+
+        async def persist():
+            try:
+                saved = await store.put(SessionSnapshot(
+                    session_id, recipe.content_hash, sm.idx, sm.started, timers.snapshot(), generation=generation,
+                ))
+                if not saved:
+                    log.info(f"⏭️ Session {session_id} resumed on a newer connection, snapshot not saved")
+            except Exception as store_error:
+                log.warning(f"⚠️ Could not save session snapshot: {store_error}")
+
+        await outbound.send({"type": "session", "session_id": session_id, "resumed": snapshot is not None})
+        if snapshot is None:
+            await persist()
         
         # Wait for microphone ready signal from frontend
         log.info("⏳ Waiting for READY signal from client...")
         ready_signal = await ws.receive_text()
         log.info(f"📨 Received signal: '{ready_signal}'")
         
-        if ready_signal == "READY":
+        if ready_signal == "READY" and snapshot is not None:
+            log.info(f"🎯 Resuming conversation at step {snapshot.idx + 1}...")
+            await sm.restore(snapshot.idx, snapshot.started, finished_timers)
+        elif ready_signal == "READY":
             log.info("🎯 Starting conversation...")
             # Now start the conversation
             await sm.reset()
@@ -212,76 +310,190 @@ async def websocket_endpoint(ws: WebSocket):
 
         log.info("🔗 Connecting to OpenAI Realtime API...")
         try:
-            async with OpenAIRealtimeClient() as openai_ws:
+            async with await get_realtime_pool().acquire() as openai_ws:
                 log.info("✅ OpenAI WebSocket connected successfully")
+                openai_ws.capture = capture
+                if tracer.exporter is not None:
+                    openai_ws.tracer = tracer
                 
                 async def pump_audio():
                     log.info("🎤 Starting audio pump...")
-                    chunk_count = 0
+                    audio_log = SampledLogger(log, "audio")
+
+                    async def send_chunk(pcm: bytes):
+                        sampled = audio_log.sampled()
+                        try:
+                            await openai_ws.push_audio(pcm)
+                        except Exception as audio_error:
+                            log.error(f"❌ Failed to send audio chunk {audio_log.count}: {audio_error}")
+                        if sampled and log.isEnabledFor(logging.INFO):
+                            log.info("🎵 Sent %d audio chunks to OpenAI, queues: %s", audio_log.count, pipeline.stats())
+
+                    # Receive, DSP and send run as separate stages with bounded queues
+                    pipeline = AudioPipeline(audio_processor, send_chunk)
                     try:
-                        async for pcm in audio_processor.stream_chunks(ws):
-                            chunk_count += 1
-                            if chunk_count % 50 == 0:  # Log every 50th chunk to avoid spam
-                                log.info(f"🎵 Processed {chunk_count} audio chunks, sending to OpenAI...")
-                            
-                            try:
-                                await openai_ws.push_audio(pcm)
-                                if chunk_count % 50 == 0:
-                                    log.info(f"✅ Successfully sent chunk {chunk_count} to OpenAI")
-                            except Exception as audio_error:
-                                log.error(f"❌ Failed to send audio chunk {chunk_count}: {audio_error}")
-                                
+                        await pipeline.run(ws)
                     except Exception as pump_error:
                         log.error(f"💥 Audio pump error: {pump_error}")
                         raise
+                    finally:
+                        log.info(f"📊 Audio pipeline stats: {pipeline.stats()}")
+                        if audio_processor.vad is not None:
+                            log.info(f"🤫 VAD gate stats: {audio_processor.vad.stats()}")
 
                 async def handle_deltas():
                     log.info("📝 Starting text delta handler...")
+                    delta_log = SampledLogger(log, "delta")
                     current_text = ""
                     delta_count = 0
                     transcription_count = 0
                     response_count = 0
+                    local_mode = settings.local_intent_mode
+                    detector = (
+                        IncrementalIntentDetector()
+                        if settings.user_intent_detection or local_mode != "off" else None
+                    )
+                    user_intent_handled = False  # skip the AI-text classification for this turn
+                    answered_locally = False     # no LLM reply wanted for this turn
+                    answers = get_answer_cache()
+                    reply_parts = []             # text of the response being streamed
+                    answer_keys = {}             # user item -> cache key awaiting its LLM reply
+                    early_replies = {}           # user item -> reply that finished before its transcription
+                    # user item -> "user" | "reply": whose intent moved the StateMachine
+                    # that turn (with whisper-1 the reply often streams before the transcript)
+                    turn_owner = {}
+
+                    def claim_turn(item, owner):
+                        if item is None:
+                            return
+                        turn_owner[item] = owner
+                        while len(turn_owner) > 4:
+                            turn_owner.pop(next(iter(turn_owner)))
+
+                    async def answer_from_cache(question):
+                        """Speak a cached answer for ``question``, or remember to cache the LLM's."""
+                        nonlocal user_intent_handled, answered_locally
+                        key = answer_key(recipe, question)
+                        if key is None:
+                            return
+                        item = openai_ws.item_id
+                        if item in early_replies:
+                            answers.put(key, early_replies.pop(item))
+                            return
+                        cached = answers.get(key)
+                        if cached is None:
+                            answer_keys[item] = key
+                            return
+                        log.info(f"📦 Answering from cache: '{question}'")
+                        user_intent_handled = answered_locally = True
+                        if local_mode != "manual":
+                            await openai_ws.cancel_response()
+                        tracer.mark("answer_cache_hit")
+                        await tts(cached)
+
+                    async def handle_user_intent(intent, source):
+                        nonlocal user_intent_handled, answered_locally
+                        if intent is None or intent == Intent.UNKNOWN:
+                            return
+                        log.info(f"⚡ {source} user intent: {intent}")
+                        user_intent_handled = True
+                        item = openai_ws.item_id
+                        if turn_owner.get(item) == "reply":
+                            log.info(f"⏭️ Reply already handled this turn, ignoring {intent}")
+                            return
+                        claim_turn(item, "user")
+                        if local_mode != "off" and intent in NAVIGATION_INTENTS:
+                            answered_locally = True
+                            if local_mode == "cancel":
+                                await openai_ws.cancel_response()
+                            log.info(f"🏎️ Answering {intent} locally ({local_mode})")
+                        tracer.mark("intent")
+                        started = time.perf_counter()
+                        try:
+                            with tracer.span("state_machine"):
+                                await sm.handle(intent)
+                            metrics.INTENT_TO_TTS_SECONDS.observe(time.perf_counter() - started)
+                        except Exception as intent_error:
+                            log.error(f"❌ Error handling intent {intent}: {intent_error}")
+                        await persist()
                     
                     try:
                         async for delta in openai_ws.receive_text_deltas():
                             delta_count += 1
                             
                             # Handle different types of deltas
-                            if delta.startswith("[TRANSCRIPTION:"):
+                            if delta.startswith("[PARTIAL:"):
+                                if detector is not None:
+                                    if not detector.text:
+                                        user_intent_handled = answered_locally = False  # new utterance
+                                    await handle_user_intent(detector.feed(delta[10:-1]), "Early")
+
+                            elif delta.startswith("[TRANSCRIPTION:"):
                                 transcription_count += 1
                                 log.info(f"🎯 User transcription #{transcription_count}: {delta}")
                                 # Send transcription to frontend for display
-                                await ws.send_json({"transcription": delta[15:-1]})  # Remove [TRANSCRIPTION: and ]
+                                await outbound.send(tracer.tag({"transcription": delta[15:-1]}))  # Remove [TRANSCRIPTION: and ]
+                                if detector is not None:
+                                    if not detector.text:
+                                        user_intent_handled = answered_locally = False  # no partials for this utterance
+                                    await handle_user_intent(detector.finish(delta[15:-1]), "Final")
+                                elif detector is None:
+                                    user_intent_handled = answered_locally = False  # new utterance
+                                # A turn the StateMachine already answered gets no second, cached answer
+                                if answers.enabled and not user_intent_handled:
+                                    await answer_from_cache(delta[15:-1])
+                                if local_mode == "manual" and not answered_locally:
+                                    await openai_ws.create_response()
                                 
                             elif delta.startswith("[USER SAID:"):
                                 log.info(f"🎯 User speech processed: {delta}")
-                                await ws.send_json({"user_speech": delta[12:-1]})  # Remove [USER SAID: and ]
+                                await outbound.send(tracer.tag({"user_speech": delta[12:-1]}))  # Remove [USER SAID: and ]
                                 
+                            elif delta.startswith("[RESPONSE_DONE:"):
+                                reply = "".join(reply_parts).strip()
+                                reply_parts.clear()
+                                if answers.enabled and reply and delta == "[RESPONSE_DONE: completed]":
+                                    item = openai_ws.item_id
+                                    if item in answer_keys:
+                                        answers.put(answer_keys.pop(item), reply)
+                                    elif item is not None:
+                                        early_replies[item] = reply
+                                # Only the latest few turns can still be matched up
+                                for pending in (answer_keys, early_replies):
+                                    while len(pending) > 4:
+                                        pending.pop(next(iter(pending)))
+
                             elif delta.startswith("[ERROR:"):
                                 log.error(f"❌ OpenAI API error: {delta}")
-                                await ws.send_json({"error": delta})
+                                await outbound.send(tracer.tag({"error": delta}))
                                 
                             else:
                                 # Regular response text delta
                                 response_count += 1
                                 current_text += delta
-                                await ws.send_json({"delta": delta})
+                                reply_parts.append(delta)
+                                await outbound.delta(delta)
                                 
-                                if response_count <= 10:  # Log first 10 response deltas
-                                    log.info(f"📝 AI response delta #{response_count}: '{delta}'")
-                                elif response_count == 11:
-                                    log.info("📝 (Continuing to receive AI response deltas...)")
+                                delta_log.info("📝 AI response delta #%d: %r", response_count, delta)
                             
                             # Process complete sentences for intent classification (only for AI responses)
                             if not delta.startswith("[") and delta in [".", "?", "!", ","] or len(current_text) > 50:
-                                if current_text.strip():
+                                item = openai_ws.response_item
+                                if current_text.strip() and not user_intent_handled and item not in turn_owner:
                                     intent = classify_intent(current_text)
+                                    if intent != Intent.UNKNOWN:
+                                        claim_turn(item, "reply")
                                     log.info(f"🎯 Classified intent: {intent} for text: '{current_text.strip()}'")
+                                    tracer.mark("intent")
+                                    started = time.perf_counter()
                                     try:
-                                        await sm.handle(intent)
+                                        with tracer.span("state_machine"):
+                                            await sm.handle(intent)
+                                        metrics.INTENT_TO_TTS_SECONDS.observe(time.perf_counter() - started)
                                         log.info(f"✅ Successfully handled intent: {intent}")
                                     except Exception as intent_error:
                                         log.error(f"❌ Error handling intent {intent}: {intent_error}")
+                                    await persist()
                                 current_text = ""
                                 
                     except Exception as delta_error:
@@ -289,7 +501,7 @@ async def websocket_endpoint(ws: WebSocket):
                         import traceback
                         log.error(f"📋 Delta handler traceback: {traceback.format_exc()}")
                         # Send error to frontend
-                        await ws.send_json({"error": f"Response processing error: {str(delta_error)}"})
+                        await outbound.send({"error": f"Response processing error: {str(delta_error)}"})
                         raise
 
                 log.info("🚀 Starting audio processing tasks...")
@@ -302,10 +514,18 @@ async def websocket_endpoint(ws: WebSocket):
                     import traceback
                     log.error(f"📋 Full traceback: {traceback.format_exc()}")
                 finally:
+                    # Keep the session resumable; its timers continue from the snapshot
+                    await persist()
                     await timers.cancel_all()
                     log.info("🛑 Timers cancelled")
+                    await outbound.close()
+                    log.info(f"📊 Outbound writer stats: {outbound.stats()}")
+                    tracer.finish()
+                    await spill_capture()
                     
         except Exception as openai_error:
+            await timers.cancel_all()
+            await spill_capture()
             log.error(f"💥 OpenAI connection error: {openai_error}")
             import traceback
             log.error(f"📋 Full OpenAI error traceback: {traceback.format_exc()}")
@@ -0,0 +1,92 @@
+"""
+Client audio frame format negotiation.
+
+Legacy clients send raw float32 mono at ``sampling_rate_in``. Capable
+clients declare their format once with a JSON handshake after READY::
+
+    {"type": "audio_format", "sample_rate": 24000, "format": "int16", "channels": 1}
+
+or prefix binary frames with a 12-byte header::
+
+    b"CHF1" | uint32 sample_rate | uint8 format (0=float32, 1=int16) | uint8 channels | 2 reserved
+
+(all little-endian). The format is fixed once audio starts flowing.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+HEADER_MAGIC = b"CHF1"
+HEADER = struct.Struct("<4sIBB2x")
+
+SAMPLE_FORMATS = ("float32", "int16")
+SAMPLE_WIDTH = {"float32": 4, "int16": 2}
+
+
+class AudioFormatError(ValueError):
+    """Raised for unsupported or malformed client audio formats."""
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    sample_rate: int
+    sample_format: str = "float32"
+    channels: int = 1
+
+    def __post_init__(self) -> None:
+        if self.sample_format not in SAMPLE_FORMATS:
+            raise AudioFormatError(f"Unsupported sample format: {self.sample_format!r}")
+        if not 8_000 <= self.sample_rate <= 96_000:
+            raise AudioFormatError(f"Unsupported sample rate: {self.sample_rate}")
+        if not 1 <= self.channels <= 8:
+            raise AudioFormatError(f"Unsupported channel count: {self.channels}")
+
+    @property
+    def frame_bytes(self) -> int:
+        """Bytes per multi-channel sample frame."""
+        return SAMPLE_WIDTH[self.sample_format] * self.channels
+
+    def is_pcm16_at(self, sample_rate: int) -> bool:
+        """True when frames are already mono pcm16 at ``sample_rate``."""
+        return self.sample_format == "int16" and self.channels == 1 and self.sample_rate == sample_rate
+
+    @classmethod
+    def from_message(cls, message: dict) -> "AudioFormat":
+        """Build from a JSON ``audio_format`` handshake message."""
+        try:
+            return cls(
+                sample_rate=int(message["sample_rate"]),
+                sample_format=str(message.get("format", "float32")),
+                channels=int(message.get("channels", 1)),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            if isinstance(e, AudioFormatError):
+                raise
+            raise AudioFormatError(f"Malformed audio_format message: {e}") from e
+
+    def to_message(self) -> dict:
+        return {
+            "type": "audio_format",
+            "sample_rate": self.sample_rate,
+            "format": self.sample_format,
+            "channels": self.channels,
+        }
+
+
+def split_header(frame: bytes) -> Tuple[Optional[AudioFormat], memoryview]:
+    """
+    Strip an optional per-frame header.
+
+    Returns ``(format, payload)``; ``format`` is None for headerless frames.
+    The payload is a zero-copy view into ``frame``.
+    """
+    view = memoryview(frame)
+    if len(view) < HEADER.size or bytes(view[:4]) != HEADER_MAGIC:
+        return None, view
+    _, rate, fmt, channels = HEADER.unpack_from(view)
+    if fmt >= len(SAMPLE_FORMATS):
+        raise AudioFormatError(f"Unknown sample format code in header: {fmt}")
+    return AudioFormat(rate, SAMPLE_FORMATS[fmt], channels), view[HEADER.size:]
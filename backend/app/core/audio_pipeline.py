@@ -0,0 +1,283 @@
+"""
+Three-stage audio pipeline: browser receive -> DSP -> upstream send.
+
+Stages run as separate tasks connected by bounded queues, so a slow
+upstream send never stalls reading from the browser, and DSP runs in a
+thread pool instead of on the event loop.
+"""
+
+import asyncio
+import logging
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from .config import get_settings
+from .metrics import QUEUE_DEPTH
+
+log = logging.getLogger(__name__)
+
+
+class OverflowPolicy(str, Enum):
+    BLOCK = "block"              # producer waits for space (backpressure)
+    DROP_OLDEST = "drop_oldest"  # discard the oldest queued chunk
+    MERGE = "merge"              # append to the newest queued chunk
+
+
+@lru_cache()
+def get_dsp_executor() -> ThreadPoolExecutor:
+    """Process-wide thread pool for DSP; NumPy releases the GIL in the kernels."""
+    return ThreadPoolExecutor(
+        max_workers=get_settings().audio_dsp_workers,
+        thread_name_prefix="audio-dsp",
+    )
+
+
+class StageQueue:
+    """Bounded FIFO of byte chunks with an overflow policy and depth counters."""
+
+    def __init__(self, name: str, maxsize: int, policy: OverflowPolicy) -> None:
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.policy = OverflowPolicy(policy)
+        self._items: Deque[bytes] = deque()
+        self._changed = asyncio.Condition()
+        self._closed = False
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.merged = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: bytes) -> None:
+        async with self._changed:
+            if len(self._items) >= self.maxsize:
+                if self.policy is OverflowPolicy.BLOCK:
+                    await self._changed.wait_for(
+                        lambda: len(self._items) < self.maxsize or self._closed
+                    )
+                elif self.policy is OverflowPolicy.DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    self._items[-1] = b"".join((self._items[-1], item))
+                    self.merged += 1
+                    self.enqueued += 1
+                    return
+
+            self._items.append(item)
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._changed.notify_all()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Next chunk, or None once the queue is closed and drained.
+        Raises asyncio.TimeoutError after ``timeout`` seconds without data.
+        """
+        async with self._changed:
+            ready = self._changed.wait_for(lambda: self._items or self._closed)
+            # Only the wait is cancelled on timeout, never a popped item
+            await (ready if timeout is None else asyncio.wait_for(ready, timeout))
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._changed.notify_all()
+            return item
+
+    async def close(self) -> None:
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "merged": self.merged,
+        }
+
+
+class Coalescer:
+    """
+    Packs pcm16 chunks into fixed-size upstream appends.
+
+    Emits ``target_bytes`` chunks as soon as enough audio is buffered; a
+    partial chunk is flushed once its oldest byte has waited ``deadline_s``.
+    """
+
+    def __init__(self, target_bytes: int, deadline_s: float) -> None:
+        self.target_bytes = target_bytes - target_bytes % 2  # whole samples
+        self.deadline_s = deadline_s
+        self._buf = bytearray()
+        self._first_at: Optional[float] = None
+
+        self.chunks_in = 0
+        self.chunks_out = 0
+        self.deadline_flushes = 0
+
+    def time_left(self, now: float) -> Optional[float]:
+        """Seconds until a deadline flush is due, or None when empty."""
+        if self._first_at is None:
+            return None
+        return max(0.0, self._first_at + self.deadline_s - now)
+
+    def add(self, pcm: bytes, now: float) -> List[bytes]:
+        self.chunks_in += 1
+        if not self._buf and len(pcm) == self.target_bytes:
+            self.chunks_out += 1
+            return [pcm]  # already the right size, no copy
+
+        if self._first_at is None:
+            self._first_at = now
+        self._buf += pcm
+        out = []
+        while len(self._buf) >= self.target_bytes:
+            out.append(bytes(self._buf[: self.target_bytes]))
+            del self._buf[: self.target_bytes]
+        if out:
+            # Remaining bytes arrived with the newest chunk
+            self._first_at = now if self._buf else None
+            self.chunks_out += len(out)
+        return out
+
+    def flush(self, deadline: bool = False) -> Optional[bytes]:
+        self._first_at = None
+        if not self._buf:
+            return None
+        chunk = bytes(self._buf)
+        self._buf.clear()
+        self.chunks_out += 1
+        self.deadline_flushes += deadline
+        return chunk
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "chunks_in": self.chunks_in,
+            "chunks_out": self.chunks_out,
+            "deadline_flushes": self.deadline_flushes,
+            "buffered_bytes": len(self._buf),
+        }
+
+
+_live_pipelines: "weakref.WeakSet[AudioPipeline]" = weakref.WeakSet()
+
+
+def _queue_depths() -> Dict[str, float]:
+    depths = {"receive": 0, "dsp": 0}
+    for pipeline in list(_live_pipelines):
+        depths["receive"] += pipeline.raw_q.depth
+        depths["dsp"] += pipeline.pcm_q.depth
+    return depths
+
+
+QUEUE_DEPTH.set_function(_queue_depths)
+
+
+class AudioPipeline:
+    """
+    Runs receive, DSP and send as independent stages for one session.
+
+    ``processor`` provides ``receive_frames(ws)`` and ``process(frame)``;
+    ``sink`` is awaited with each processed chunk (e.g. ``push_audio``).
+    """
+
+    def __init__(
+        self,
+        processor,
+        sink: Callable[[bytes], Awaitable[None]],
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        settings = get_settings()
+        self.processor = processor
+        self.sink = sink
+        if executor is None and settings.audio_dsp_executor == "thread":
+            executor = get_dsp_executor()
+        self.executor = executor
+
+        size = settings.audio_queue_size
+        policy = OverflowPolicy(settings.audio_overflow_policy)
+        self.raw_q = StageQueue("receive", size, policy)
+        self.pcm_q = StageQueue("dsp", size, policy)
+
+        self.coalescer: Optional[Coalescer] = None
+        if settings.audio_append_ms > 0:
+            target = settings.sampling_rate_out * settings.audio_append_ms // 1000 * 2
+            self.coalescer = Coalescer(target, settings.audio_flush_deadline_ms / 1000)
+        _live_pipelines.add(self)
+
+    async def _receive_stage(self, websocket) -> None:
+        try:
+            async for frame in self.processor.receive_frames(websocket):
+                await self.raw_q.put(frame)
+        finally:
+            await self.raw_q.close()
+
+    async def _dsp_stage(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while (frame := await self.raw_q.get()) is not None:
+                if self.executor is None:
+                    pcm = self.processor.process(frame)
+                else:
+                    # Frames stay in order: one in flight per session
+                    pcm = await loop.run_in_executor(self.executor, self.processor.process, frame)
+                if pcm:
+                    await self.pcm_q.put(pcm)
+        finally:
+            await self.pcm_q.close()
+
+    async def _send_stage(self) -> None:
+        if self.coalescer is None:
+            while (pcm := await self.pcm_q.get()) is not None:
+                await self.sink(pcm)
+            return
+
+        loop = asyncio.get_running_loop()
+        coalescer = self.coalescer
+        while True:
+            try:
+                pcm = await self.pcm_q.get(timeout=coalescer.time_left(loop.time()))
+            except asyncio.TimeoutError:
+                # Flush deadline hit: send what we have to bound latency
+                await self.sink(coalescer.flush(deadline=True))
+                continue
+            if pcm is None:
+                break
+            for chunk in coalescer.add(pcm, loop.time()):
+                await self.sink(chunk)
+        if rest := coalescer.flush():
+            await self.sink(rest)
+
+    async def run(self, websocket) -> None:
+        """Run all stages until the browser disconnects or a stage fails."""
+        tasks = [
+            asyncio.create_task(self._receive_stage(websocket), name="audio-receive"),
+            asyncio.create_task(self._dsp_stage(), name="audio-dsp"),
+            asyncio.create_task(self._send_stage(), name="audio-send"),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if exc := task.exception():
+                    raise exc
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {q.name: q.stats() for q in (self.raw_q, self.pcm_q)}
+        if self.coalescer is not None:
+            stats["coalesce"] = self.coalescer.stats()
+        return stats
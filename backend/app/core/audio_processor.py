@@ -1,42 +1,140 @@
 """
-Down‑samples browser PCM chunks (48 kHz mono float32) to 24 kHz
-and yields bytes ready for OpenAI streaming.
+Down‑samples browser PCM chunks (48 kHz mono float32 by default, or any
+negotiated format) to 24 kHz pcm16 and yields bytes ready for OpenAI streaming.
 """
 
+import json
+import logging
+import time
+
 import numpy as np
-import resampy
 import soundfile as sf
+from starlette.websockets import WebSocketDisconnect
 
+from .audio_format import AudioFormat, AudioFormatError, split_header
 from .config import get_settings
+from .metrics import DOWNSAMPLE_SECONDS
+from .resampler import StreamingResampler
+from .vad import EnergyVAD
+
+log = logging.getLogger(__name__)
 
 
 class AudioProcessor:
     def __init__(self) -> None:
         self.settings = get_settings()
-
-    def downsample(self, pcm_bytes: bytes) -> bytes:
-        # Convert browser float32 PCM to numpy array
-        audio = np.frombuffer(pcm_bytes, dtype=np.float32)
-        
-        # Resample from 48kHz to 24kHz
-        audio_24k = resampy.resample(
-            audio,
+        # Legacy clients: raw float32 mono at sampling_rate_in
+        self.format = AudioFormat(self.settings.sampling_rate_in)
+        self.format_locked = False
+        # One resampler per session so filter state carries across chunks
+        self.resampler = StreamingResampler(
             self.settings.sampling_rate_in,
             self.settings.sampling_rate_out,
         )
-        
-        # Convert float32 to int16 PCM for OpenAI (pcm16 format)
-        # Clamp to [-1, 1] range and scale to int16 range
-        audio_clamped = np.clip(audio_24k, -1.0, 1.0)
-        audio_int16 = (audio_clamped * 32767).astype(np.int16)
-        
-        return audio_int16.tobytes()
+        # Optional silence gate so idle kitchen noise never goes upstream
+        self.vad = (
+            EnergyVAD(self.settings, self.settings.sampling_rate_out)
+            if self.settings.vad_enabled
+            else None
+        )
+        # Optional SessionCapture recording frames as received
+        self.capture = None
+
+    def set_format(self, fmt: AudioFormat) -> None:
+        """Switch the client frame format; only allowed before audio flows."""
+        if fmt == self.format:
+            return
+        if self.format_locked:
+            raise AudioFormatError("Audio format cannot change once audio is streaming")
+        self.format = fmt
+        if fmt.sample_rate != self.resampler.rate_in:
+            self.resampler = StreamingResampler(fmt.sample_rate, self.settings.sampling_rate_out)
+        log.info(f"🎚️ Client audio format: {fmt}")
+
+    def downsample(self, pcm_bytes: bytes) -> bytes:
+        fmt = self.format
+        if fmt.is_pcm16_at(self.settings.sampling_rate_out):
+            # Client already sends what OpenAI wants: zero-copy pass-through
+            return pcm_bytes
+
+        if fmt.sample_format == "int16":
+            audio = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32)
+            audio *= 1.0 / 32768
+        else:
+            audio = np.frombuffer(pcm_bytes, dtype=np.float32)
+
+        if fmt.channels > 1:
+            usable = len(audio) - len(audio) % fmt.channels
+            audio = audio[:usable].reshape(-1, fmt.channels).mean(axis=1, dtype=np.float32)
+
+        # Resample and convert to int16 for OpenAI (pcm16)
+        return self.resampler.process_array(audio)
+
+    def process(self, frame: bytes) -> bytes:
+        """
+        CPU-bound DSP for one browser frame; safe to run off the event loop.
+        Returns b"" when the VAD gate drops the frame.
+        """
+        started = time.perf_counter()
+        pcm = self.downsample(frame)
+        DOWNSAMPLE_SECONDS.observe(time.perf_counter() - started)
+        if self.vad is not None:
+            pcm = self.vad.gate(pcm)
+        return pcm
+
+    async def _handle_control(self, websocket, text: str) -> None:
+        try:
+            message = json.loads(text)
+        except json.JSONDecodeError:
+            log.debug(f"🤔 Ignoring non-JSON text frame during audio: {text[:100]}")
+            return
+        if not isinstance(message, dict) or message.get("type") != "audio_format":
+            log.debug(f"🤔 Ignoring control message: {message}")
+            return
+
+        try:
+            self.set_format(AudioFormat.from_message(message))
+            await websocket.send_json({**self.format.to_message(), "accepted": True})
+        except AudioFormatError as e:
+            log.warning(f"⚠️ Rejected audio format: {e}")
+            await websocket.send_json({
+                **self.format.to_message(),
+                "accepted": False,
+                "error": str(e),
+            })
+
+    async def receive_frames(self, websocket):
+        """
+        Async generator: binary audio payloads from the browser WS.
+
+        Handles the optional ``audio_format`` handshake and per-frame headers;
+        yielded payloads are header-free views in the session's format.
+        """
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if (data := message.get("bytes")) is not None:
+                try:
+                    fmt, payload = split_header(data)
+                    if fmt is not None:
+                        self.set_format(fmt)
+                except AudioFormatError as e:
+                    log.warning(f"⚠️ Dropping audio frame: {e}")
+                    continue
+                self.format_locked = True
+                if self.capture is not None:
+                    self.capture.audio(payload, self.format)
+                yield payload
+            elif text := message.get("text"):
+                await self._handle_control(websocket, text)
 
     async def stream_chunks(self, websocket):
         """
         Async generator: receives binary frames from WS,
         yields resampled bytes.
         """
-        while True:
-            pcm = await websocket.receive_bytes()
-            yield self.downsample(pcm)
+        async for frame in self.receive_frames(websocket):
+            if pcm := self.process(frame):
+                yield pcm
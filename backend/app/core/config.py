@@ -1,13 +1,115 @@
 from functools import lru_cache
+from typing import Dict
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     """Application configuration loaded from environment variables."""
 
     openai_api_key: str = ""
+    openai_api_base: str = "https://api.openai.com/v1"
+    # Point at a local stand-in (backend/benchmarks/mock_realtime.py) for offline runs
+    openai_realtime_url: str = "wss://api.openai.com/v1/realtime"
+    openai_key_check_ttl_s: float = 600.0
+    openai_key_check_timeout_s: float = 10.0
+
+    # Reconnect a dropped Realtime socket mid-session (0 attempts = end the session)
+    # and replay up to upstream_replay_ms of audio the model has not answered yet
+    upstream_reconnect_attempts: int = 5
+    upstream_reconnect_base_s: float = 0.25
+    upstream_reconnect_max_s: float = 5.0
+    upstream_replay_ms: int = 5_000
+    # Pre-warmed Realtime sessions (0 disables the pool)
+    realtime_pool_size: int = 2
+    realtime_pool_max_idle_s: float = 300.0
+    realtime_pool_check_interval_s: float = 30.0
+    # gpt-4o-transcribe / gpt-4o-mini-transcribe stream partial transcripts;
+    # whisper-1 only delivers the completed one
+    transcription_model: str = "whisper-1"
+    # text: the model returns text only (the browser speaks it);
+    # audio: it also synthesizes speech, which this server discards
+    response_modality: str = "text"
+    # Act on navigation commands while the user's transcript is still streaming
+    user_intent_detection: bool = True
+    # Navigation commands answered by the StateMachine alone:
+    # off | cancel (response.cancel the LLM reply) | manual (response.create only for other turns)
+    local_intent_mode: str = "off"
+    # Parsed recipes shared between sessions (by content hash)
+    recipe_cache_size: int = 128
+    # LLM answers shared by sessions of the same recipe (0 entries disables)
+    answer_cache_size: int = 1_024
+    answer_cache_max_bytes: int = 1_000_000
+    answer_cache_ttl_s: float = 86_400.0
+    # Session snapshots for resuming after a reconnect
+    session_store: str = "memory"  # memory | sqlite
+    session_store_path: str = "chefu_sessions.db"
+    session_ttl_s: float = 3600.0
+    # Admission control: capacity = min(max sessions, upstream sockets - pool size)
+    admission_max_sessions: int = 50
+    admission_max_upstream: int = 100
+    admission_lag_budget_ms: float = 100.0  # event-loop lag above which new sessions wait (0 = off)
+    admission_cpu_budget: float = 0.0       # process CPU seconds per second (0 = off)
+    admission_queue_size: int = 10
+    admission_queue_timeout_s: float = 10.0
+    admission_retry_after_s: float = 5.0
     sampling_rate_in: int = 48_000
     sampling_rate_out: int = 24_000
 
+    # Audio pipeline: bounded queues between receive, DSP and upstream send
+    audio_queue_size: int = 32
+    audio_overflow_policy: str = "merge"  # block | drop_oldest | merge
+    audio_dsp_executor: str = "thread"    # thread | inline
+    audio_dsp_workers: int = 4
+    # Pack audio into appends of this duration (0 = one append per client frame);
+    # 40-200 ms trades per-message overhead against responsiveness
+    audio_append_ms: int = 0
+    audio_flush_deadline_ms: int = 60  # max wait for a partial append
+
+    # Browser-bound response deltas are batched per window / byte budget (0 = off)
+    delta_batch_window_ms: int = 40
+    delta_batch_max_bytes: int = 512
+
+    # Server-side voice activity gate (drops silence before it goes upstream)
+    vad_enabled: bool = False
+    vad_frame_ms: int = 20
+    vad_threshold_db: float = -45.0   # absolute energy floor, dBFS
+    vad_margin_db: float = 10.0       # required rise above the adaptive noise floor
+    vad_zcr_max: float = 0.35         # zero crossings per sample
+    vad_hangover_ms: int = 800        # keep > server_vad silence_duration_ms
+    vad_preroll_ms: int = 300
+    vad_silence_mode: str = "drop"    # drop | keepalive
+    vad_keepalive_ms: int = 5_000
+
+    # Opt-in per-session capture of client audio and upstream events, spilled
+    # to capture_dir when the session ends (see services/session_capture.py)
+    capture_enabled: bool = False
+    capture_seconds: float = 120.0   # most recent client audio kept per session
+    capture_max_events: int = 2_000
+    capture_dir: str = "captures"
+    capture_keep: int = 50           # newest captures kept on disk
+
+    # Batch processing of recorded audio (POST /api/v1/batch): DSP runs in
+    # blocks of batch_block_s, utterances end at batch_silence_ms below
+    # vad_threshold_db and are committed upstream one at a time
+    batch_block_s: float = 30.0
+    batch_silence_ms: int = 500
+    batch_turn_timeout_s: float = 30.0
+    batch_max_upload_mb: float = 50.0
+
+    # Per-turn latency traces: OpenTelemetry if installed (auto | otel),
+    # else rotating JSONL at trace_path (jsonl)
+    trace_enabled: bool = False
+    trace_exporter: str = "auto"
+    trace_path: str = "traces/turns.jsonl"
+    trace_max_bytes: int = 10_000_000
+    trace_backups: int = 5
+
+    # Logging: format and write records on a QueueListener thread, and log
+    # only every Nth event per hot-path category (0 = never, 1 = every one)
+    log_level: str = "INFO"
+    log_async: bool = True
+    log_sample_every: Dict[str, int] = {"audio": 50, "delta": 25, "event": 100}
+
     model_config = {
         "env_file": ".env",
         "env_prefix": "",
@@ -0,0 +1,80 @@
+"""
+Logging for the per-chunk / per-event hot paths.
+
+Audio chunks and response deltas arrive tens of times a second per
+session, so their log lines are sampled per category (every Nth event)
+and use lazy ``%`` arguments: nothing is formatted unless a line is
+actually emitted. With ``log_async`` the root handlers sit behind a
+``QueueHandler`` and a ``QueueListener`` thread does the formatting and
+I/O, so the event loop only pays for an enqueue.
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from .config import Settings
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[QueueListener] = None
+_every: Dict[str, int] = {}
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records as-is; the stock ``prepare`` formats on the caller's thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class SampledLogger:
+    """
+    Emits one of every N calls for ``category`` (``log_sample_every``;
+    0 silences the category, 1 logs every call).
+    """
+
+    def __init__(self, logger: logging.Logger, category: str) -> None:
+        self.logger = logger
+        self.category = category
+        self.count = 0
+
+    def sampled(self) -> bool:
+        """Count one event; True if it is the one in N to log."""
+        self.count += 1
+        every = _every.get(self.category, 1)
+        return every > 0 and self.count % every == 0
+
+    def log(self, level: int, msg: str, *args) -> None:
+        if self.sampled() and self.logger.isEnabledFor(level):
+            self.logger.log(level, msg, *args)
+
+    def info(self, msg: str, *args) -> None:
+        self.log(logging.INFO, msg, *args)
+
+    def debug(self, msg: str, *args) -> None:
+        self.log(logging.DEBUG, msg, *args)
+
+
+def configure_logging(settings: Settings) -> None:
+    """Root logger setup from ``Settings``; safe to call more than once."""
+    global _listener
+    # An override for one category keeps the defaults for the others
+    _every.clear()
+    _every.update(Settings.model_fields["log_sample_every"].default)
+    _every.update(settings.log_sample_every)
+    logging.basicConfig(level=settings.log_level.upper(), format=FORMAT)
+    root = logging.getLogger()
+    if not settings.log_async or _listener is not None:
+        return
+    handlers = [h for h in root.handlers if not isinstance(h, QueueHandler)]
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(records))
+    _listener.start()
+    # Drain what is still queued at interpreter exit
+    atexit.register(_listener.stop)
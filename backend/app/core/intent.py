@@ -0,0 +1,194 @@
+"""
+Intent classification for English cooking commands.
+
+Phrases live in one declarative table and are compiled once into a
+single trie-shaped regex with word boundaries, so classifying a sentence
+is one scan regardless of how many phrases there are. Every match adds
+its word count to its intent's score (longer phrases are more specific);
+ties go to the intent listed first.
+"""
+
+import re
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple
+
+from .state_machine import Intent
+
+INTENT_PHRASES: Dict[Intent, Tuple[str, ...]] = {
+    Intent.NEXT: (
+        "next step", "next", "continue", "start", "start cooking", "begin", "go", "go on",
+        "go ahead", "proceed", "move on", "keep going", "what's next", "what is next",
+    ),
+    Intent.REPEAT: (
+        "repeat", "repeat that", "again", "say that again", "come again", "pardon",
+        "what was that", "what did you say", "one more time",
+    ),
+    Intent.TIMER_QUERY: (
+        "timer", "time", "time left", "how long", "how much time", "minutes", "remaining",
+        "is it done", "how much longer",
+    ),
+    Intent.INGREDIENT_QUESTION: (
+        "ingredients", "ingredient", "what do i need", "what ingredients", "shopping",
+        "buy", "materials", "what goes in",
+    ),
+    Intent.RECIPE_QUESTION: (
+        "how many steps", "steps", "how to make", "recipe", "overview", "process",
+    ),
+    Intent.STEP_QUESTION: (
+        "which step", "what step", "where are we", "where was i", "progress",
+        "current step", "what am i doing",
+    ),
+}
+
+
+# Commands the StateMachine answers completely without the LLM
+NAVIGATION_INTENTS = frozenset({Intent.NEXT, Intent.REPEAT, Intent.STEP_QUESTION})
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """Regex alternation shaped like a character trie (shared prefixes once)."""
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + build(child)
+            for ch, child in sorted(node.items())
+            if ch
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Phrase may end here; the greedy `?` still prefers the longer one
+            return body + "?" if body.startswith("(?:") else "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class IntentMatcher:
+    def __init__(self, table: Mapping[Intent, Iterable[str]]) -> None:
+        self._lookup: Dict[str, Tuple[Intent, int]] = {}
+        self._priority = {intent: rank for rank, intent in enumerate(table)}
+        for intent, phrases in table.items():
+            for phrase in phrases:
+                key = normalize(phrase)
+                self._lookup.setdefault(key, (intent, len(key.split())))
+
+        # Word prefixes of longer phrases -> intents those phrases map to
+        self._extensions: Dict[str, Set[Intent]] = {}
+        for key, (intent, _) in self._lookup.items():
+            words = key.split()
+            for n in range(1, len(words)):
+                self._extensions.setdefault(" ".join(words[:n]), set()).add(intent)
+
+        pattern = _trie_pattern(self._lookup)
+        self._regex = re.compile(rf"(?<![\w'])(?:{pattern})(?![\w'])")
+
+    def scores(self, text: str) -> Dict[Intent, int]:
+        scores: Dict[Intent, int] = {}
+        lookup = self._lookup
+        for phrase in self._regex.findall(text.lower()):
+            intent, weight = lookup.get(phrase) or lookup[normalize(phrase)]
+            scores[intent] = scores.get(intent, 0) + weight
+        return scores
+
+    def last_match(self, text: str) -> Optional[Tuple[str, int]]:
+        """The last matched phrase in ``text`` and where it ends."""
+        last = None
+        for match in self._regex.finditer(text.lower()):
+            last = match
+        return (normalize(last.group(0)), last.end()) if last else None
+
+    def could_become_other(self, phrase: str, intent: Intent) -> bool:
+        """True if more words could turn ``phrase`` into another intent's phrase."""
+        return bool(self._extensions.get(phrase, set()) - {intent})
+
+    def ranked(self, text: str) -> Tuple[Optional[Intent], int, int]:
+        """(best intent, its score, runner-up score); ties go to table order."""
+        scores = self.scores(text)
+        if not scores:
+            return None, 0, 0
+        order = sorted(scores, key=lambda intent: (-scores[intent], self._priority[intent]))
+        runner_up = scores[order[1]] if len(order) > 1 else 0
+        return order[0], scores[order[0]], runner_up
+
+    def classify(self, text: str) -> Intent:
+        scores = self.scores(text)
+        if not scores:
+            return Intent.UNKNOWN
+        return max(scores, key=lambda intent: (scores[intent], -self._priority[intent]))
+
+
+_matcher = IntentMatcher(INTENT_PHRASES)
+
+
+def classify_intent(text: str) -> Intent:
+    """Keyword-based intent classification for English cooking commands"""
+    return _matcher.classify(text)
+
+
+class IncrementalIntentDetector:
+    """
+    Classifies a user's utterance while its transcription streams in.
+
+    Only completed words are considered (the last word of a delta may still
+    grow: "go" -> "good"). An intent is committed as soon as it leads the
+    runner-up by ``margin`` and its trailing phrase cannot still turn into
+    another intent's phrase ("what" -> "what step"); at most one intent is
+    committed per utterance.
+    """
+
+    _WORD_END = re.compile(r"[\s.?!,;:]")
+
+    def __init__(self, matcher: Optional[IntentMatcher] = None, margin: int = 1) -> None:
+        self.matcher = matcher or _matcher
+        self.margin = margin
+        self.text = ""
+        self.committed: Optional[Intent] = None
+
+    def reset(self) -> None:
+        self.text = ""
+        self.committed = None
+
+    def _completed(self) -> str:
+        for i in range(len(self.text) - 1, -1, -1):
+            if self._WORD_END.match(self.text, i):
+                return self.text[: i + 1]
+        return ""
+
+    def feed(self, delta: str) -> Optional[Intent]:
+        """Add a transcription delta; returns an intent the first time one is certain."""
+        self.text += delta
+        if self.committed is not None:
+            return None
+
+        text = self._completed()
+        intent, best, runner_up = self.matcher.ranked(text)
+        if intent is None or best - runner_up < self.margin:
+            return None
+        last = self.matcher.last_match(text)
+        if last is not None and not text[last[1]:].strip(" ") and \
+                self.matcher.could_become_other(last[0], intent):
+            return None  # the next word might still change the answer
+        self.committed = intent
+        return intent
+
+    def finish(self, transcript: str) -> Optional[Intent]:
+        """
+        End of utterance. Returns the final intent if none was committed
+        early (None when already handled), and resets for the next one.
+        """
+        intent = None
+        if self.committed is None:
+            intent = self.matcher.classify(transcript or self.text)
+        self.reset()
+        return intent
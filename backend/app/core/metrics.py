@@ -0,0 +1,173 @@
+"""
+In-process metrics rendered in the Prometheus text format.
+
+Recording takes no locks: every thread that records into a metric gets
+its own shard (a small list of numbers) and only ever writes to that
+one, so an observation is a bisect plus a few list updates. Scrapes sum
+the shards. Gauges are either set directly or computed on scrape.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+GaugeValue = Union[float, Dict[str, float]]
+
+REGISTRY: List["_Metric"] = []
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, registry: Optional[List["_Metric"]] = None) -> None:
+        self.name = name
+        self.help = help
+        (REGISTRY if registry is None else registry).append(self)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class _Sharded(_Metric):
+    """Per-thread lists of ``width`` numbers, summed on read."""
+
+    width = 1
+
+    def __init__(self, name: str, help: str, registry: Optional[List[_Metric]] = None) -> None:
+        super().__init__(name, help, registry)
+        self._local = threading.local()
+        self._shards: List[List[float]] = []
+
+    def _shard(self) -> List[float]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = [0.0] * self.width
+            self._shards.append(shard)  # list.append is atomic
+        return shard
+
+    def _totals(self) -> List[float]:
+        totals = [0.0] * self.width
+        for shard in list(self._shards):
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shard()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._totals()[0]
+
+    def render(self) -> List[str]:
+        return super().render() + [f"{self.name} {_fmt(self.value)}"]
+
+
+class Histogram(_Sharded):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, buckets: Sequence[float], registry: Optional[List[_Metric]] = None
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        # one slot per bucket, +Inf, then sum
+        self.width = len(self.buckets) + 2
+        super().__init__(name, help, registry)
+
+    def observe(self, value: float) -> None:
+        shard = self._shard()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    @property
+    def count(self) -> int:
+        return int(sum(self._totals()[:-1]))
+
+    def render(self) -> List[str]:
+        totals = self._totals()
+        lines = super().render()
+        cumulative = 0.0
+        for bound, count in zip(self.buckets, totals):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{_fmt(bound)}"}} {_fmt(cumulative)}')
+        cumulative += totals[len(self.buckets)]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {_fmt(cumulative)}')
+        lines.append(f"{self.name}_sum {_fmt(totals[-1])}")
+        lines.append(f"{self.name}_count {_fmt(cumulative)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Set from the event loop, or computed by ``fn`` at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, help: str, label: Optional[str] = None, registry: Optional[List[_Metric]] = None
+    ) -> None:
+        super().__init__(name, help, registry)
+        self.label = label
+        self.value = 0.0
+        self.fn: Optional[Callable[[], GaugeValue]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, fn: Callable[[], GaugeValue]) -> None:
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        value = self.fn() if self.fn is not None else self.value
+        lines = super().render()
+        if isinstance(value, dict):
+            lines += [f'{self.name}{{{self.label}="{key}"}} {_fmt(v)}' for key, v in value.items()]
+        else:
+            lines.append(f"{self.name} {_fmt(value)}")
+        return lines
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text format 0.0.4."""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+DOWNSAMPLE_SECONDS = Histogram(
+    "chefu_downsample_seconds", "DSP time per browser audio frame (resample + downmix)",
+    (25e-6, 50e-6, 100e-6, 250e-6, 500e-6, 1e-3, 2.5e-3, 5e-3, 10e-3, 25e-3),
+)
+PUSH_AUDIO_SECONDS = Histogram(
+    "chefu_push_audio_seconds", "Time to encode and write one input_audio_buffer.append",
+    (50e-6, 100e-6, 250e-6, 500e-6, 1e-3, 2.5e-3, 5e-3, 10e-3, 25e-3, 100e-3),
+)
+FIRST_DELTA_SECONDS = Histogram(
+    "chefu_first_delta_seconds", "Upstream speech_stopped to first response delta",
+    (0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0),
+)
+INTENT_TO_TTS_SECONDS = Histogram(
+    "chefu_intent_to_tts_seconds", "Classified intent to TTS message sent",
+    (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+AUDIO_CHUNKS = Counter("chefu_audio_chunks_total", "Audio appends sent upstream")
+AUDIO_BYTES = Counter("chefu_audio_bytes_total", "pcm16 bytes sent upstream")
+RESPONSE_DELTAS = Counter("chefu_response_deltas_total", "Response text deltas received from upstream")
+EVENTS_SKIPPED = Counter("chefu_upstream_events_skipped_total", "Upstream events dropped by type without decoding")
+UPSTREAM_RECONNECTS = Counter("chefu_upstream_reconnects_total", "Dropped upstream sessions replaced mid-session")
+UPSTREAM_ERRORS = Counter("chefu_upstream_errors_total", "Error events and failures on the upstream connection")
+ANSWER_CACHE_HITS = Counter("chefu_answer_cache_hits_total", "Questions answered from the recipe answer cache")
+ANSWER_CACHE_MISSES = Counter("chefu_answer_cache_misses_total", "Cacheable questions sent to the LLM")
+ACTIVE_SESSIONS = Gauge("chefu_active_sessions", "Voice sessions currently admitted")
+QUEUE_DEPTH = Gauge("chefu_audio_queue_depth", "Chunks waiting in audio pipeline queues, all sessions", label="stage")
@@ -0,0 +1,161 @@
+"""
+Streaming polyphase resampler for browser PCM.
+
+One instance lives per session and keeps the FIR history between chunks,
+so consecutive 4096-sample frames are filtered as one continuous signal.
+Filters are designed once per (rate_in, rate_out) pair and shared.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Taps per polyphase branch; 32 gives ~80 dB stopband with the Kaiser window
+TAPS_PER_PHASE = 32
+KAISER_BETA = 8.6
+
+
+@dataclass(frozen=True)
+class FilterBank:
+    """Polyphase decomposition of a low-pass FIR for an up/down ratio."""
+
+    up: int
+    down: int
+    taps: int
+    # bank[p] holds the reversed taps of phase p, ready for a dot product
+    bank: np.ndarray
+    # Half-band 2:1 decimator split: even taps + single centre tap
+    halfband_taps: np.ndarray | None = None
+    halfband_center: float = 0.0
+
+
+@lru_cache(maxsize=None)
+def design_filter(rate_in: int, rate_out: int) -> FilterBank:
+    """Design (and cache) the polyphase filter bank for ``rate_in -> rate_out``."""
+    g = gcd(rate_in, rate_out)
+    up, down = rate_out // g, rate_in // g
+
+    if up == 1 and down == 2:
+        # Half-band: 2 * TAPS_PER_PHASE - 1 taps (TAPS_PER_PHASE even) keeps
+        # the centre on an odd index so every other tap except the centre is
+        # exactly zero.
+        taps = 2 * TAPS_PER_PHASE - 1
+    else:
+        taps = TAPS_PER_PHASE * up
+        taps += (taps + 1) % 2  # odd length keeps the filter symmetric
+
+    cutoff = 0.5 / max(up, down)  # relative to the upsampled rate
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(taps, KAISER_BETA)
+    h *= up  # compensate for zero-stuffing gain
+
+    # Pad to a multiple of `up` so each phase has the same length
+    per_phase = -(-taps // up)
+    padded = np.zeros(per_phase * up)
+    padded[:taps] = h
+    bank = padded.reshape(per_phase, up).T[:, ::-1].astype(np.float32)
+    bank = np.ascontiguousarray(bank)
+    bank.setflags(write=False)
+
+    if up == 1 and down == 2:
+        center = (taps - 1) // 2
+        even = np.ascontiguousarray(h[0::2].astype(np.float32))
+        even.setflags(write=False)
+        return FilterBank(up, down, per_phase, bank, even, float(h[center]))
+    return FilterBank(up, down, per_phase, bank)
+
+
+class StreamingResampler:
+    """
+    Stateful float32 -> int16 resampler.
+
+    ``process`` accepts arbitrary-length float32 chunks and returns pcm16
+    bytes; filter history and fractional phase carry over between calls.
+    """
+
+    def __init__(self, rate_in: int, rate_out: int) -> None:
+        self.rate_in = rate_in
+        self.rate_out = rate_out
+        self.filter = design_filter(rate_in, rate_out)
+        self.passthrough = rate_in == rate_out
+
+        k = self.filter.taps
+        self._history = np.zeros(k - 1, dtype=np.float32)
+        # Position of the next output sample relative to the start of the
+        # next chunk, measured in upsampled samples.
+        self._t = 0
+        self._buf = np.zeros(0, dtype=np.float32)
+        self._out = np.zeros(0, dtype=np.float32)
+        self._pcm16 = np.zeros(0, dtype=np.int16)
+
+    def reset(self) -> None:
+        self._history[:] = 0.0
+        self._t = 0
+
+    def _ensure_capacity(self, n_in: int, n_out: int) -> None:
+        need_in = len(self._history) + n_in
+        if len(self._buf) < need_in:
+            self._buf = np.zeros(need_in, dtype=np.float32)
+        if len(self._out) < n_out:
+            self._out = np.zeros(n_out, dtype=np.float32)
+            self._pcm16 = np.zeros(n_out, dtype=np.int16)
+
+    def resample(self, audio: np.ndarray) -> np.ndarray:
+        """Resample a float32 chunk; returns a view into an internal buffer."""
+        n = len(audio)
+        if self.passthrough:
+            self._ensure_capacity(n, n)
+            out = self._out[:n]
+            np.copyto(out, audio, casting="same_kind")
+            return out
+
+        fb = self.filter
+        up, down, k = fb.up, fb.down, fb.taps
+        hist = len(self._history)
+        total = n * up
+        count = 0 if self._t >= total else -(-(total - self._t) // down)
+        self._ensure_capacity(n, count)
+
+        buf = self._buf[: hist + n]
+        buf[:hist] = self._history
+        buf[hist:] = audio
+        out = self._out[:count]
+
+        if count:
+            if fb.halfband_taps is not None:
+                i0 = self._t  # up == 1, so t is already an input index
+                half = len(fb.halfband_taps)
+                windows = sliding_window_view(buf[i0::2], half)[:count]
+                np.matmul(windows, fb.halfband_taps, out=out)
+                center = (2 * half - 2) // 2
+                out += fb.halfband_center * buf[i0 + center :: 2][:count]
+            else:
+                windows = sliding_window_view(buf, k)
+                for r in range(min(up, count)):
+                    t_r = self._t + r * down
+                    i_r, phase = divmod(t_r, up)
+                    step = down  # consecutive outputs of one phase are `up` apart
+                    rows = windows[i_r :: step][: len(range(r, count, up))]
+                    out[r::up] = rows @ fb.bank[phase]
+
+        self._t += count * down - total
+        self._history[:] = buf[len(buf) - hist :]
+        return out
+
+    def process(self, pcm_bytes: bytes) -> bytes:
+        """float32 PCM bytes in, clamped pcm16 bytes out."""
+        return self.process_array(np.frombuffer(pcm_bytes, dtype=np.float32))
+
+    def process_array(self, audio: np.ndarray) -> bytes:
+        """float32 samples in, clamped pcm16 bytes out."""
+        out = self.resample(audio)
+        np.clip(out, -1.0, 1.0, out=out)
+        out *= 32767
+        pcm16 = self._pcm16[: len(out)]
+        np.copyto(pcm16, out, casting="unsafe")
+        return pcm16.tobytes()
@@ -1,8 +1,9 @@
 import logging
 from enum import Enum, auto
-from typing import Callable, Awaitable
+from typing import Callable, Awaitable, Iterable, Optional
 
 from ..models.recipe import Recipe
+from .timer_manager import TimerManager, spoken_duration
 
 log = logging.getLogger(__name__)
 
@@ -22,21 +23,50 @@ class StateMachine:
     Conversational cooking assistant that helps with recipe questions.
     """
 
-    def __init__(self, recipe: Recipe, tts_callback: Callable[[str], Awaitable[None]]):
+    def __init__(
+        self,
+        recipe: Recipe,
+        tts_callback: Callable[[str], Awaitable[None]],
+        timers: Optional[TimerManager] = None,
+    ):
         self.recipe = recipe
         self.tts = tts_callback
+        self.timers = timers
         self.idx = 0
         self.started = False
 
     def _current_step(self) -> str:
-        if self.idx < len(self.recipe.steps):
-            return self.recipe.steps[self.idx]
+        steps = self.recipe.spoken_steps or self.recipe.steps
+        if self.idx < len(steps):
+            return steps[self.idx]
         return "You've completed all the steps! Great job!"
 
+    def _start_step_timers(self) -> str:
+        """Start the current step's timers; returns what to tell the cook."""
+        if self.timers is None:
+            return ""
+        started = self.timers.start_for_step(self.idx)
+        return "".join(
+            f" I've started a {spoken_duration(timer.duration.total_seconds(), adjective=True)} timer." for timer in started
+        )
+
+    def _get_timer_summary(self) -> str:
+        running = self.timers.active() if self.timers is not None else []
+        if not running:
+            if self.recipe.timers:
+                return "No timer is running right now."
+            return "This recipe doesn't have any timers."
+        return " ".join(
+            f"The {timer.label} timer has {spoken_duration(timer.remaining_sec)} remaining." for timer in running
+        )
+
     def _get_ingredients_summary(self) -> str:
-        # Extract ingredients from the recipe steps (simple approach)
-        # This could be enhanced with better parsing
-        return "Based on the recipe, you'll need beef, radish, seasonings, and other ingredients."
+        items = self.recipe.spoken_ingredients or self.recipe.ingredients
+        if not items:
+            return "This recipe doesn't list its ingredients separately. I'll mention them as we go through the steps."
+        if len(items) == 1:
+            return f"You'll need {items[0]}."
+        return f"You'll need {', '.join(items[:-1])}, and {items[-1]}."
 
     async def handle(self, intent: Intent) -> None:
         """Handle different types of cooking questions and requests"""
@@ -44,10 +74,16 @@ class StateMachine:
         if intent == Intent.NEXT:
             if not self.started:
                 self.started = True
-                await self.tts("Great! Let me help you with this recipe. Step one: " + self._current_step())
+                await self.tts(
+                    "Great! Let me help you with this recipe. Step one: " + self._current_step()
+                    + self._start_step_timers()
+                )
             else:
+                previous = self.idx
                 self.idx = min(self.idx + 1, len(self.recipe.steps) - 1)
-                await self.tts("Next step: " + self._current_step())
+                # On the last step NEXT repeats it; its timers already ran
+                timers = self._start_step_timers() if self.idx != previous else ""
+                await self.tts("Next step: " + self._current_step() + timers)
                 
         elif intent == Intent.REPEAT:
             if self.started:
@@ -56,10 +92,13 @@ class StateMachine:
                 await self.tts("We haven't started cooking yet. Would you like to begin?")
                 
         elif intent == Intent.TIMER_QUERY:
-            await self.tts("The timer has about 5 minutes remaining.")
+            await self.tts(self._get_timer_summary())
             
         elif intent == Intent.RECIPE_QUESTION:
-            await self.tts(f"This recipe has {len(self.recipe.steps)} steps total. It's for making beef soup.")
+            summary = f"This recipe has {len(self.recipe.steps)} steps total."
+            if self.recipe.title != "Untitled":
+                summary += f" It's for making {self.recipe.title}."
+            await self.tts(summary)
             
         elif intent == Intent.INGREDIENT_QUESTION:
             await self.tts(self._get_ingredients_summary())
@@ -71,6 +110,18 @@ class StateMachine:
             log.warning("Unknown intent")
             await self.tts("Sorry, I didn't understand that. You can ask me about ingredients, steps, or say commands like 'start', 'next step', or 'repeat'.")
 
+    async def restore(self, idx: int, started: bool, finished_timers: Iterable[str] = ()):
+        """Continue a resumed session where it left off."""
+        self.idx = idx
+        self.started = started
+        if started:
+            message = f"Welcome back! We're on step {self.idx + 1} of {len(self.recipe.steps)}. " + self._current_step()
+        else:
+            message = "Welcome back! Say 'start cooking' when you're ready to begin."
+        for label in finished_timers:
+            message += f" The {label} timer finished while you were away."
+        await self.tts(message)
+
     async def reset(self):
         """Initial greeting - don't automatically start reading steps"""
         self.idx = 0
@@ -1,30 +1,129 @@
-import asyncio
 import logging
-from datetime import timedelta
-from typing import Dict, Callable, Awaitable
+import time
+from typing import Any, Callable, Awaitable, Dict, List, Optional
 
 from ..models.recipe import Recipe, Timer
+from .timer_scheduler import ACTIVE, FIRED, PAUSED, ScheduledTimer, TimerScheduler, get_timer_scheduler
 
 log = logging.getLogger(__name__)
 
 
+def spoken_duration(seconds: float, adjective: bool = False) -> str:
+    """125 -> "2 minutes and 5 seconds" ("2 minute and 5 second" as an adjective)."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    parts = [
+        f"{value} {unit}{'s' if value != 1 and not adjective else ''}"
+        for value, unit in ((hours, "hour"), (minutes, "minute"), (secs, "second"))
+        if value
+    ]
+    if not parts:
+        return "less than a second"
+    return " and ".join(parts) if len(parts) <= 2 else f"{parts[0]}, {parts[1]} and {parts[2]}"
+
+
 class TimerManager:
-    def __init__(self, recipe: Recipe, tts_cb: Callable[[str], Awaitable[None]]):
+    """
+    One session's view of its recipe timers. The countdowns themselves run
+    on the shared ``TimerScheduler``; this keeps the session's handles.
+    """
+
+    def __init__(
+        self,
+        recipe: Recipe,
+        tts_cb: Callable[[str], Awaitable[None]],
+        scheduler: Optional[TimerScheduler] = None,
+    ):
         self.recipe = recipe
         self.tts = tts_cb
-        self.tasks: Dict[str, asyncio.Task] = {}
+        self.scheduler = scheduler or get_timer_scheduler()
+        self.handles: Dict[str, ScheduledTimer] = {}
+        self._timers: Dict[str, Timer] = {}
+
+    def start(self, timer: Timer, remaining_s: Optional[float] = None) -> bool:
+        """Start ``timer`` (or continue it with ``remaining_s`` left) unless it is already running or paused."""
+        handle = self.handles.get(timer.label)
+        if handle is not None and handle.state in (ACTIVE, PAUSED):
+            return False
+        seconds = timer.duration.total_seconds()
+        self.handles[timer.label] = self.scheduler.add(
+            seconds if remaining_s is None else remaining_s,
+            lambda: self._finished(timer.label, seconds),
+            owner=self,
+        )
+        self._timers[timer.label] = timer
+        log.info(f"⏰ Started timer '{timer.label}' ({seconds:.0f}s)")
+        return True
+
+    def start_for_step(self, step: int) -> List[Timer]:
+        """Start the timers of step ``step`` that have not run yet; returns the ones started."""
+        return [
+            timer for timer in self.recipe.timers
+            if timer.step == step and not self._fired(timer.label) and self.start(timer)
+        ]
+
+    def _fired(self, label: str) -> bool:
+        handle = self.handles.get(label)
+        return handle is not None and handle.state == FIRED
 
     def start_all(self):
         for timer in self.recipe.timers:
-            task = asyncio.create_task(self._countdown(timer))
-            self.tasks[timer.label] = task
+            self.start(timer)
+
+    async def _finished(self, label: str, seconds: float) -> None:
+        await self.tts(f"{label} timer finished! {spoken_duration(seconds)} are up.")
+
+    def pause(self, label: str) -> bool:
+        handle = self.handles.get(label)
+        return handle is not None and self.scheduler.pause(handle)
+
+    def resume(self, label: str) -> bool:
+        handle = self.handles.get(label)
+        return handle is not None and self.scheduler.resume(handle)
+
+    def cancel(self, label: str) -> bool:
+        handle = self.handles.pop(label, None)
+        return handle is not None and self.scheduler.cancel(handle)
+
+    def active(self) -> List[Timer]:
+        """Running and paused timers with their real ``remaining_sec``, soonest first."""
+        running = [
+            self._timers[label].model_copy(update={"remaining_sec": int(self.scheduler.remaining(handle) + 0.5)})
+            for label, handle in self.handles.items()
+            if handle.state in (ACTIVE, PAUSED)
+        ]
+        return sorted(running, key=lambda timer: timer.remaining_sec)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Running timers as wall-clock deadlines, paused ones as time left."""
+        now = time.time()
+        state = []
+        for label, handle in self.handles.items():
+            if handle.state == ACTIVE:
+                state.append({"label": label, "deadline": now + self.scheduler.remaining(handle)})
+            elif handle.state == PAUSED:
+                state.append({"label": label, "remaining_s": self.scheduler.remaining(handle)})
+        return state
 
-    async def _countdown(self, timer: Timer):
-        seconds = int(timer.duration.total_seconds())
-        await asyncio.sleep(seconds)
-        await self.tts(f"{timer.label} timer finished! {seconds // 60} minutes are up.")
+    def restore(self, state: List[Dict[str, Any]]) -> List[str]:
+        """Continue timers from ``snapshot``; returns labels that ran out meanwhile."""
+        by_label = {timer.label: timer for timer in self.recipe.timers}
+        now = time.time()
+        finished = []
+        for entry in state:
+            timer = by_label.get(entry["label"])
+            if timer is None:
+                continue
+            if "remaining_s" in entry:
+                self.start(timer, entry["remaining_s"])
+                self.pause(timer.label)
+            elif entry["deadline"] > now:
+                self.start(timer, entry["deadline"] - now)
+            else:
+                finished.append(timer.label)
+        return finished
 
     async def cancel_all(self):
-        for task in self.tasks.values():
-            task.cancel()
-        self.tasks.clear()
+        self.scheduler.cancel_owner(self)
+        self.handles.clear()
@@ -0,0 +1,202 @@
+"""
+Process-wide timer scheduler.
+
+Every session's cooking timers live in one min-heap of deadlines, driven
+by a single ``loop.call_at`` armed for the earliest one, instead of one
+sleeping task per timer. Add / resume push a heap entry (O(log n));
+cancel / pause only mark the timer and leave its entry behind, so they
+are O(1). Stale entries are skipped when they reach the top and the heap
+is rebuilt once they make up most of it. Timers are indexed by owner so
+a disconnecting session drops all of its timers at once.
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+log = logging.getLogger(__name__)
+
+ACTIVE, PAUSED, CANCELLED, FIRED = "active", "paused", "cancelled", "fired"
+
+
+class ScheduledTimer:
+    __slots__ = ("deadline", "remaining_s", "callback", "owner", "state", "seq")
+
+    def __init__(self, deadline: float, callback: Callable[[], Any], owner: Any, seq: int) -> None:
+        self.deadline = deadline
+        self.remaining_s = 0.0  # while paused
+        self.callback = callback
+        self.owner = owner
+        self.state = ACTIVE
+        self.seq = seq
+
+
+class TimerScheduler:
+    COMPACT_MIN = 64
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, ScheduledTimer]] = []
+        self._owners: Dict[Any, Set[ScheduledTimer]] = {}
+        self._seq = itertools.count()
+        self._stale = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._armed: Optional[asyncio.TimerHandle] = None
+        self._armed_at = float("inf")
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.fired = 0
+        self.cancelled = 0
+        self.compactions = 0
+
+    def _now(self) -> float:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # First use, or a new event loop (tests): the old arm is meaningless
+            self._loop, self._armed, self._armed_at = loop, None, float("inf")
+        return loop.time()
+
+    # -- scheduling ---------------------------------------------------------
+
+    def _push(self, timer: ScheduledTimer) -> None:
+        timer.seq = next(self._seq)
+        heapq.heappush(self._heap, (timer.deadline, timer.seq, timer))
+        if timer.deadline < self._armed_at:
+            self._arm()
+
+    def add(self, delay_s: float, callback: Callable[[], Any], owner: Any = None) -> ScheduledTimer:
+        """Call ``callback`` (sync or async) after ``delay_s`` seconds."""
+        timer = ScheduledTimer(self._now() + max(0.0, delay_s), callback, owner, 0)
+        self._owners.setdefault(owner, set()).add(timer)
+        self._push(timer)
+        return timer
+
+    def _retire(self, timer: ScheduledTimer, state: str) -> None:
+        if timer.state == ACTIVE:
+            self._stale += 1
+        timer.state = state
+        owned = self._owners.get(timer.owner)
+        if owned is not None:
+            owned.discard(timer)
+            if not owned:
+                del self._owners[timer.owner]
+
+    def cancel(self, timer: ScheduledTimer) -> bool:
+        if timer.state not in (ACTIVE, PAUSED):
+            return False
+        self._retire(timer, CANCELLED)
+        self.cancelled += 1
+        self._maybe_compact()
+        return True
+
+    def cancel_owner(self, owner: Any) -> int:
+        """Cancel every timer belonging to ``owner``; returns how many."""
+        timers = self._owners.pop(owner, ())
+        for timer in timers:
+            if timer.state == ACTIVE:
+                self._stale += 1
+            timer.state = CANCELLED
+        self.cancelled += len(timers)
+        self._maybe_compact()
+        return len(timers)
+
+    def pause(self, timer: ScheduledTimer) -> bool:
+        if timer.state != ACTIVE:
+            return False
+        timer.remaining_s = max(0.0, timer.deadline - self._now())
+        timer.state = PAUSED
+        self._stale += 1
+        self._maybe_compact()
+        return True
+
+    def resume(self, timer: ScheduledTimer) -> bool:
+        if timer.state != PAUSED:
+            return False
+        timer.deadline = self._now() + timer.remaining_s
+        timer.state = ACTIVE
+        self._push(timer)
+        return True
+
+    def remaining(self, timer: ScheduledTimer) -> float:
+        """Seconds left (frozen while paused, 0 once fired or cancelled)."""
+        if timer.state == ACTIVE:
+            return max(0.0, timer.deadline - self._now())
+        if timer.state == PAUSED:
+            return timer.remaining_s
+        return 0.0
+
+    # -- heap maintenance ---------------------------------------------------
+
+    @staticmethod
+    def _is_live(entry: Tuple[float, int, ScheduledTimer]) -> bool:
+        _, seq, timer = entry
+        return timer.state == ACTIVE and timer.seq == seq
+
+    def _maybe_compact(self) -> None:
+        if self._stale > self.COMPACT_MIN and self._stale * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+            self._stale = 0
+            self.compactions += 1
+
+    def _arm(self) -> None:
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+            self._stale -= 1
+        if self._armed is not None:
+            self._armed.cancel()
+            self._armed, self._armed_at = None, float("inf")
+        if heap:
+            self._armed_at = heap[0][0]
+            self._armed = self._loop.call_at(self._armed_at, self._fire)
+
+    def _fire(self) -> None:
+        self._armed, self._armed_at = None, float("inf")
+        now = self._loop.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if not self._is_live(entry):
+                self._stale -= 1
+                continue
+            timer = entry[2]
+            self._retire(timer, FIRED)
+            self._stale -= 1  # _retire counted the entry we just popped
+            self.fired += 1
+            self._run(timer.callback)
+        self._arm()
+
+    def _run(self, callback: Callable[[], Any]) -> None:
+        try:
+            result = callback()
+        except Exception:
+            log.exception("⏰ Timer callback failed")
+            return
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.error(f"⏰ Timer callback failed: {task.exception()!r}")
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._heap) - self._stale,
+            "heap": len(self._heap),
+            "owners": len(self._owners),
+            "fired": self.fired,
+            "cancelled": self.cancelled,
+            "compactions": self.compactions,
+        }
+
+
+@lru_cache()
+def get_timer_scheduler() -> TimerScheduler:
+    return TimerScheduler()
@@ -0,0 +1,239 @@
+"""
+Per-turn latency traces.
+
+A turn starts when upstream VAD reports speech and ends when the next one
+starts (or the session closes); if its response is still streaming by
+then, it stays open until that response is done. It collects timestamped
+marks (speech_stopped, transcription, first_delta, intent, tts_sent, ...)
+and spans (StateMachine.handle), all relative to the turn start. Its
+trace ID goes out on the browser messages of that turn, so a slow reply
+seen client-side can be found in the export.
+
+Finished turns go to OpenTelemetry when it is installed (and
+``trace_exporter`` is ``auto`` or ``otel``), otherwise one JSON line per
+turn to a size-rotated file written from a listener thread.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import time
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import get_settings
+
+try:  # optional OpenTelemetry export
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - depends on environment
+    otel_trace = None
+
+log = logging.getLogger(__name__)
+
+# Upstream events that mark a point in the turn (first occurrence wins)
+EVENT_MARKS = {
+    "input_audio_buffer.speech_stopped": "speech_stopped",
+    "input_audio_buffer.committed": "committed",
+    "conversation.item.input_audio_transcription.delta": "first_partial",
+    "conversation.item.input_audio_transcription.completed": "transcription",
+    "response.created": "response_created",
+    "response.text.delta": "first_delta",
+    "response.audio_transcript.delta": "first_delta",
+    "response.done": "response_done",
+}
+
+
+class TurnTrace:
+    def __init__(self, trace_id: str, session_id: str, turn: int) -> None:
+        self.trace_id = trace_id
+        self.session_id = session_id
+        self.turn = turn
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self.spans: List[Tuple[str, float, float]] = []
+        self.response_id: Optional[str] = None
+        self.handle = None  # exporter state (the OpenTelemetry root span)
+
+    def now_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "session_id": self.session_id,
+            "turn": self.turn,
+            "started_at": self.started_at,
+            "duration_ms": round(self.now_ms(), 2),
+            "marks": {name: round(ms, 2) for name, ms in self.marks.items()},
+            "spans": [{"name": n, "start_ms": round(s, 2), "end_ms": round(e, 2)} for n, s, e in self.spans],
+        }
+
+
+class JsonlTraceExporter:
+    """One JSON line per turn, rotated by size, written off the event loop."""
+
+    def __init__(self, path: str, max_bytes: int, backups: int) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener = QueueListener(records, handler)
+        self._listener.start()
+        atexit.register(self.close)
+        self._log = logging.Logger("chefu.traces")
+        self._log.addHandler(QueueHandler(records))
+        self.exported = 0
+
+    def close(self) -> None:
+        """Flush queued lines; safe to call twice."""
+        if self._listener._thread is not None:
+            self._listener.stop()
+
+    def start(self, trace: TurnTrace) -> None:
+        pass
+
+    def export(self, trace: TurnTrace) -> None:
+        self._log.info(json.dumps(trace.to_dict(), separators=(",", ":")))
+        self.exported += 1
+
+
+class OtelTraceExporter:
+    """A ``turn`` root span per trace, with marks as events and spans as children."""
+
+    def __init__(self) -> None:
+        self._tracer = otel_trace.get_tracer("chefu")
+        self.exported = 0
+
+    def start(self, trace: TurnTrace) -> None:
+        root = self._tracer.start_span(
+            "turn",
+            start_time=int(trace.started_at * 1e9),
+            attributes={"chefu.session_id": trace.session_id, "chefu.turn": trace.turn},
+        )
+        trace.handle = root
+        trace.trace_id = format(root.get_span_context().trace_id, "032x")
+
+    def export(self, trace: TurnTrace) -> None:
+        root = trace.handle
+        base_ns = int(trace.started_at * 1e9)
+        for name, ms in trace.marks.items():
+            root.add_event(name, timestamp=base_ns + int(ms * 1e6))
+        context = otel_trace.set_span_in_context(root)
+        for name, start_ms, end_ms in trace.spans:
+            span = self._tracer.start_span(name, context=context, start_time=base_ns + int(start_ms * 1e6))
+            span.end(end_time=base_ns + int(end_ms * 1e6))
+        root.end(end_time=base_ns + int(trace.now_ms() * 1e6))
+        self.exported += 1
+
+
+class TurnTracer:
+    """
+    One session's turns. Every method is a no-op without an exporter, so
+    callers never check whether tracing is on.
+    """
+
+    def __init__(self, session_id: str, exporter=None) -> None:
+        self.session_id = session_id
+        self.exporter = exporter
+        self.current: Optional[TurnTrace] = None
+        self.previous: Optional[TurnTrace] = None  # barged-in turn whose response is still streaming
+        self.turns = 0
+
+    @property
+    def trace_id(self) -> Optional[str]:
+        return self.current.trace_id if self.current is not None else None
+
+    def begin(self) -> None:
+        """Close the previous turn and start a new one."""
+        if self.exporter is None:
+            return
+        self._export(self.previous)
+        self.previous, self.current = self.current, None
+        if self.previous is not None and (
+            self.previous.response_id is None or "response_done" in self.previous.marks
+        ):
+            self._export(self.previous)
+            self.previous = None
+        self.turns += 1
+        self.current = TurnTrace(uuid.uuid4().hex, self.session_id, self.turns)
+        self.exporter.start(self.current)
+
+    def on_event(self, event_type: str, response_id: Optional[str] = None) -> None:
+        """Feed an upstream event: speech start opens a turn, others mark the turn they belong to."""
+        if event_type == "input_audio_buffer.speech_started":
+            self.begin()
+            return
+        name = EVENT_MARKS.get(event_type)
+        if name is None:
+            return
+        previous = self.previous
+        if previous is not None and response_id is not None and response_id == previous.response_id:
+            self._mark(previous, name)
+            if name == "response_done":
+                self._export(previous)
+                self.previous = None
+            return
+        if name == "response_created" and self.current is not None:
+            self.current.response_id = response_id
+        self.mark(name)
+
+    def mark(self, name: str) -> None:
+        self._mark(self.current, name)
+
+    @staticmethod
+    def _mark(trace: Optional[TurnTrace], name: str) -> None:
+        if trace is not None and name not in trace.marks:
+            trace.marks[name] = trace.now_ms()
+
+    @contextmanager
+    def span(self, name: str):
+        trace = self.current
+        start = trace.now_ms() if trace is not None else 0.0
+        try:
+            yield
+        finally:
+            if trace is not None:
+                trace.spans.append((name, start, trace.now_ms()))
+
+    def tag(self, message: dict) -> dict:
+        """Add the current trace ID to a browser message."""
+        if self.current is not None:
+            message["trace_id"] = self.current.trace_id
+        return message
+
+    def finish(self) -> None:
+        """Export whatever is still open (session end)."""
+        self._export(self.previous)
+        self._export(self.current)
+        self.previous = self.current = None
+
+    def _export(self, trace: Optional[TurnTrace]) -> None:
+        if trace is None:
+            return
+        try:
+            self.exporter.export(trace)
+        except Exception as export_error:
+            log.warning(f"⚠️ Could not export turn trace: {export_error}")
+
+
+@lru_cache()
+def get_trace_exporter():
+    """The process-wide exporter, or None when tracing is off."""
+    settings = get_settings()
+    if not settings.trace_enabled:
+        return None
+    if otel_trace is not None and settings.trace_exporter in ("auto", "otel"):
+        return OtelTraceExporter()
+    if settings.trace_exporter == "otel":
+        log.warning("⚠️ opentelemetry is not installed, writing traces as JSONL")
+    return JsonlTraceExporter(settings.trace_path, settings.trace_max_bytes, settings.trace_backups)
+
+
+def new_tracer(session_id: str) -> TurnTracer:
+    return TurnTracer(session_id, get_trace_exporter())
@@ -0,0 +1,125 @@
+"""
+Energy / zero-crossing voice activity gate for pcm16 chunks.
+
+Runs after resampling so only speech (plus hangover and pre-roll padding)
+is forwarded upstream; long stretches of kitchen noise are dropped or
+reduced to a tiny periodic keep-alive.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .config import Settings
+
+
+class EnergyVAD:
+    """
+    Stateful gate; ``gate(pcm16)`` returns the bytes to forward (maybe empty).
+
+    Each chunk is split into ``vad_frame_ms`` frames and classified in one
+    vectorized pass: a frame is speech when its energy clears both the
+    absolute threshold and the adaptive noise floor plus a margin, and its
+    zero-crossing rate is below ``vad_zcr_max`` (hiss and clatter cross zero
+    far more often than voiced speech).
+    """
+
+    def __init__(self, settings: Settings, sample_rate: int) -> None:
+        self.frame = max(1, sample_rate * settings.vad_frame_ms // 1000)
+        self.hangover = sample_rate * settings.vad_hangover_ms // 1000
+        self.preroll = sample_rate * settings.vad_preroll_ms // 1000
+        self.keepalive_every = sample_rate * settings.vad_keepalive_ms // 1000
+        self.keepalive = settings.vad_silence_mode == "keepalive"
+        self.threshold_db = settings.vad_threshold_db
+        self.margin_db = settings.vad_margin_db
+        self.zcr_max = settings.vad_zcr_max
+
+        self.noise_floor_db = settings.vad_threshold_db - settings.vad_margin_db
+        self._pos = 0                    # absolute sample position
+        self._last_speech = -(1 << 62)   # end sample of the last speech frame
+        self._open = False
+        self._tail = np.zeros(0, dtype=np.int16)  # pre-roll candidates
+        self._silent_run = 0
+
+        self.samples_in = 0
+        self.samples_out = 0
+
+    def _classify(self, x: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        f = x.astype(np.float32) * (1.0 / 32768)
+        energy = np.add.reduceat(f * f, starts) / lengths
+        energy_db = 10 * np.log10(energy + 1e-12)
+
+        crossings = np.empty(len(f), dtype=np.float32)
+        crossings[0] = 0
+        np.not_equal(np.signbit(f[1:]), np.signbit(f[:-1]), out=crossings[1:], casting="unsafe")
+        zcr = np.add.reduceat(crossings, starts) / lengths
+
+        floor = max(self.threshold_db, self.noise_floor_db + self.margin_db)
+        speech = (energy_db > floor) & (zcr < self.zcr_max)
+
+        quiet = energy_db[~speech]
+        if len(quiet):
+            # Slow EMA so a steady background hum raises the bar
+            self.noise_floor_db += 0.05 * (float(quiet.mean()) - self.noise_floor_db)
+        return speech
+
+    def gate(self, pcm: bytes) -> bytes:
+        x = np.frombuffer(pcm, dtype=np.int16)
+        n = len(x)
+        if not n:
+            return b""
+        self.samples_in += n
+
+        starts = np.arange(0, n, self.frame)
+        lengths = np.diff(np.append(starts, n))
+        speech = self._classify(x, starts, lengths)
+
+        ends = self._pos + starts + lengths
+        last = np.maximum.accumulate(np.where(speech, ends, self._last_speech))
+        frame_open = (ends - last) <= self.hangover
+        mask = np.repeat(frame_open, lengths)
+        opened = mask.any()
+        first = int(np.argmax(mask)) if opened else n
+
+        # Pre-roll: keep samples within `preroll` of the next open sample
+        idx = np.arange(n)
+        next_open = np.where(mask, idx, n + self.preroll + 1)
+        next_open = np.minimum.accumulate(next_open[::-1])[::-1]
+        mask |= (next_open - idx) <= self.preroll
+
+        out = x[mask]
+        carry = self.preroll - first
+        if opened and not self._open and carry > 0 and len(self._tail):
+            # Speech starts near the chunk edge: pull pre-roll from the
+            # unsent tail of previous chunks
+            out = np.concatenate((self._tail[-carry:], out))
+
+        if opened and self.preroll:
+            last_sent = n - int(np.argmax(mask[::-1]))
+            self._tail = x[last_sent:][-self.preroll:].copy()
+        elif not opened and self.preroll:
+            self._tail = np.concatenate((self._tail, x))[-self.preroll:]
+
+        self._open = bool(frame_open[-1])
+        self._last_speech = int(last[-1])
+        self._pos += n
+
+        if len(out):
+            self._silent_run = 0
+            self.samples_out += len(out)
+            return out.tobytes()
+
+        self._silent_run += n
+        if self.keepalive and self._silent_run >= self.keepalive_every:
+            self._silent_run = 0
+            self.samples_out += self.frame
+            return bytes(2 * self.frame)
+        return b""
+
+    def stats(self) -> dict:
+        return {
+            "samples_in": self.samples_in,
+            "samples_out": self.samples_out,
+            "noise_floor_db": round(self.noise_floor_db, 1),
+            "open": self._open,
+        }
@@ -1,19 +1,47 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-import logging
+from fastapi.responses import PlainTextResponse
+from contextlib import asynccontextmanager
 
+from .api.batch import router as batch_router
 from .api.websocket import router as ws_router
+from .core import metrics
 from .core.config import get_settings
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from .core.hotlog import configure_logging
+from .core.timer_scheduler import get_timer_scheduler
+from .services.admission import get_admission_controller
+from .services.answer_cache import get_answer_cache
+from .services.key_validator import get_key_validator
+from .services.realtime_pool import get_realtime_pool
+from .services.recipe_parser import get_recipe_cache
+from .services.session_store import get_session_store
 
 settings = get_settings()
-app = FastAPI(title="chefu", version="0.1.0", description="Voice-activated cooking assistant")
+
+# Configure logging (off-loop sink, sampled hot paths)
+configure_logging(settings)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Validate the API key once up front and keep the result warm
+    key_validator = get_key_validator()
+    key_validator.start()
+    # Pre-connect Realtime sessions so the first turn skips the handshake
+    realtime_pool = get_realtime_pool()
+    if key_validator.configured:
+        realtime_pool.start()
+    # Track event-loop lag for admission control
+    admission = get_admission_controller()
+    admission.start()
+    yield
+    await admission.stop()
+    await realtime_pool.stop()
+    await key_validator.stop()
+
+
+app = FastAPI(title="chefu", version="0.1.0", description="Voice-activated cooking assistant", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,11 +52,29 @@ app.add_middleware(
 
 # Include WebSocket router BEFORE static files mount
 app.include_router(ws_router)
+app.include_router(batch_router)
 
 # Add a test endpoint to verify API routing works
 @app.get("/api/health")
 async def health_check():
-    return {"status": "ok", "message": "chefu API is running", "openai_configured": bool(settings.openai_api_key)}
+    admission = get_admission_controller()
+    return {
+        "status": "ok" if admission.accepting else "busy",
+        "message": "chefu API is running",
+        "openai_configured": bool(settings.openai_api_key),
+        "openai_key": get_key_validator().health(),
+        "realtime_pool": get_realtime_pool().stats(),
+        "recipe_cache": get_recipe_cache().stats(),
+        "answer_cache": get_answer_cache().stats(),
+        "timers": get_timer_scheduler().stats(),
+        "sessions": get_session_store().stats(),
+        "capacity": admission.stats(),
+    }
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus scrape target."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 # Serve PWA static files (this should be LAST)
 app.mount("/", StaticFiles(directory="frontend/static", html=True), name="static")
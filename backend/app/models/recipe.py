@@ -1,18 +1,34 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import List, Optional
+from typing import Optional, Tuple
 
-from pydantic import BaseModel, conint
+from pydantic import BaseModel, ConfigDict, conint
 
 
 class Timer(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     label: str
     duration: timedelta
     remaining_sec: conint(ge=0) = 0
+    step: Optional[int] = None  # index into Recipe.steps
 
 
 class Recipe(BaseModel):
+    """
+    A parsed recipe. Parsed recipes are cached and shared between sessions,
+    so they are frozen, sequences included (lists are stored as tuples);
+    per-session state lives in StateMachine / timers.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
     title: str
-    steps: List[str]
-    timers: List[Timer] = []
+    steps: Tuple[str, ...]
+    timers: Tuple[Timer, ...] = ()
+    ingredients: Tuple[str, ...] = ()
+    # Steps / ingredients rewritten for TTS (units and fractions spelled out)
+    spoken_steps: Tuple[str, ...] = ()
+    spoken_ingredients: Tuple[str, ...] = ()
+    content_hash: str = ""
@@ -0,0 +1,170 @@
+"""
+Admission control for voice sessions.
+
+Each session costs DSP time and one upstream Realtime socket, so a worker
+only takes as many as it can serve without every session's audio
+lagging. Capacity is the smaller of ``max_sessions`` and the upstream
+socket budget left after the pre-warmed pool. New sessions are also held
+back while event-loop lag (or process CPU, if budgeted) is over budget.
+
+A session that does not fit waits in a short FIFO queue; when that is
+full, or the wait times out, it is rejected with a retry hint.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional
+
+from ..core.config import get_settings
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Admission:
+    admitted: bool
+    reason: str = ""
+    retry_after_s: float = 0.0
+    waited_s: float = 0.0
+
+
+class AdmissionController:
+    LAG_INTERVAL_S = 0.1
+
+    def __init__(
+        self,
+        max_sessions: int,
+        max_upstream: int,
+        pool_size: int,
+        lag_budget_ms: float,
+        cpu_budget: float,
+        queue_size: int,
+        queue_timeout_s: float,
+        retry_after_s: float,
+    ) -> None:
+        self.capacity = max(0, min(max_sessions, max_upstream - pool_size))
+        self.lag_budget_ms = lag_budget_ms
+        self.cpu_budget = cpu_budget
+        self.queue_size = queue_size
+        self.queue_timeout_s = queue_timeout_s
+        self.retry_after_s = retry_after_s
+
+        self.active = 0
+        self.queued = 0
+        self.lag_ms = 0.0
+        self.cpu = 0.0  # process CPU seconds per wall second
+        self._changed = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+
+        self.admitted = 0
+        self.rejected = 0
+
+    @property
+    def overloaded(self) -> bool:
+        if self.lag_budget_ms > 0 and self.lag_ms > self.lag_budget_ms:
+            return True
+        return self.cpu_budget > 0 and self.cpu > self.cpu_budget
+
+    def _has_room(self) -> bool:
+        return self.active < self.capacity and not self.overloaded
+
+    @property
+    def accepting(self) -> bool:
+        return self._has_room() or self.queued < self.queue_size
+
+    def _reject(self, reason: str, waited_s: float = 0.0) -> Admission:
+        self.rejected += 1
+        log.warning(f"🚦 Session rejected: {reason} ({self.active}/{self.capacity} active, {self.queued} queued)")
+        return Admission(False, reason, self.retry_after_s, waited_s)
+
+    async def admit(self, on_queued: Optional[Callable[[int], Awaitable[None]]] = None) -> Admission:
+        """Take a session slot, queueing briefly if the worker is full; ``release`` it when done."""
+        if self._has_room() and self.queued == 0:
+            self.active += 1
+            self.admitted += 1
+            return Admission(True)
+        if self.queued >= self.queue_size:
+            return self._reject("overloaded" if self.overloaded else "full")
+
+        started = time.monotonic()
+        self.queued += 1
+        try:
+            if on_queued is not None:
+                await on_queued(self.queued)
+            async with self._changed:
+                await asyncio.wait_for(self._changed.wait_for(self._has_room), self.queue_timeout_s)
+                self.active += 1
+        except asyncio.TimeoutError:
+            return self._reject("queue timeout", time.monotonic() - started)
+        finally:
+            self.queued -= 1
+        self.admitted += 1
+        return Admission(True, waited_s=time.monotonic() - started)
+
+    def release(self) -> None:
+        self.active -= 1
+        self._notify()
+
+    def _notify(self) -> None:
+        async def notify():
+            async with self._changed:
+                self._changed.notify_all()
+
+        if self.queued:
+            asyncio.ensure_future(notify())
+
+    async def _monitor(self) -> None:
+        loop = asyncio.get_running_loop()
+        cpu_before, wall_before = time.process_time(), loop.time()
+        while True:
+            await asyncio.sleep(self.LAG_INTERVAL_S)
+            now, cpu_now = loop.time(), time.process_time()
+            lag = max(0.0, (now - wall_before - self.LAG_INTERVAL_S) * 1000)
+            # Rise immediately, decay smoothly
+            self.lag_ms = lag if lag > self.lag_ms else self.lag_ms * 0.8 + lag * 0.2
+            self.cpu = (cpu_now - cpu_before) / max(now - wall_before, 1e-6)
+            cpu_before, wall_before = cpu_now, now
+            if self.queued and self._has_room():
+                self._notify()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._monitor(), name="admission-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "accepting": self.accepting,
+            "capacity": self.capacity,
+            "active": self.active,
+            "headroom": max(0, self.capacity - self.active),
+            "queued": self.queued,
+            "loop_lag_ms": round(self.lag_ms, 1),
+            "lag_budget_ms": self.lag_budget_ms,
+            "cpu": round(self.cpu, 2),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+@lru_cache()
+def get_admission_controller() -> AdmissionController:
+    settings = get_settings()
+    return AdmissionController(
+        max_sessions=settings.admission_max_sessions,
+        max_upstream=settings.admission_max_upstream,
+        pool_size=settings.realtime_pool_size,
+        lag_budget_ms=settings.admission_lag_budget_ms,
+        cpu_budget=settings.admission_cpu_budget,
+        queue_size=settings.admission_queue_size,
+        queue_timeout_s=settings.admission_queue_timeout_s,
+        retry_after_s=settings.admission_retry_after_s,
+    )
@@ -0,0 +1,134 @@
+"""
+Recipe-scoped cache of LLM answers to repeated questions.
+
+Cooks of the same recipe ask the LLM the same things ("what can I serve
+with this", "can I use butter instead of oil"). A completed LLM reply is
+stored under the recipe's content hash plus the normalized question, so
+the next session asking it gets the answer over TTS without a Realtime
+round trip. Only the turns that reach the LLM are keyed: questions the
+StateMachine does not handle (``Intent.UNKNOWN``), and of those only ones
+whose answer depends on the recipe alone. Where the cook is, what a timer
+shows, or what "yes" agrees to differs from session to session, so
+utterances that are not questions or that mention the session
+(``SESSION_WORDS``) are never cached.
+
+Entries are evicted LRU beyond ``max_entries`` or ``max_bytes`` of
+answer text, and expire ``ttl_s`` after they were stored.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from ..core import metrics
+from ..core.config import get_settings
+from ..core.intent import classify_intent
+from ..core.state_machine import Intent
+from ..models.recipe import Recipe
+
+# Dropped before matching: they change nothing about the question
+FILLER_WORDS = frozenset({
+    "um", "uh", "er", "hmm", "hey", "ok", "okay", "so", "well", "please", "chefu", "chef",
+    "can", "could", "you", "tell", "me", "just", "actually",
+})
+_PUNCTUATION = re.compile(r"[^\w\s']+")
+# First words of a question ("can"/"could" count here though matching drops them)
+QUESTION_WORDS = frozenset({
+    "what", "how", "which", "why", "where", "when", "who", "is", "are", "do", "does",
+    "can", "could", "should", "will", "would",
+})
+# Tie the answer to where the cook is or to what was just said
+SESSION_WORDS = frozenset({
+    "now", "next", "current", "currently", "step", "left", "yet", "done", "again",
+    "previous", "last", "that", "timer", "remaining",
+})
+
+
+def _words(text: str) -> List[str]:
+    return _PUNCTUATION.sub(" ", text.lower()).split()
+
+
+def normalize_question(text: str) -> str:
+    """ "Um, chefu -- what can I serve with this?" -> "what i serve with this" """
+    return " ".join(word for word in _words(text) if word not in FILLER_WORDS)
+
+
+def answer_key(recipe: Recipe, question: str) -> Optional[str]:
+    """Cache key for an LLM-bound ``question``, or None unless its answer depends on the recipe alone."""
+    words = _words(question)
+    opening = next((word for word in words if word in QUESTION_WORDS or word not in FILLER_WORDS), None)
+    if (
+        opening not in QUESTION_WORDS
+        or SESSION_WORDS.intersection(words)
+        or classify_intent(question) != Intent.UNKNOWN
+    ):
+        return None
+    return f"{recipe.content_hash}:{normalize_question(question)}"
+
+
+class AnswerCache:
+    """LRU of answers with a TTL, bounded by entry count and answer bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_s: float) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        # key -> (answer, stored at, answer bytes)
+        self._answers: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._answers.get(key)
+        if entry is not None and time.monotonic() - entry[1] > self.ttl_s:
+            self._drop(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            metrics.ANSWER_CACHE_MISSES.inc()
+            return None
+        self._answers.move_to_end(key)
+        self.hits += 1
+        metrics.ANSWER_CACHE_HITS.inc()
+        return entry[0]
+
+    def put(self, key: str, answer: str) -> None:
+        size = len(answer.encode())
+        if not self.enabled or size > self.max_bytes:
+            return
+        if key in self._answers:
+            self._drop(key)
+        self._answers[key] = (answer, time.monotonic(), size)
+        self.bytes += size
+        while len(self._answers) > self.max_entries or self.bytes > self.max_bytes:
+            self._drop(next(iter(self._answers)))
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        self.bytes -= self._answers.pop(key)[2]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._answers),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+        }
+
+
+@lru_cache()
+def get_answer_cache() -> AnswerCache:
+    settings = get_settings()
+    return AnswerCache(settings.answer_cache_size, settings.answer_cache_max_bytes, settings.answer_cache_ttl_s)
@@ -0,0 +1,243 @@
+"""
+Faster-than-realtime processing of a recorded cooking session.
+
+A whole recording is run through the live session's logic without being
+paced at audio speed:
+
+- DSP: ``AudioProcessor`` resamples it in ``batch_block_s`` blocks (one
+  vectorized pass per block instead of one per 85 ms browser frame);
+- turns: utterances are split locally on pauses of ``batch_silence_ms``
+  below ``vad_threshold_db``, since server VAD measures silence in audio
+  time and would pace the upload;
+- upstream: each utterance is pushed as fast as the socket takes it and
+  committed by hand on a session without turn detection, then
+  transcribed (and answered, unless ``replies`` is off);
+- intents: transcripts and replies drive ``StateMachine`` as in
+  ``local_intent_mode=manual``, so navigation turns never reach the LLM;
+  questions left to the LLM are answered from the answer cache when
+  another session already asked them.
+
+Turns are sent one at a time because a reply answers the latest committed
+turn. The result lists the transcript, intents, replies and TTS of each
+turn plus the step transitions.
+"""
+
+import asyncio
+import io
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from ..core.audio_format import AudioFormat, AudioFormatError
+from ..core.audio_processor import AudioProcessor
+from ..core.config import get_settings
+from ..core.intent import NAVIGATION_INTENTS, classify_intent
+from ..core.state_machine import Intent, StateMachine
+from ..core.timer_manager import TimerManager
+from .answer_cache import answer_key, get_answer_cache
+from .openai_client import OpenAIRealtimeClient
+from .recipe_parser import RecipeParser
+
+log = logging.getLogger(__name__)
+
+FRAME_MS = 20
+MIN_SPEECH_MS = 200   # shorter blips are clatter, and the API rejects < 100 ms commits
+PAD_MS = 300          # kept on both sides of an utterance, like server VAD's prefix padding
+APPEND_S = 1.0        # audio per input_audio_buffer.append
+
+
+@dataclass
+class BatchTurn:
+    start_s: float
+    end_s: float
+    transcript: Optional[str] = None
+    intent: Optional[str] = None
+    reply: Optional[str] = None
+    reply_intent: Optional[str] = None
+    cached: bool = False
+    step: int = 0  # step index after the turn
+    tts: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def decode_audio(data: bytes) -> Tuple[np.ndarray, AudioFormat]:
+    """An uploaded file as float32 (frames, channels) plus its format."""
+    try:
+        audio, rate = sf.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    except RuntimeError as e:  # soundfile.LibsndfileError
+        raise AudioFormatError(f"Unreadable audio file: {e}") from e
+    return audio, AudioFormat(rate, "float32", audio.shape[1])
+
+
+def resample_blocks(processor: AudioProcessor, audio: np.ndarray, block_s: float) -> np.ndarray:
+    """Whole recording -> mono pcm16 at ``sampling_rate_out``, ``block_s`` at a time."""
+    block = max(1, int(processor.format.sample_rate * block_s))
+    pcm = [processor.process(audio[i:i + block].tobytes()) for i in range(0, len(audio), block)]
+    return np.frombuffer(b"".join(pcm), dtype=np.int16)
+
+
+def split_utterances(
+    pcm: np.ndarray, sample_rate: int, threshold_db: float, silence_ms: int,
+    min_speech_ms: int = MIN_SPEECH_MS, pad_ms: int = PAD_MS,
+) -> List[Tuple[int, int]]:
+    """(start, end) sample ranges of speech separated by at least ``silence_ms`` of silence."""
+    frame = sample_rate * FRAME_MS // 1000
+    n = len(pcm) // frame
+    if not n:
+        return []
+    frames = pcm[: n * frame].reshape(n, frame).astype(np.float32) / 32768
+    energy_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-12)
+    voiced = np.flatnonzero(energy_db > threshold_db)
+    if not len(voiced):
+        return []
+    breaks = np.flatnonzero(np.diff(voiced) > silence_ms // FRAME_MS)
+    starts = np.r_[voiced[0], voiced[breaks + 1]]
+    ends = np.r_[voiced[breaks], voiced[-1]] + 1
+    long_enough = (ends - starts) * FRAME_MS >= min_speech_ms
+    pad = pad_ms // FRAME_MS
+    return [
+        (max(0, start - pad) * frame, min(n, end + pad) * frame)
+        for start, end in zip(starts[long_enough], ends[long_enough])
+    ]
+
+
+async def _next(events: asyncio.Queue, prefix: str, timeout: float, text: Optional[list] = None) -> str:
+    """Wait for the upstream message starting with ``prefix`` (or an error); text deltas go to ``text``."""
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return "[ERROR: timed out]"
+        try:
+            message = await asyncio.wait_for(events.get(), remaining)
+        except asyncio.TimeoutError:
+            return "[ERROR: timed out]"
+        if message is None:
+            return "[ERROR: upstream closed]"
+        if message.startswith(prefix) or message.startswith("[ERROR:"):
+            return message
+        if text is not None and not message.startswith("["):
+            text.append(message)
+
+
+async def process_recording(
+    audio: np.ndarray,
+    fmt: AudioFormat,
+    recipe_text: str,
+    replies: bool = True,
+    client: Optional[OpenAIRealtimeClient] = None,
+) -> dict:
+    """Run a recording through DSP, the Realtime API and the StateMachine; see the module docstring."""
+    settings = get_settings()
+    started = time.perf_counter()
+    recipe = await RecipeParser.parse(recipe_text)
+
+    # Segmentation below replaces the live gate, which would drop the pauses it needs
+    processor = AudioProcessor()
+    processor.set_format(fmt)
+    processor.vad = None
+    pcm = await asyncio.to_thread(resample_blocks, processor, audio, settings.batch_block_s)
+    rate = settings.sampling_rate_out
+    spans = split_utterances(pcm, rate, settings.vad_threshold_db, settings.batch_silence_ms)
+    dsp_s = time.perf_counter() - started
+
+    turns: List[BatchTurn] = []
+    transitions: List[dict] = []
+
+    async def tts(text: str):
+        if turns:
+            turns[-1].tts.append(text)
+
+    timers = TimerManager(recipe, tts)
+    sm = StateMachine(recipe, tts, timers)
+    answers = get_answer_cache()
+
+    async def handle(intent: Intent):
+        before = (sm.idx, sm.started)
+        try:
+            await sm.handle(intent)
+        except Exception as intent_error:
+            log.error(f"❌ Error handling intent {intent}: {intent_error}")
+        if (sm.idx, sm.started) != before:
+            transitions.append({"turn": len(turns) - 1, "from": before[0], "to": sm.idx, "started": sm.started})
+
+    client = client or OpenAIRealtimeClient(server_vad=False)
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def receive():
+        try:
+            async for delta in client.receive_text_deltas():
+                await events.put(delta)
+        finally:
+            await events.put(None)
+
+    append = int(rate * APPEND_S)
+    timeout = settings.batch_turn_timeout_s
+    try:
+        async with client:
+            receiver = asyncio.create_task(receive())
+            try:
+                for start, end in spans:
+                    turn = BatchTurn(round(start / rate, 2), round(end / rate, 2), step=sm.idx)
+                    turns.append(turn)
+                    for i in range(start, end, append):
+                        await client.push_audio(pcm[i:min(i + append, end)].tobytes())
+                    await client.commit_audio()
+
+                    message = await _next(events, "[TRANSCRIPTION:", timeout)
+                    if message.startswith("[ERROR:"):
+                        turn.error = message[8:-1]
+                        continue
+                    turn.transcript = message[16:-1]
+                    intent = classify_intent(turn.transcript)
+                    turn.intent = intent.value
+                    if intent != Intent.UNKNOWN:
+                        await handle(intent)
+
+                    if replies and intent not in NAVIGATION_INTENTS:
+                        key = answer_key(recipe, turn.transcript) if answers.enabled else None
+                        cached = answers.get(key) if key is not None else None
+                        if cached is not None:
+                            turn.reply, turn.cached = cached, True
+                            await tts(cached)
+                        else:
+                            parts: List[str] = []
+                            await client.create_response()
+                            message = await _next(events, "[RESPONSE_DONE:", timeout, parts)
+                            turn.reply = "".join(parts).strip()
+                            if message.startswith("[ERROR:"):
+                                turn.error = message[8:-1]
+                            elif key is not None and turn.reply and message == "[RESPONSE_DONE: completed]":
+                                answers.put(key, turn.reply)
+                        # As in the live session, the reply only steers when the cook's words did not
+                        if turn.reply and intent == Intent.UNKNOWN:
+                            reply_intent = classify_intent(turn.reply)
+                            turn.reply_intent = reply_intent.value
+                            if reply_intent != Intent.UNKNOWN:
+                                await handle(reply_intent)
+                    turn.step = sm.idx
+            finally:
+                receiver.cancel()
+                await asyncio.gather(receiver, return_exceptions=True)
+    finally:
+        await timers.cancel_all()
+
+    total_s = time.perf_counter() - started
+    audio_s = len(audio) / fmt.sample_rate
+    log.info(f"📼 Batch processed {audio_s:.1f}s of audio in {total_s:.2f}s ({len(turns)} turns)")
+    return {
+        "recipe": {"title": recipe.title, "steps": len(recipe.steps)},
+        "audio_s": round(audio_s, 2),
+        "turns": [asdict(turn) for turn in turns],
+        "transitions": transitions,
+        "final_step": sm.idx,
+        "timing": {
+            "dsp_s": round(dsp_s, 3),
+            "total_s": round(total_s, 3),
+            "speedup": round(audio_s / total_s, 1) if total_s else None,
+        },
+    }
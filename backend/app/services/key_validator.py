@@ -0,0 +1,132 @@
+"""
+Asynchronous, cached OpenAI API key validation.
+
+The key is checked once at startup and refreshed in the background; new
+WebSocket sessions read the cached result instead of making their own
+HTTPS round trip. Concurrent callers share a single in-flight check.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Optional
+
+import aiohttp
+
+from ..core.config import get_settings
+
+log = logging.getLogger(__name__)
+
+PLACEHOLDER_KEY = "your_openai_api_key_here"
+
+
+@dataclass
+class KeyStatus:
+    # True/False once OpenAI answered; None when the check itself failed
+    valid: Optional[bool]
+    checked_at: float
+    error: Optional[str] = None
+    latency_ms: Optional[float] = None
+
+
+class ApiKeyValidator:
+    def __init__(self, api_key: str, ttl_s: float, timeout_s: float, base_url: str) -> None:
+        self.api_key = api_key
+        self.ttl_s = ttl_s
+        self.timeout_s = timeout_s
+        self.base_url = base_url.rstrip("/")
+        self.status: Optional[KeyStatus] = None
+        self.checks = 0
+        self._inflight: Optional[asyncio.Future] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key) and self.api_key != PLACEHOLDER_KEY
+
+    def _fresh(self) -> bool:
+        return self.status is not None and time.monotonic() - self.status.checked_at < self.ttl_s
+
+    async def _fetch_status(self) -> KeyStatus:
+        started = time.monotonic()
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.timeout_s)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.get(
+                    f"{self.base_url}/models",
+                    headers={"Authorization": f"Bearer {self.api_key}"},
+                ) as resp:
+                    latency = (time.monotonic() - started) * 1000
+                    if resp.status == 200:
+                        return KeyStatus(True, time.monotonic(), latency_ms=latency)
+                    if resp.status in (401, 403):
+                        body = await resp.text()
+                        return KeyStatus(False, time.monotonic(), f"HTTP {resp.status}: {body[:200]}", latency)
+                    return KeyStatus(None, time.monotonic(), f"HTTP {resp.status}", latency)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return KeyStatus(None, time.monotonic(), f"{type(e).__name__}: {e}")
+
+    async def validate(self, force: bool = False) -> KeyStatus:
+        """Cached key status; at most one upstream check is in flight."""
+        if not self.configured:
+            return KeyStatus(False, time.monotonic(), "OPENAI_API_KEY not configured")
+        if not force and self._fresh():
+            return self.status
+
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._refresh())
+        return await asyncio.shield(self._inflight)
+
+    async def _refresh(self) -> KeyStatus:
+        try:
+            self.checks += 1
+            status = await self._fetch_status()
+            # Keep a known-good verdict through transient network failures
+            if status.valid is None and self.status is not None and self.status.valid:
+                log.warning(f"⚠️ OpenAI API key re-check failed, keeping previous result: {status.error}")
+                self.status.checked_at = status.checked_at
+                return self.status
+            self.status = status
+            if status.valid:
+                log.info(f"✅ OpenAI API key validated in {status.latency_ms:.0f} ms")
+            else:
+                log.error(f"❌ OpenAI API key validation failed: {status.error}")
+            return status
+        finally:
+            self._inflight = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await self.validate(force=True)
+            await asyncio.sleep(self.ttl_s * 0.8)
+
+    def start(self) -> None:
+        """Validate now and keep the cache warm in the background."""
+        if self.configured and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop(), name="api-key-refresh")
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+    def health(self) -> dict:
+        if self.status is None:
+            return {"configured": self.configured, "valid": None, "checks": self.checks}
+        info = asdict(self.status)
+        info["age_s"] = round(time.monotonic() - info.pop("checked_at"), 1)
+        return {"configured": self.configured, "checks": self.checks, **info}
+
+
+@lru_cache()
+def get_key_validator() -> ApiKeyValidator:
+    settings = get_settings()
+    return ApiKeyValidator(
+        settings.openai_api_key,
+        ttl_s=settings.openai_key_check_ttl_s,
+        timeout_s=settings.openai_key_check_timeout_s,
+        base_url=settings.openai_api_base,
+    )
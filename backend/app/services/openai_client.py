@@ -5,26 +5,78 @@ Based on official OpenAI Realtime API documentation.
 
 import json
 import logging
-import base64
 import asyncio
+import random
+import time
+from collections import deque
 import websockets
+from websockets.frames import OP_TEXT
 from websockets.legacy.client import WebSocketClientProtocol
 
+from ..core import metrics
 from ..core.config import get_settings
+from ..core.hotlog import SampledLogger
+from . import realtime_codec
 
 log = logging.getLogger(__name__)
 MODEL = "gpt-4o-realtime-preview-2024-12-17"
+# Skipped by type before decoding; the browser speaks the text itself
+IGNORED_EVENTS = frozenset({"response.audio.delta", "response.audio.done", "rate_limits.updated"})
+# Smaller events decode faster than a sniff plus decode would cost
+SNIFF_MIN_BYTES = 1024
+# Writing a text frame straight from bytes uses legacy-protocol internals
+# (tested on websockets 12.0); without them, fall back to the public send()
+RAW_TEXT_FRAMES = all(hasattr(WebSocketClientProtocol, name) for name in ("ensure_open", "write_frame"))
 
 
 class OpenAIRealtimeClient:
-    def __init__(self):
+    def __init__(self, server_vad: bool = True):
         self.settings = get_settings()
+        # False: no turn detection upstream; the caller commits each turn (batch)
+        self.server_vad = server_vad
         self.ws: WebSocketClientProtocol | None = None
         self.session_id = None
+        self._append_encoder = realtime_codec.AppendEncoder()
+        self.active_response: str | None = None
+        self._cancelled: set[str] = set()
+        self._cancel_next = False
+        # Optional SessionCapture recording upstream events
+        self.capture = None
+        # Optional TurnTracer marking turn stages by event type
+        self.tracer = None
+        # User audio item the last yielded partial / transcription / response done belongs to
+        self.item_id: str | None = None
+        self._committed_item: str | None = None
+        self._response_items: dict[str, str | None] = {}
+        self._speech_stopped_at: float | None = None  # until the first delta after it
+
+        # Transparent reconnect: recent audio not yet answered is kept as
+        # (end offset, pcm) and replayed into the new session
+        self._replay: deque[tuple[int, bytes]] = deque()
+        self._replay_bytes = 0
+        self._replay_budget = self.settings.sampling_rate_out * 2 * self.settings.upstream_replay_ms // 1000
+        self._pushed = 0  # pcm bytes pushed over the client's lifetime
+        self._commit_offsets: dict[str, int] = {}
+        self._reconnecting = False
+        self._closing = False
+        self.reconnects = 0
+
+    @property
+    def response_item(self) -> str | None:
+        """User audio item the response being streamed answers."""
+        return self._response_items.get(self.active_response) if self.active_response else None
+
+    @property
+    def connected(self) -> bool:
+        return self.ws is not None and self.ws.open
+
+    async def connect(self):
+        """Open the socket and configure the session (idempotent)."""
+        if self.connected:
+            return self
 
-    async def __aenter__(self):
         # Official OpenAI Realtime API endpoint with model parameter
-        url = f"wss://api.openai.com/v1/realtime?model={MODEL}"
+        url = f"{self.settings.openai_realtime_url}?model={MODEL}"
         
         log.info(f"🔗 Connecting to OpenAI Realtime API: {url}")
         
@@ -41,7 +93,7 @@ class OpenAIRealtimeClient:
         
         # Wait for session.created event
         initial_event = await self.ws.recv()
-        session_created = json.loads(initial_event)
+        session_created = realtime_codec.loads(initial_event)
         
         if session_created.get("type") == "session.created":
             self.session_id = session_created["session"]["id"]
@@ -49,32 +101,33 @@ class OpenAIRealtimeClient:
         else:
             log.error(f"❌ Expected session.created, got: {session_created}")
             
-        # Configure session for audio input/output
+        # Audio in; text out unless response_modality asks for synthesized audio too
+        audio_out = {"voice": "alloy", "output_audio_format": "pcm16"}
         await self._send({
             "type": "session.update",
             "session": {
-                "modalities": ["audio", "text"],
+                "modalities": ["audio", "text"] if self.settings.response_modality == "audio" else ["text"],
                 "instructions": "You are a helpful cooking assistant. Respond naturally to cooking questions and commands.",
-                "voice": "alloy",
+                **(audio_out if self.settings.response_modality == "audio" else {}),
                 "input_audio_format": "pcm16",
-                "output_audio_format": "pcm16",
                 "input_audio_transcription": {
-                    "model": "whisper-1"
+                    "model": self.settings.transcription_model
                 },
                 "turn_detection": {
                     "type": "server_vad",
                     "threshold": 0.5,
                     "prefix_padding_ms": 300,
                     "silence_duration_ms": 500,
-                    "create_response": True
-                },
+                    # "manual": responses are requested per turn (see create_response)
+                    "create_response": self.settings.local_intent_mode != "manual"
+                } if self.server_vad else None,
                 "temperature": 0.8
             }
         })
         
         # Wait for session.updated confirmation
         session_updated = await self.ws.recv()
-        updated_event = json.loads(session_updated)
+        updated_event = realtime_codec.loads(session_updated)
         
         if updated_event.get("type") == "session.updated":
             log.info("✅ Session configured successfully")
@@ -83,29 +136,176 @@ class OpenAIRealtimeClient:
             
         return self
 
-    async def __aexit__(self, *exc):
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """Health check: True if the server answers a WebSocket ping in time."""
+        if not self.connected:
+            return False
+        try:
+            pong = await self.ws.ping()
+            await asyncio.wait_for(pong, timeout)
+            return True
+        except Exception as e:
+            log.warning(f"⚠️ OpenAI ping failed: {e}")
+            return False
+
+    async def close(self):
+        self._closing = True
         if self.ws:
             await self.ws.close()
             log.info("🔌 Disconnected from OpenAI Realtime API")
 
-    async def _send(self, message: dict):
+    async def __aenter__(self):
+        # Pooled clients arrive already connected and configured
+        return await self.connect()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _send_text(self, data) -> None:
+        """Send UTF-8 JSON bytes as a text frame, without a str round trip where possible."""
         if not self.ws:
             raise RuntimeError("WebSocket not connected")
-        await self.ws.send(json.dumps(message))
-        log.debug(f"📤 Sent: {message['type']}")
+        if not RAW_TEXT_FRAMES:
+            # A str is sent as a text frame; decoding also copies out of a reused buffer
+            await self.ws.send(bytes(data).decode())
+            return
+        await self.ws.ensure_open()
+        # write_frame serializes synchronously, so `data` may be a reused buffer
+        await self.ws.write_frame(True, OP_TEXT, data)
+
+    async def _send(self, message: dict):
+        await self._send_text(realtime_codec.dumps(message))
+        log.debug("📤 Sent: %s", message["type"])
 
     async def push_audio(self, pcm_bytes: bytes):
         """Push PCM audio bytes to the input audio buffer"""
         if not pcm_bytes:
             return
-            
-        # Convert PCM bytes to base64
-        audio_base64 = base64.b64encode(pcm_bytes).decode('utf-8')
-        
-        await self._send({
-            "type": "input_audio_buffer.append",
-            "audio": audio_base64
-        })
+
+        self._pushed += len(pcm_bytes)
+        if self._replay_budget:
+            self._replay.append((self._pushed, pcm_bytes))
+            self._replay_bytes += len(pcm_bytes)
+            while self._replay_bytes > self._replay_budget:
+                self._replay_bytes -= len(self._replay.popleft()[1])
+        if self._reconnecting:
+            return  # goes up with the replay once the new session is configured
+
+        # Envelope + base64 written into a reusable buffer (see realtime_codec);
+        # calls are sequential (pipeline send stage), so the buffer is never shared
+        started = time.perf_counter()
+        try:
+            await self._send_text(self._append_encoder.encode(pcm_bytes))
+        except websockets.ConnectionClosed:
+            if self.settings.upstream_reconnect_attempts <= 0 or self._closing:
+                raise
+            return  # receive_text_deltas reconnects; this chunk is in the replay buffer
+        metrics.PUSH_AUDIO_SECONDS.observe(time.perf_counter() - started)
+        metrics.AUDIO_CHUNKS.inc()
+        metrics.AUDIO_BYTES.inc(len(pcm_bytes))
+
+    def _answered(self, item_id: str | None) -> None:
+        """Drop replay audio up to the commit of a user item that got its response."""
+        offset = self._commit_offsets.get(item_id) if item_id else None
+        if offset is None:
+            return
+        self._commit_offsets = {k: v for k, v in self._commit_offsets.items() if v > offset}
+        while self._replay and self._replay[0][0] <= offset:
+            self._replay_bytes -= len(self._replay.popleft()[1])
+
+    async def _reconnect(self) -> bool:
+        """Open a fresh session with jittered backoff and replay unanswered audio."""
+        attempts = self.settings.upstream_reconnect_attempts
+        self._reconnecting = True
+        try:
+            for attempt in range(attempts):
+                # Full jitter: sessions dropped together do not reconnect in lockstep
+                cap = min(self.settings.upstream_reconnect_max_s, self.settings.upstream_reconnect_base_s * 2 ** attempt)
+                await asyncio.sleep(random.uniform(0, cap))
+                if self._closing:
+                    return False
+                self.active_response = None
+                self._cancelled.clear()
+                self._cancel_next = False
+                self._response_items.clear()
+                self._commit_offsets.clear()
+                try:
+                    self.ws = None
+                    await self.connect()
+                    replayed = await self._replay_audio()
+                except Exception as e:
+                    log.warning(f"⚠️ Reconnect attempt {attempt + 1}/{attempts} failed: {e}")
+                    continue
+                self.reconnects += 1
+                metrics.UPSTREAM_RECONNECTS.inc()
+                log.info(f"🔁 Reconnected to OpenAI, replayed {replayed / 2 / self.settings.sampling_rate_out:.1f}s of audio")
+                return True
+            return False
+        finally:
+            self._reconnecting = False
+
+    async def _replay_audio(self) -> int:
+        """Send the replay ring, including chunks pushed while it is being sent."""
+        sent_upto, replayed = 0, 0
+        while pending := [(end, pcm) for end, pcm in self._replay if end > sent_upto]:
+            for end, pcm in pending:
+                await self._send_text(self._append_encoder.encode(pcm))
+                sent_upto, replayed = end, replayed + len(pcm)
+        return replayed
+
+    async def _send_control(self, message: dict) -> None:
+        """Send a control event; while reconnecting it is dropped rather than failing the session."""
+        try:
+            await self._send(message)
+        except (websockets.ConnectionClosed, RuntimeError):
+            if self.settings.upstream_reconnect_attempts <= 0 or self._closing:
+                raise
+            log.warning(f"⚠️ Dropped {message['type']}: upstream reconnecting")
+
+    async def _messages(self):
+        """Upstream messages; reconnects transparently when the socket drops."""
+        while True:
+            closed = None
+            try:
+                async for msg in self.ws:
+                    yield msg
+            except websockets.ConnectionClosed as e:
+                closed = e
+            if self._closing:
+                return
+            log.warning(f"🔌 OpenAI connection lost ({closed or 'closed by server'})")
+            metrics.UPSTREAM_ERRORS.inc()
+            if self.settings.upstream_reconnect_attempts <= 0 or not await self._reconnect():
+                if closed is not None:
+                    raise closed
+                return
+
+    def _on_response_delta(self) -> None:
+        metrics.RESPONSE_DELTAS.inc()
+        if self._speech_stopped_at is not None:
+            metrics.FIRST_DELTA_SECONDS.observe(time.perf_counter() - self._speech_stopped_at)
+            self._speech_stopped_at = None
+
+    async def commit_audio(self):
+        """End the user turn at the audio pushed so far (no server VAD)."""
+        await self._send_control({"type": "input_audio_buffer.commit"})
+
+    async def create_response(self):
+        """Ask for a reply to the committed user turn (manual mode)."""
+        await self._send_control({"type": "response.create"})
+
+    async def cancel_response(self):
+        """
+        Cancel the reply to the current turn and drop its remaining deltas.
+        If it has not been created yet, it is cancelled as soon as it is.
+        """
+        if self.active_response is None:
+            self._cancel_next = True
+            return
+        if self.active_response in self._cancelled:
+            return
+        self._cancelled.add(self.active_response)
+        await self._send_control({"type": "response.cancel", "response_id": self.active_response})
 
     async def receive_text_deltas(self):
         """
@@ -115,29 +315,46 @@ class OpenAIRealtimeClient:
             raise RuntimeError("WebSocket not connected")
             
         log.info("📝 Starting to receive events from OpenAI")
+        event_log = SampledLogger(log, "event")
         
-        async for msg in self.ws:
+        async for msg in self._messages():
+            if len(msg) >= SNIFF_MIN_BYTES and realtime_codec.sniff_type(msg) in IGNORED_EVENTS:
+                metrics.EVENTS_SKIPPED.inc()
+                continue
             try:
-                data = json.loads(msg)
+                data = realtime_codec.loads(msg)
                 event_type = data.get("type", "unknown")
                 
-                log.debug(f"📨 Received event: {event_type}")
+                event_log.debug("📨 Received event: %s", event_type)
+                if self.capture is not None:
+                    self.capture.event(data)
+                if self.tracer is not None:
+                    self.tracer.on_event(event_type, data.get("response_id") or data.get("response", {}).get("id"))
                 
                 # Handle different event types
                 if event_type == "response.audio_transcript.delta":
                     # Text transcript of the audio response
-                    if delta := data.get("delta"):
+                    if (delta := data.get("delta")) and data.get("response_id") not in self._cancelled:
+                        self._on_response_delta()
                         yield delta
                         
                 elif event_type == "response.text.delta":
                     # Direct text response
-                    if delta := data.get("delta"):
+                    if (delta := data.get("delta")) and data.get("response_id") not in self._cancelled:
+                        self._on_response_delta()
                         yield delta
                         
+                elif event_type == "conversation.item.input_audio_transcription.delta":
+                    # Partial user transcript (gpt-4o-transcribe models)
+                    if delta := data.get("delta"):
+                        self.item_id = data.get("item_id")
+                        yield f"[PARTIAL: {delta}]"
+
                 elif event_type == "conversation.item.input_audio_transcription.completed":
                     # User speech transcription completed
                     if transcription := data.get("transcript"):
                         log.info(f"🎯 User speech transcribed: '{transcription}'")
+                        self.item_id = data.get("item_id")
                         # This should be sent back to frontend for display
                         yield f"[TRANSCRIPTION: {transcription}]"
                         
@@ -146,12 +363,17 @@ class OpenAIRealtimeClient:
                     
                 elif event_type == "input_audio_buffer.speech_started":
                     log.info("🗣️ OpenAI detected speech start")
+                    self._cancel_next = False  # a pending cancel belonged to the previous turn
                     
                 elif event_type == "input_audio_buffer.speech_stopped":
                     log.info("🤫 OpenAI detected speech end")
+                    self._speech_stopped_at = time.perf_counter()
                     
                 elif event_type == "input_audio_buffer.committed":
                     log.info("✅ Audio buffer committed")
+                    self._committed_item = data.get("item_id")
+                    if self._committed_item is not None:
+                        self._commit_offsets[self._committed_item] = self._pushed
                     
                 elif event_type == "conversation.item.created":
                     if item := data.get("item"):
@@ -166,20 +388,36 @@ class OpenAIRealtimeClient:
                         
                 elif event_type == "response.created":
                     log.info("🚀 Response generation started")
-                    
+                    self.active_response = data.get("response", {}).get("id")
+                    # A response answers the latest committed user audio
+                    self._response_items[self.active_response] = self._committed_item
+                    if self._cancel_next:
+                        self._cancel_next = False
+                        await self.cancel_response()
+
                 elif event_type == "response.done":
-                    log.info("✅ Response generation completed")
+                    response = data.get("response", {})
+                    log.info(f"✅ Response generation {response.get('status', 'completed')}")
+                    self._cancelled.discard(response.get("id"))
+                    if response.get("id") == self.active_response:
+                        self.active_response = None
+                    self.item_id = self._response_items.pop(response.get("id"), None)
+                    self._answered(self.item_id)
+                    yield f"[RESPONSE_DONE: {response.get('status', 'completed')}]"
                     
                 elif event_type == "error":
                     error = data.get("error", {})
+                    if error.get("code") == "response_cancel_not_active":
+                        # Cancel raced with the end of the response; nothing to do
+                        log.debug("Response already finished before cancel")
+                        continue
                     log.error(f"❌ OpenAI API error: {error}")
+                    metrics.UPSTREAM_ERRORS.inc()
                     yield f"[ERROR: {error}]"
                     
-                else:
-                    log.debug(f"📋 Unhandled event type: {event_type}")
-                    # Log full event data for unhandled events to debug
-                    if event_type not in ["rate_limits.updated"]:
-                        log.debug(f"📋 Full event data: {data}")
+                elif event_type not in IGNORED_EVENTS:
+                    # Keys only: a full dump can carry base64 audio
+                    log.debug("📋 Unhandled event type: %s (keys: %s)", event_type, list(data))
                     
             except json.JSONDecodeError as e:
                 log.error(f"❌ Failed to parse JSON message: {e}")
@@ -188,4 +426,5 @@ class OpenAIRealtimeClient:
                 # If we get a connection close, re-raise it
                 if "1005" in str(e) or "CloseCode" in str(e):
                     log.error("🔌 OpenAI connection closed unexpectedly")
+                    metrics.UPSTREAM_ERRORS.inc()
                     raise
@@ -0,0 +1,87 @@
+"""
+Fast serialization for Realtime API events.
+
+``input_audio_buffer.append`` is the hottest message in the service, so
+it skips the dict / json.dumps / str round trip: the fixed JSON envelope
+lives in a reusable bytearray and only the base64 payload is rewritten
+per frame. The result is sent as a text frame straight from that buffer.
+
+Incoming events the client ignores (megabytes of base64 audio per
+response) can be recognised by ``sniff_type`` from the first few bytes,
+without decoding them. Uses orjson for everything else when it is
+installed.
+"""
+
+import binascii
+import json
+import re
+from typing import Any, Optional
+
+try:  # optional faster JSON backend
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(message: dict) -> bytes:
+    """Serialize an event to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(message)
+    return json.dumps(message, separators=(",", ":")).encode()
+
+
+def loads(data: Any) -> Any:
+    """Parse an event from str or bytes; raises json.JSONDecodeError."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# The server writes "type" first, or second after "event_id"
+_TYPE_STR = re.compile(r'\{\s*(?:"event_id"\s*:\s*"[^"]*"\s*,\s*)?"type"\s*:\s*"([^"]+)"')
+_TYPE_BYTES = re.compile(_TYPE_STR.pattern.encode())
+
+
+def sniff_type(data: Any) -> Optional[str]:
+    """An event's ``type`` read from its prefix, or None if it is not where expected."""
+    if isinstance(data, str):
+        match = _TYPE_STR.match(data)
+        return match.group(1) if match else None
+    match = _TYPE_BYTES.match(data)
+    return match.group(1).decode() if match else None
+
+
+class AppendEncoder:
+    """
+    Builds ``{"type":"input_audio_buffer.append","audio":"<b64>"}`` in place.
+
+    ``encode`` returns a memoryview into an internal buffer that is only
+    valid until the next call, so the frame must be written before then.
+    """
+
+    PREFIX = b'{"type":"input_audio_buffer.append","audio":"'
+    SUFFIX = b'"}'
+
+    def __init__(self, initial_pcm_bytes: int = 8192) -> None:
+        self._buf = bytearray()
+        self._view = memoryview(self._buf)
+        self._grow(initial_pcm_bytes)
+
+    def _grow(self, pcm_bytes: int) -> None:
+        self._view.release()
+        b64_len = 4 * ((pcm_bytes + 2) // 3)
+        self._buf = bytearray(len(self.PREFIX) + b64_len + len(self.SUFFIX))
+        self._buf[: len(self.PREFIX)] = self.PREFIX
+        self._view = memoryview(self._buf)
+        self.capacity = pcm_bytes
+
+    def encode(self, pcm: bytes) -> memoryview:
+        if len(pcm) > self.capacity:
+            self._grow(len(pcm))
+        start = len(self.PREFIX)
+        end = start + 4 * ((len(pcm) + 2) // 3)
+        self._view[start:end] = binascii.b2a_base64(pcm, newline=False)
+        self._view[end:end + len(self.SUFFIX)] = self.SUFFIX
+        return self._view[: end + len(self.SUFFIX)]
@@ -0,0 +1,161 @@
+"""
+Pool of pre-connected, pre-configured OpenAI Realtime sessions.
+
+Opening a Realtime session costs a TLS handshake plus the
+session.created / session.update / session.updated round trips. The pool
+does that work ahead of time so a new cooking session can start talking
+immediately. Sessions carry conversation state, so they are single-use:
+``acquire`` hands one out and the pool refills in the background.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Deque, Optional
+
+from ..core.config import get_settings
+from .openai_client import OpenAIRealtimeClient
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class _PooledSession:
+    client: OpenAIRealtimeClient
+    created_at: float
+
+
+class RealtimeSessionPool:
+    def __init__(
+        self,
+        size: int,
+        max_idle_s: float,
+        check_interval_s: float,
+        client_factory: Callable[[], OpenAIRealtimeClient] = OpenAIRealtimeClient,
+    ) -> None:
+        self.size = size
+        self.max_idle_s = max_idle_s
+        self.check_interval_s = check_interval_s
+        self.client_factory = client_factory
+
+        self._idle: Deque[_PooledSession] = deque()
+        self._connecting = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.unhealthy = 0
+        self.connect_failures = 0
+
+    @property
+    def ready(self) -> int:
+        return len(self._idle)
+
+    def _usable(self, entry: _PooledSession) -> bool:
+        return entry.client.connected and time.monotonic() - entry.created_at < self.max_idle_s
+
+    async def _discard(self, entry: _PooledSession) -> None:
+        try:
+            await entry.client.close()
+        except Exception as e:
+            log.debug(f"🔌 Error closing pooled session: {e}")
+
+    async def acquire(self) -> OpenAIRealtimeClient:
+        """A connected, configured client; falls back to a fresh connect."""
+        while self._idle:
+            entry = self._idle.popleft()
+            if self._usable(entry):
+                self.hits += 1
+                self._wakeup.set()  # refill in the background
+                log.info(f"♻️ Using pre-warmed OpenAI session ({self.ready} left in pool)")
+                return entry.client
+            self.expired += 1
+            await self._discard(entry)
+
+        self.misses += 1
+        self._wakeup.set()
+        log.info("🐢 Realtime pool empty, connecting a fresh OpenAI session")
+        return await self.client_factory().connect()
+
+    async def _add_one(self) -> None:
+        self._connecting += 1
+        try:
+            client = await self.client_factory().connect()
+            self._idle.append(_PooledSession(client, time.monotonic()))
+        finally:
+            self._connecting -= 1
+
+    async def _check_idle(self) -> None:
+        """Drop sessions that are too old or fail a ping."""
+        for entry in list(self._idle):
+            expired = not self._usable(entry)
+            if not expired and await entry.client.ping():
+                continue
+            if entry not in self._idle:
+                continue  # acquired while we were pinging
+            self._idle.remove(entry)
+            if expired:
+                self.expired += 1
+            else:
+                self.unhealthy += 1
+            await self._discard(entry)
+
+    async def _maintain(self) -> None:
+        backoff = 1.0
+        while True:
+            await self._check_idle()
+            while len(self._idle) + self._connecting < self.size:
+                try:
+                    await self._add_one()
+                    backoff = 1.0
+                except Exception as e:
+                    self.connect_failures += 1
+                    log.warning(f"⚠️ Could not pre-warm OpenAI session, retrying in {backoff:.0f}s: {e}")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 60.0)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.check_interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self.size > 0 and self._task is None:
+            self._task = asyncio.create_task(self._maintain(), name="realtime-pool")
+            log.info(f"🏊 Realtime session pool started (size={self.size})")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._idle:
+            await self._discard(self._idle.popleft())
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "ready": self.ready,
+            "connecting": self._connecting,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "unhealthy": self.unhealthy,
+            "connect_failures": self.connect_failures,
+        }
+
+
+@lru_cache()
+def get_realtime_pool() -> RealtimeSessionPool:
+    settings = get_settings()
+    return RealtimeSessionPool(
+        size=settings.realtime_pool_size,
+        max_idle_s=settings.realtime_pool_max_idle_s,
+        check_interval_s=settings.realtime_pool_check_interval_s,
+    )
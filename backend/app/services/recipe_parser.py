@@ -1,11 +1,134 @@
 """
-Prototype – regex first, fallback to GPT‑4 for robustness.
+Recipe text -> structured ``Recipe``.
+
+Regex based: an optional title line, an optional "Ingredients" section,
+numbered steps (or the lines of an "Instructions" section), durations in
+each step turned into ``Timer`` objects, and TTS-friendly spoken forms.
+
+Parsed recipes are immutable and cached by a hash of the normalized text,
+so every session that loads the same recipe shares one ``Recipe``.
 """
 
+import hashlib
 import re
-from typing import List
+import unicodedata
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
+from typing import List, Optional
+
+from ..core.config import get_settings
+from ..models.recipe import Recipe, Timer
+
+SECTION_PATTERN = re.compile(
+    r"^[#*\s]*(?P<name>ingredients?|instructions|directions|method|steps|preparation)[*\s]*"
+    r"(?::\s*(?P<rest>.*))?$",
+    re.I,
+)
+BULLET_PATTERN = re.compile(r"^(?:[-*•·]|\[\s?\])\s*")
+
+_NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "fifteen": 15, "twenty": 20, "thirty": 30, "forty": 40, "forty-five": 45, "sixty": 60,
+}
+_NUMBER = r"\d+(?:\.\d+)?|" + "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True))
+_UNIT_SECONDS = {"h": 3600, "m": 60, "s": 1}
+DURATION_PATTERN = re.compile(
+    rf"\b(?:(?P<half>half an hour)|(?P<n>{_NUMBER})(?:\s*(?:-|–|to)\s*(?:{_NUMBER}))?[\s-]*"
+    r"(?P<unit>hours?|hrs?|minutes?|mins?|seconds?|secs?))\b",
+    re.I,
+)
+_DURATION_JOIN = re.compile(r"^\s*(?:,|and)?\s*$", re.I)
+
+# Spoken forms
+_UNITS = {
+    "tbsp": ("tablespoon", "tablespoons"), "tbs": ("tablespoon", "tablespoons"),
+    "tsp": ("teaspoon", "teaspoons"), "g": ("gram", "grams"), "kg": ("kilogram", "kilograms"),
+    "ml": ("milliliter", "milliliters"), "l": ("liter", "liters"), "oz": ("ounce", "ounces"),
+    "lb": ("pound", "pounds"), "lbs": ("pound", "pounds"), "min": ("minute", "minutes"),
+    "mins": ("minute", "minutes"), "hr": ("hour", "hours"), "hrs": ("hour", "hours"),
+    "sec": ("second", "seconds"), "secs": ("second", "seconds"),
+}
+UNIT_PATTERN = re.compile(rf"\b(\d+(?:\.\d+)?(?: \d/\d)?|\d/\d)\s*({'|'.join(_UNITS)})\b\.?", re.I)
+# fraction -> (alone, after a whole number)
+_FRACTIONS = {
+    "1/2": ("half", "and a half"), "1/4": ("a quarter", "and a quarter"),
+    "3/4": ("three quarters", "and three quarters"), "1/3": ("a third", "and a third"),
+    "2/3": ("two thirds", "and two thirds"),
+}
+_UNICODE_FRACTIONS = {"½": "1/2", "¼": "1/4", "¾": "3/4", "⅓": "1/3", "⅔": "2/3"}
+FRACTION_PATTERN = re.compile(r"(?:\b(\d+)\s+)?\b(1/2|1/4|3/4|1/3|2/3)\b")
+TEMPERATURE_PATTERN = re.compile(r"(\d+)\s*°\s*([CF])\b")
+RANGE_PATTERN = re.compile(r"\b(\d+)\s*[-–]\s*(\d+)\b")
+
+
+def normalize_recipe(raw: str) -> str:
+    """Canonical text: NFC, one space between words, no blank lines."""
+    text = unicodedata.normalize("NFC", raw)
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def spoken_form(text: str) -> str:
+    """Rewrite recipe text so TTS reads it naturally ("1 ½ tbsp" -> "1 and a half tablespoons")."""
+    for char, fraction in _UNICODE_FRACTIONS.items():
+        text = re.sub(rf"(\d)?\s*{char}", lambda m: f"{m.group(1)} {fraction}" if m.group(1) else fraction, text)
+    text = UNIT_PATTERN.sub(
+        lambda m: f"{m.group(1)} {_UNITS[m.group(2).lower()][m.group(1) != '1' and m.group(1) not in _FRACTIONS]}",
+        text,
+    )
+    text = FRACTION_PATTERN.sub(
+        lambda m: f"{m.group(1)} {_FRACTIONS[m.group(2)][1]}" if m.group(1) else _FRACTIONS[m.group(2)][0],
+        text,
+    )
+    text = TEMPERATURE_PATTERN.sub(
+        lambda m: f"{m.group(1)} degrees {'Celsius' if m.group(2) == 'C' else 'Fahrenheit'}", text
+    )
+    text = RANGE_PATTERN.sub(r"\1 to \2", text)
+    text = text.replace("&", " and ").replace("°", " degrees")
+    text = re.sub(r"[*_#`]+", "", text)
+    return " ".join(text.split())
+
+
+def _duration_seconds(match: re.Match) -> float:
+    if match.group("half"):
+        return 1800
+    n = match.group("n").lower()
+    value = _NUMBER_WORDS[n] if n in _NUMBER_WORDS else float(n)
+    return value * _UNIT_SECONDS[match.group("unit")[0].lower()]
 
-from ..models.recipe import Recipe
+
+def extract_timers(step: str, index: int) -> List[Timer]:
+    """
+    One Timer per duration in ``step``. Adjacent durations are added up
+    ("1 hour and 30 minutes"); ranges use the lower bound so the cook
+    checks early ("10-15 minutes" -> 10 minutes).
+    """
+    totals: List[float] = []
+    last_end: Optional[int] = None
+    for match in DURATION_PATTERN.finditer(step):
+        seconds = _duration_seconds(match)
+        if last_end is not None and _DURATION_JOIN.match(step[last_end:match.start()]):
+            totals[-1] += seconds
+        else:
+            totals.append(seconds)
+        last_end = match.end()
+
+    label = f"Step {index + 1}"
+    return [
+        Timer(
+            label=label if len(totals) == 1 else f"{label} ({n + 1})",
+            duration=timedelta(seconds=seconds),
+            remaining_sec=int(seconds),
+            step=index,
+        )
+        for n, seconds in enumerate(totals)
+    ]
 
 
 class RecipeParser:
@@ -13,13 +136,96 @@ class RecipeParser:
 
     @classmethod
     async def parse(cls, raw: str) -> Recipe:
-        steps: List[str] = []
-        for match in cls.step_pattern.finditer(raw):
-            steps.append(match.group(1).strip())
+        """Parse ``raw``, or return the shared Recipe for identical content."""
+        text = normalize_recipe(raw)
+        key = content_hash(text)
+        cache = get_recipe_cache()
+        recipe = cache.get(key)
+        if recipe is None:
+            recipe = cls.parse_text(text, key)
+            cache.put(key, recipe)
+        return recipe
+
+    @classmethod
+    def parse_text(cls, text: str, key: str = "") -> Recipe:
+        title: Optional[str] = None
+        ingredients: List[str] = []
+        numbered: List[str] = []
+        section_lines: List[str] = []  # unnumbered lines under an instructions header
+        loose: List[str] = []           # unnumbered lines outside any section
+        section: Optional[str] = None
+
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            header = SECTION_PATTERN.match(line)
+            if header:
+                section = "ingredients" if header.group("name").lower().startswith("ingredient") else "steps"
+                rest = (header.group("rest") or "").strip()
+                if rest and section == "ingredients":
+                    ingredients.extend(part.strip() for part in re.split(r"[,;]", rest) if part.strip())
+                elif rest:
+                    section_lines.append(rest)
+                continue
+            if section == "ingredients" and not cls.step_pattern.match(line):
+                ingredients.append(BULLET_PATTERN.sub("", line))
+                continue
+            step = cls.step_pattern.match(line)
+            if step:
+                section = "steps"
+                numbered.append(step.group(1).strip())
+            elif section == "steps":
+                section_lines.append(BULLET_PATTERN.sub("", line))
+            else:
+                loose.append(line)
+
+        structured = bool(numbered or section_lines or ingredients)
+        if structured and loose:
+            title = loose[0]  # first line before any step or section
+        steps = numbered or section_lines or ([] if structured else loose)
+
+        return Recipe(
+            title=title or "Untitled",
+            steps=steps,
+            timers=[timer for i, step in enumerate(steps) for timer in extract_timers(step, i)],
+            ingredients=ingredients,
+            spoken_steps=[spoken_form(step) for step in steps],
+            spoken_ingredients=[spoken_form(item) for item in ingredients],
+            content_hash=key,
+        )
+
+
+class RecipeCache:
+    """Bounded LRU of parsed recipes keyed by content hash."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._recipes: "OrderedDict[str, Recipe]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Recipe]:
+        recipe = self._recipes.get(key)
+        if recipe is None:
+            self.misses += 1
+            return None
+        self._recipes.move_to_end(key)
+        self.hits += 1
+        return recipe
+
+    def put(self, key: str, recipe: Recipe) -> None:
+        if self.maxsize <= 0:
+            return
+        self._recipes[key] = recipe
+        self._recipes.move_to_end(key)
+        while len(self._recipes) > self.maxsize:
+            self._recipes.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {"size": len(self._recipes), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
 
-        if not steps:
-            # Fallback to trivial split
-            steps = [line.strip() for line in raw.splitlines() if line.strip()]
 
-        # Timer extraction left as exercise
-        return Recipe(title="Untitled", steps=steps)
+@lru_cache()
+def get_recipe_cache() -> RecipeCache:
+    return RecipeCache(get_settings().recipe_cache_size)
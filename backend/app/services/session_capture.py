@@ -0,0 +1,160 @@
+"""
+Opt-in capture of a session's client audio and upstream events.
+
+When ``capture_enabled`` is set, each session keeps the last
+``capture_seconds`` of browser audio (exactly as ``receive_frames``
+yielded it, before DSP) and the last ``capture_max_events`` Realtime
+events in memory-bounded rings. When the session ends both are spilled
+from a worker thread: a WAV in the client's format plus a JSONL event log
+whose first line describes the session. Replay either file with::
+
+    python -m backend.benchmarks.replay_capture captures/<session>.wav
+    python -m backend.benchmarks.e2e_latency captures/<session>.wav
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from ..core.audio_format import AudioFormat
+from ..core.config import get_settings
+
+log = logging.getLogger(__name__)
+
+# Upstream events not worth keeping (base64 audio, quota chatter)
+SKIPPED_EVENTS = frozenset({"response.audio.delta", "rate_limits.updated"})
+
+
+class SessionCapture:
+    def __init__(self, session_id: str, seconds: float, max_events: int, directory: str, keep: int) -> None:
+        self.session_id = session_id
+        self.seconds = seconds
+        self.directory = Path(directory)
+        self.keep = keep
+        self.started_at = time.time()
+        self._t0 = time.monotonic()
+
+        self.format: Optional[AudioFormat] = None
+        self._budget = 0
+        self._frames: Deque[bytes] = deque()
+        self._bytes = 0
+        self.audio_bytes = 0  # all audio seen, including what the ring dropped
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self.meta: Dict[str, Any] = {}
+
+    def audio(self, frame: bytes, fmt: AudioFormat) -> None:
+        """Record one client frame; the oldest frames fall off past the budget."""
+        if self.format is None:
+            self.format = fmt
+            self._budget = int(self.seconds * fmt.sample_rate) * fmt.frame_bytes
+        self._frames.append(frame)
+        self._bytes += len(frame)
+        self.audio_bytes += len(frame)
+        while self._bytes > self._budget and len(self._frames) > 1:
+            self._bytes -= len(self._frames.popleft())
+
+    @property
+    def audio_s(self) -> float:
+        """Seconds of client audio received so far."""
+        if self.format is None:
+            return 0.0
+        return self.audio_bytes / self.format.frame_bytes / self.format.sample_rate
+
+    def event(self, data: Dict[str, Any], direction: str = "in") -> None:
+        """Record an upstream event stamped with wall time and audio position."""
+        if data.get("type") in SKIPPED_EVENTS:
+            return
+        self.events.append({
+            "t": round(time.monotonic() - self._t0, 4),
+            "audio_s": round(self.audio_s, 3),
+            "dir": direction,
+            "event": data,
+        })
+
+    def stats(self) -> dict:
+        return {
+            "audio_s": round(self.audio_s, 2),
+            "buffered_s": round(self._bytes / self._budget * self.seconds, 2) if self._budget else 0.0,
+            "events": len(self.events),
+        }
+
+    def _header(self) -> Dict[str, Any]:
+        # Where the WAV starts within the session's audio, for lining up events
+        dropped = self.audio_bytes - self._bytes
+        return {
+            "session_id": self.session_id,
+            "started_at": self.started_at,
+            "format": self.format.to_message() if self.format else None,
+            "wav_offset_s": dropped / self.format.frame_bytes / self.format.sample_rate if self.format else 0.0,
+            **self.meta,
+        }
+
+    def _write(self, stem: Path, frames: List[bytes], events: List[Dict[str, Any]], header: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if frames and self.format is not None:
+            fmt = self.format
+            dtype = np.int16 if fmt.sample_format == "int16" else np.float32
+            audio = np.frombuffer(b"".join(frames), dtype=dtype)
+            audio = audio[: len(audio) - len(audio) % fmt.channels].reshape(-1, fmt.channels)
+            subtype = "PCM_16" if fmt.sample_format == "int16" else "FLOAT"
+            sf.write(str(stem.with_suffix(".wav")), audio, fmt.sample_rate, subtype=subtype)
+        with open(stem.with_suffix(".events.jsonl"), "w") as f:
+            f.write(json.dumps(header) + "\n")
+            for entry in events:
+                f.write(json.dumps(entry, default=str) + "\n")
+        self._prune()
+
+    def _prune(self) -> None:
+        logs = sorted(self.directory.glob("*.events.jsonl"), key=lambda p: p.stat().st_mtime)
+        for old in logs[: max(0, len(logs) - self.keep)]:
+            old.unlink(missing_ok=True)
+            old.with_name(old.name[: -len(".events.jsonl")] + ".wav").unlink(missing_ok=True)
+
+    async def spill(self) -> Optional[Path]:
+        """Write the rings to ``directory`` off the event loop; returns the WAV path."""
+        if self.format is None and not self.events:
+            return None
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        stem = self.directory / f"{stamp}-{self.session_id}"
+        # Copy the ring references on the loop; joining and encoding happen in the thread
+        await asyncio.to_thread(self._write, stem, list(self._frames), list(self.events), self._header())
+        log.info(f"🎙️ Session capture written to {stem}.wav ({self.stats()})")
+        return stem.with_suffix(".wav")
+
+
+def new_capture(session_id: str) -> Optional[SessionCapture]:
+    """A capture for ``session_id`` if ``capture_enabled`` is set."""
+    settings = get_settings()
+    if not settings.capture_enabled:
+        return None
+    return SessionCapture(
+        session_id,
+        seconds=settings.capture_seconds,
+        max_events=settings.capture_max_events,
+        directory=settings.capture_dir,
+        keep=settings.capture_keep,
+    )
+
+
+def load_capture(path: str) -> Tuple[AudioFormat, np.ndarray, List[Dict[str, Any]], Dict[str, Any]]:
+    """Read a spilled capture back: (format, audio as (frames, channels), events, header)."""
+    wav = Path(path)
+    events_path = wav.with_name(wav.stem + ".events.jsonl")
+    header: Dict[str, Any] = {}
+    events: List[Dict[str, Any]] = []
+    if events_path.exists():
+        with open(events_path) as f:
+            header = json.loads(f.readline() or "{}")
+            events = [json.loads(line) for line in f if line.strip()]
+    info = sf.info(str(wav))
+    sample_format = "int16" if info.subtype == "PCM_16" else "float32"
+    fmt = AudioFormat(info.samplerate, sample_format, info.channels)
+    audio, _ = sf.read(str(wav), dtype=sample_format, always_2d=True)
+    return fmt, audio, events, header
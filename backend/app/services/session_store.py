@@ -0,0 +1,204 @@
+"""
+Session snapshots so a client can resume after its WebSocket drops.
+
+A snapshot is small (recipe hash, step index, started flag, timer
+deadlines); recipes are stored once per content hash next to them. The
+store is pluggable: ``MemorySessionStore`` for a single process and
+``SqliteSessionStore`` to survive restarts. SQLite calls run in a worker
+thread so the event loop never waits on disk.
+"""
+
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import logging
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import get_settings
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionSnapshot:
+    session_id: str
+    recipe_hash: str
+    idx: int = 0
+    started: bool = False
+    # {"label", "deadline"} (wall clock) for running, {"label", "remaining_s"} for paused
+    timers: List[Dict[str, Any]] = field(default_factory=list)
+    saved_at: float = 0.0
+    # Bumped by each resume: a connection only saves over its own or older generations
+    generation: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, data: str) -> "SessionSnapshot":
+        return cls(**json.loads(data))
+
+
+class SessionStore(ABC):
+    """
+    Interface: snapshots expire ``ttl_s`` after their last save. ``put``
+    refuses (returns False) to replace a snapshot of a newer generation,
+    so a dropped connection tearing down late cannot roll back the
+    connection that resumed it.
+    """
+
+    def __init__(self, ttl_s: float) -> None:
+        self.ttl_s = ttl_s
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[SessionSnapshot]: ...
+
+    @abstractmethod
+    async def put(self, snapshot: SessionSnapshot) -> bool: ...
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None: ...
+
+    @abstractmethod
+    async def get_recipe(self, recipe_hash: str) -> Optional[str]: ...
+
+    @abstractmethod
+    async def put_recipe(self, recipe_hash: str, text: str) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> dict: ...
+
+
+class MemorySessionStore(SessionStore):
+    def __init__(self, ttl_s: float) -> None:
+        super().__init__(ttl_s)
+        self._sessions: Dict[str, SessionSnapshot] = {}
+        self._recipes: Dict[str, Tuple[str, float]] = {}
+
+    def _purge(self, now: float) -> None:
+        cutoff = now - self.ttl_s
+        self._sessions = {k: s for k, s in self._sessions.items() if s.saved_at >= cutoff}
+        live = {s.recipe_hash for s in self._sessions.values()}
+        self._recipes = {k: r for k, r in self._recipes.items() if k in live or r[1] >= cutoff}
+
+    async def get(self, session_id: str) -> Optional[SessionSnapshot]:
+        snapshot = self._sessions.get(session_id)
+        if snapshot is None or time.time() - snapshot.saved_at > self.ttl_s:
+            return None
+        return snapshot
+
+    async def put(self, snapshot: SessionSnapshot) -> bool:
+        stored = self._sessions.get(snapshot.session_id)
+        if stored is not None and stored.generation > snapshot.generation:
+            return False
+        snapshot.saved_at = time.time()
+        if stored is None and len(self._sessions) % 256 == 0:
+            self._purge(snapshot.saved_at)
+        self._sessions[snapshot.session_id] = snapshot
+        return True
+
+    async def delete(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+    async def get_recipe(self, recipe_hash: str) -> Optional[str]:
+        entry = self._recipes.get(recipe_hash)
+        return entry[0] if entry else None
+
+    async def put_recipe(self, recipe_hash: str, text: str) -> None:
+        self._recipes[recipe_hash] = (text, time.time())
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "sessions": len(self._sessions), "recipes": len(self._recipes)}
+
+
+class SqliteSessionStore(SessionStore):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY, snapshot TEXT NOT NULL, saved_at REAL NOT NULL);
+        CREATE INDEX IF NOT EXISTS sessions_saved_at ON sessions (saved_at);
+        CREATE TABLE IF NOT EXISTS recipes (
+            recipe_hash TEXT PRIMARY KEY, text TEXT NOT NULL, saved_at REAL NOT NULL);
+    """
+
+    def __init__(self, path: str, ttl_s: float) -> None:
+        super().__init__(ttl_s)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+        # One connection, one writer at a time
+        self._lock = asyncio.Lock()
+        self._writes = 0
+
+    async def _run(self, fn, *args):
+        async with self._lock:
+            return await asyncio.to_thread(fn, *args)
+
+    def _get(self, session_id: str) -> Optional[str]:
+        row = self._db.execute(
+            "SELECT snapshot FROM sessions WHERE session_id = ? AND saved_at >= ?",
+            (session_id, time.time() - self.ttl_s),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _put(self, snapshot: SessionSnapshot) -> bool:
+        saved = self._db.execute(
+            "INSERT INTO sessions VALUES (?, ?, ?) ON CONFLICT (session_id) DO UPDATE "
+            "SET snapshot = excluded.snapshot, saved_at = excluded.saved_at "
+            "WHERE IFNULL(json_extract(sessions.snapshot, '$.generation'), 0) <= ?",
+            (snapshot.session_id, snapshot.to_json(), snapshot.saved_at, snapshot.generation),
+        ).rowcount > 0
+        if not saved:
+            return False
+        self._writes += 1
+        if self._writes % 256 == 0:
+            cutoff = time.time() - self.ttl_s
+            self._db.execute("DELETE FROM sessions WHERE saved_at < ?", (cutoff,))
+            self._db.execute(
+                "DELETE FROM recipes WHERE saved_at < ? AND recipe_hash NOT IN "
+                "(SELECT json_extract(snapshot, '$.recipe_hash') FROM sessions)",
+                (cutoff,),
+            )
+        return True
+
+    async def get(self, session_id: str) -> Optional[SessionSnapshot]:
+        data = await self._run(self._get, session_id)
+        return SessionSnapshot.from_json(data) if data else None
+
+    async def put(self, snapshot: SessionSnapshot) -> bool:
+        snapshot.saved_at = time.time()
+        return await self._run(self._put, snapshot)
+
+    async def delete(self, session_id: str) -> None:
+        await self._run(self._db.execute, "DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def _get_recipe(self, recipe_hash: str) -> Optional[str]:
+        row = self._db.execute("SELECT text FROM recipes WHERE recipe_hash = ?", (recipe_hash,)).fetchone()
+        return row[0] if row else None
+
+    async def get_recipe(self, recipe_hash: str) -> Optional[str]:
+        return await self._run(self._get_recipe, recipe_hash)
+
+    async def put_recipe(self, recipe_hash: str, text: str) -> None:
+        await self._run(
+            self._db.execute, "INSERT OR REPLACE INTO recipes VALUES (?, ?, ?)", (recipe_hash, text, time.time())
+        )
+
+    def stats(self) -> dict:
+        return {"backend": "sqlite", "path": self.path, "writes": self._writes}
+
+    def close(self) -> None:
+        self._db.close()
+
+
+@lru_cache()
+def get_session_store() -> SessionStore:
+    settings = get_settings()
+    if settings.session_store == "sqlite":
+        return SqliteSessionStore(settings.session_store_path, settings.session_ttl_s)
+    return MemorySessionStore(settings.session_ttl_s)
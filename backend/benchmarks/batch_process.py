@@ -0,0 +1,63 @@
+"""
+Process a recorded cooking session faster than real time (the CLI
+counterpart of ``POST /api/v1/batch``, see ``services/batch.py``).
+
+Against the real Realtime API (OPENAI_API_KEY from the environment/.env)::
+
+    python -m backend.benchmarks.batch_process session.wav --recipe recipe.txt
+
+or offline against the in-process mock, whose scripted turns stand in
+for what was said::
+
+    python -m backend.benchmarks.batch_process session.wav --recipe recipe.txt --mock [--script turns.json]
+
+Prints the per-turn transcript, intents, replies, TTS and step
+transitions, plus DSP/total time and the speedup over real time.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+
+from backend.app.core.config import get_settings
+from backend.app.services.batch import decode_audio, process_recording
+
+from .mock_realtime import MockRealtimeServer, MockScript
+
+
+async def run(args) -> dict:
+    audio, fmt = decode_audio(Path(args.audio).read_bytes())
+    recipe = Path(args.recipe).read_text()
+    mock = None
+    if args.mock:
+        mock = MockRealtimeServer(MockScript.from_file(args.script) if args.script else MockScript())
+        await mock.start()
+        os.environ.update(mock.env())
+        get_settings.cache_clear()
+    try:
+        return await process_recording(audio, fmt, recipe, replies=not args.no_replies)
+    finally:
+        if mock is not None:
+            await mock.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("audio", help="recording (any format soundfile reads)")
+    parser.add_argument("--recipe", required=True, help="recipe text file")
+    parser.add_argument("--no-replies", action="store_true", help="transcribe and classify only, no LLM replies")
+    parser.add_argument("--mock", action="store_true", help="use the in-process mock Realtime API")
+    parser.add_argument("--script", help="MockScript JSON for --mock")
+    parser.add_argument("--json", help="also write the result to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
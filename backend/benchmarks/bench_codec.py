@@ -0,0 +1,88 @@
+"""
+Microbenchmark: input_audio_buffer.append encoding and event decoding.
+
+Compares the original path (b64encode -> str -> dict -> json.dumps ->
+UTF-8 for the text frame) with ``realtime_codec.AppendEncoder``, and
+json.loads with ``realtime_codec.loads`` and ``realtime_codec.sniff_type``. Reports payload throughput and
+transient bytes allocated per frame (tracemalloc peak).
+
+    python -m backend.benchmarks.bench_codec [--frames 20000] [--ms 85]
+"""
+
+import argparse
+import base64
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+from backend.app.services import realtime_codec
+
+
+def baseline_append(pcm: bytes) -> bytes:
+    audio_base64 = base64.b64encode(pcm).decode("utf-8")
+    return json.dumps({"type": "input_audio_buffer.append", "audio": audio_base64}).encode("utf-8")
+
+
+def _throughput(fn, payload, frames: int) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn(payload)
+    elapsed = time.perf_counter() - start
+    return len(payload) * frames / elapsed / 1e6
+
+
+def _transient_bytes(fn, payload, frames: int = 200) -> float:
+    fn(payload)  # warm caches / grow buffers
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn(payload)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - base
+    tracemalloc.stop()
+    return peak_total / frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=20_000)
+    parser.add_argument("--ms", type=int, default=85, help="audio per append at 24 kHz pcm16")
+    args = parser.parse_args()
+
+    pcm = (np.random.default_rng(0).normal(0, 3000, 24 * args.ms)).astype(np.int16).tobytes()
+    encoder = realtime_codec.AppendEncoder()
+    assert bytes(encoder.encode(pcm)) == baseline_append(pcm).replace(b'", "', b'","').replace(b'": "', b'":"')
+
+    print(f"append payload: {len(pcm)} bytes pcm16 ({args.ms} ms), JSON backend: {realtime_codec.JSON_BACKEND}")
+    for name, fn in (("baseline", baseline_append), ("fast", encoder.encode)):
+        mbps = _throughput(fn, pcm, args.frames)
+        alloc = _transient_bytes(fn, pcm)
+        print(f"  encode {name:8s} {mbps:8.1f} MB/s pcm  {alloc:9.0f} B allocated/frame "
+              f"({alloc / len(pcm):.2f}x payload)")
+
+    events = {
+        "text delta": json.dumps({"type": "response.audio_transcript.delta", "event_id": "e1",
+                                  "response_id": "r1", "delta": " simmer"}),
+        "audio delta": json.dumps({"type": "response.audio.delta", "event_id": "e2", "response_id": "r1",
+                                   "delta": base64.b64encode(pcm).decode()}),
+    }
+    for label, raw in events.items():
+        for name, fn in (("json", json.loads), (realtime_codec.JSON_BACKEND, realtime_codec.loads)):
+            start = time.perf_counter()
+            for _ in range(args.frames):
+                fn(raw)
+            us = (time.perf_counter() - start) / args.frames * 1e6
+            print(f"  decode {label:11s} {name:7s} {us:7.2f} us/event  {len(raw) / us:8.1f} MB/s")
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            realtime_codec.sniff_type(raw)
+        us = (time.perf_counter() - start) / args.frames * 1e6
+        print(f"  sniff  {label:11s} {'type':7s} {us:7.2f} us/event  {len(raw) / us:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Microbenchmark and accuracy check for intent classification.
+
+Compares the original substring scans with the compiled matcher on
+``intent_corpus.json``, then grows the phrase tables with synthetic
+phrases to show how per-call cost scales.
+
+    python -m backend.benchmarks.bench_intent [--calls 20000]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from backend.app.core.intent import INTENT_PHRASES, IntentMatcher, classify_intent
+from backend.app.core.state_machine import Intent
+
+CORPUS = Path(__file__).with_name("intent_corpus.json")
+
+
+def legacy_classify(text: str) -> Intent:
+    """The original six ordered ``any(keyword in text)`` scans."""
+    text = text.lower().strip()
+    if any(k in text for k in ["next step", "next", "continue", "start", "begin", "go", "proceed"]):
+        return Intent.NEXT
+    if any(k in text for k in ["repeat", "again", "what", "current", "now", "say that again"]):
+        return Intent.REPEAT
+    if any(k in text for k in ["timer", "time", "how long", "how much time", "minutes", "remaining"]):
+        return Intent.TIMER_QUERY
+    if any(k in text for k in ["ingredients", "what do i need", "what ingredients", "shopping", "buy", "materials"]):
+        return Intent.INGREDIENT_QUESTION
+    if any(k in text for k in ["how many steps", "steps", "how to make", "recipe", "overview", "process"]):
+        return Intent.RECIPE_QUESTION
+    if any(k in text for k in ["which step", "what step", "where are we", "progress", "current step"]):
+        return Intent.STEP_QUESTION
+    return Intent.UNKNOWN
+
+
+def _per_call_us(fn, texts, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(texts[i % len(texts)])
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    corpus = [(text, Intent(want)) for text, want in json.loads(CORPUS.read_text())]
+    texts = [text for text, _ in corpus]
+
+    print(f"corpus: {len(corpus)} utterances")
+    for name, fn in (("legacy", legacy_classify), ("compiled", classify_intent)):
+        correct = sum(fn(text) == want for text, want in corpus)
+        print(f"  {name:8s} accuracy {correct / len(corpus):6.1%}   {_per_call_us(fn, texts, args.calls):6.2f} us/call")
+
+    print("scaling (synthetic phrases added per intent):")
+    for extra in (0, 100, 1_000, 5_000):
+        table = {
+            intent: list(phrases) + [f"{intent.value} phrase {i}" for i in range(extra)]
+            for intent, phrases in INTENT_PHRASES.items()
+        }
+        built = time.perf_counter()
+        matcher = IntentMatcher(table)
+        built = (time.perf_counter() - built) * 1000
+        total = sum(len(p) for p in table.values())
+        print(f"  {total:6d} phrases: build {built:7.1f} ms   "
+              f"{_per_call_us(matcher.classify, texts, args.calls):6.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: shared heap timer scheduler vs one sleeping task per timer.
+
+Schedules tens of thousands of long timers spread over many sessions and
+reports the cost of add / remaining / pause+resume / per-session bulk
+cancel, memory held per timer, and how late a burst of short timers
+fires while the long ones are pending.
+
+    python -m backend.benchmarks.bench_timers [--timers 50000] [--sessions 1000]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import tracemalloc
+
+from backend.app.core.timer_scheduler import TimerScheduler
+
+
+def _us(start: float, n: int) -> float:
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def _lateness_ms(schedule, burst: int) -> tuple:
+    """Schedule ``burst`` timers 50-250 ms out and measure firing lateness."""
+    loop = asyncio.get_running_loop()
+    late = []
+    done = asyncio.Event()
+
+    def make(due):
+        def fire():
+            late.append((loop.time() - due) * 1000)
+            if len(late) == burst:
+                done.set()
+        return fire
+
+    for _ in range(burst):
+        delay = random.uniform(0.05, 0.25)
+        schedule(delay, make(loop.time() + delay))
+    await asyncio.wait_for(done.wait(), timeout=30)
+    late.sort()
+    return statistics.median(late), late[int(0.99 * (len(late) - 1))]
+
+
+async def bench_heap(timers: int, sessions: int, burst: int) -> None:
+    scheduler = TimerScheduler()
+    owners = [object() for _ in range(sessions)]
+    delays = [random.uniform(600, 3600) for _ in range(timers)]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    handles = [scheduler.add(d, lambda: None, owner=owners[i % sessions]) for i, d in enumerate(delays)]
+    add_us = _us(start, timers)
+    memory = tracemalloc.get_traced_memory()[0] / timers
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for handle in handles:
+        scheduler.remaining(handle)
+    remaining_us = _us(start, timers)
+
+    sample = random.sample(handles, min(10_000, timers))
+    start = time.perf_counter()
+    for handle in sample:
+        scheduler.pause(handle)
+        scheduler.resume(handle)
+    pause_us = _us(start, len(sample))
+
+    p50, p99 = await _lateness_ms(lambda d, cb: scheduler.add(d, cb), burst)
+
+    start = time.perf_counter()
+    for owner in owners:
+        scheduler.cancel_owner(owner)
+    cancel_ms = (time.perf_counter() - start) * 1000
+
+    print(f"  heap   add {add_us:6.2f} us  remaining {remaining_us:5.2f} us  pause+resume {pause_us:5.2f} us  "
+          f"{memory:6.0f} B/timer  burst late p50 {p50:5.2f} ms p99 {p99:5.2f} ms  "
+          f"cancel {sessions} sessions {cancel_ms:7.1f} ms")
+
+
+async def bench_tasks(timers: int, sessions: int, burst: int) -> None:
+    """The previous TimerManager: asyncio.create_task(sleep(duration)) per timer."""
+    async def countdown(delay):
+        await asyncio.sleep(delay)
+
+    delays = [random.uniform(600, 3600) for _ in range(timers)]
+    tracemalloc.start()
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(countdown(d)) for d in delays]
+    await asyncio.sleep(0)  # let every task reach its sleep
+    add_us = _us(start, timers)
+    memory = tracemalloc.get_traced_memory()[0] / timers
+    tracemalloc.stop()
+
+    def schedule(delay, fire):
+        async def run():
+            await asyncio.sleep(delay)
+            fire()
+        tasks.append(asyncio.create_task(run()))
+
+    p50, p99 = await _lateness_ms(schedule, burst)
+
+    start = time.perf_counter()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    cancel_ms = (time.perf_counter() - start) * 1000
+
+    print(f"  tasks  add {add_us:6.2f} us  remaining   n/a     pause+resume   n/a     "
+          f"{memory:6.0f} B/timer  burst late p50 {p50:5.2f} ms p99 {p99:5.2f} ms  "
+          f"cancel {sessions} sessions {cancel_ms:7.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--timers", type=int, default=50_000)
+    parser.add_argument("--sessions", type=int, default=1_000)
+    parser.add_argument("--burst", type=int, default=2_000, help="short timers fired during the run")
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{args.timers} pending timers over {args.sessions} sessions, {args.burst} firing")
+    asyncio.run(bench_heap(args.timers, args.sessions, args.burst))
+    asyncio.run(bench_tasks(args.timers, args.sessions, args.burst))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+End-to-end latency harness for ``/api/v1/ws``.
+
+Starts the mock Realtime API in-process and the app as a uvicorn
+subprocess pointed at it, then replays WAV files (or a synthetic
+utterance track) through concurrent browser-like sessions and reports:
+
+- connect_ms        WebSocket open -> greeting TTS
+- first_reply_ms    end of user speech -> first response delta or TTS
+                    (local answers, see LOCAL_INTENT_MODE, have no deltas)
+- first_delta_ms    end of user speech -> first response delta
+- intent_to_tts_ms  first response delta -> resulting TTS message
+- cpu_ms_per_session  app server CPU time / sessions
+
+Runs fully offline::
+
+    python -m backend.benchmarks.e2e_latency [file.wav ...] --sessions 4 --speed 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+import numpy as np
+import soundfile as sf
+import websockets
+
+from .mock_realtime import MockRealtimeServer, MockScript
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+RECIPE = "Beef soup\n1. Cut the beef into cubes.\n2. Simmer with radish for 20 minutes.\n3. Season and serve."
+CHUNK_MS = 85
+
+
+@dataclass
+class SessionResult:
+    connect_ms: Optional[float] = None
+    first_reply_ms: List[float] = field(default_factory=list)
+    first_delta_ms: List[float] = field(default_factory=list)
+    intent_to_tts_ms: List[float] = field(default_factory=list)
+    messages: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def synthetic_track(rate: int = 24_000, turns: int = 2) -> np.ndarray:
+    """Silence / voiced burst pattern that the mock's VAD reliably splits."""
+    t = np.arange(int(rate * 1.0)) / rate
+    voiced = 0.3 * np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+    gap = np.zeros(int(rate * 1.5))
+    parts = [np.zeros(int(rate * 0.5))]
+    for _ in range(turns):
+        parts += [voiced, gap]
+    return np.concatenate(parts).astype(np.float32)
+
+
+def speech_ends(audio: np.ndarray, rate: int, threshold: float = 0.02, silence_ms: float = 500) -> List[int]:
+    """Sample indices where utterances end (same rule as the mock VAD)."""
+    frame = rate * CHUNK_MS // 1000
+    n = len(audio) // frame
+    rms = np.sqrt(np.mean(audio[: n * frame].reshape(n, frame) ** 2, axis=1))
+    loud = rms >= threshold
+    ends, quiet_frames, in_speech = [], 0, False
+    for i, is_loud in enumerate(loud):
+        if is_loud:
+            in_speech, quiet_frames = True, 0
+        elif in_speech:
+            quiet_frames += 1
+            if quiet_frames * CHUNK_MS >= silence_ms:
+                ends.append((i - quiet_frames + 1) * frame)
+                in_speech = False
+    return ends
+
+
+def load_audio(path: Optional[str]) -> tuple[np.ndarray, int]:
+    if path is None:
+        return synthetic_track(), 24_000
+    audio, rate = sf.read(path, dtype="float32", always_2d=True)
+    return audio.mean(axis=1), rate
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _process_cpu_s(pid: int) -> Optional[float]:
+    try:
+        import psutil  # optional
+
+        times = psutil.Process(pid).cpu_times()
+        return times.user + times.system
+    except ImportError:
+        pass
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+async def run_session(url: str, audio: np.ndarray, rate: int, speed: float, tail_s: float) -> SessionResult:
+    result = SessionResult()
+    events: List[tuple[float, dict]] = []
+    started = time.perf_counter()
+    greeted = asyncio.Event()
+
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send(RECIPE)
+        await ws.send("READY")
+        await ws.send(json.dumps({"type": "audio_format", "sample_rate": rate, "format": "int16", "channels": 1}))
+
+        async def receive():
+            async for raw in ws:
+                now = time.perf_counter()
+                message = json.loads(raw)
+                events.append((now, message))
+                result.messages += 1
+                if "error" in message:
+                    result.errors.append(str(message["error"]))
+                if "tts" in message and not greeted.is_set():
+                    result.connect_ms = (now - started) * 1000
+                    greeted.set()
+
+        receiver = asyncio.create_task(receive())
+        await asyncio.wait_for(greeted.wait(), timeout=30)
+
+        pcm16 = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+        frame = rate * CHUNK_MS // 1000
+        ends = iter(speech_ends(audio, rate))
+        next_end = next(ends, None)
+        end_times: List[float] = []
+        t0 = time.perf_counter()
+        for i, offset in enumerate(range(0, len(pcm16), frame)):
+            await ws.send(pcm16[offset:offset + frame].tobytes())
+            if next_end is not None and offset + frame >= next_end:
+                end_times.append(time.perf_counter())
+                next_end = next(ends, None)
+            # Pace like a microphone, sped up by `speed`
+            delay = t0 + (i + 1) * CHUNK_MS / 1000 / speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        await asyncio.sleep(tail_s)
+        receiver.cancel()
+        await asyncio.gather(receiver, return_exceptions=True)
+
+    # Attribute the first delta (and following TTS) after each speech end
+    for end in end_times:
+        first_reply = next((t for t, m in events if t > end and ("delta" in m or "tts" in m)), None)
+        if first_reply is not None:
+            result.first_reply_ms.append((first_reply - end) * 1000)
+        first_delta = next((t for t, m in events if t > end and "delta" in m), None)
+        if first_delta is None:
+            continue
+        result.first_delta_ms.append((first_delta - end) * 1000)
+        tts = next((t for t, m in events if t > first_delta and "tts" in m), None)
+        if tts is not None:
+            result.intent_to_tts_ms.append((tts - first_delta) * 1000)
+    return result
+
+
+def _summary(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"n": 0, "p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "n": len(values),
+        "p50": round(statistics.median(ordered), 1),
+        "p95": round(p95, 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+async def run_benchmark(args) -> dict:
+    script = MockScript.from_file(args.script) if args.script else MockScript()
+    mock = MockRealtimeServer(script)
+    await mock.start()
+
+    port = _free_port()
+    env = {**os.environ, **mock.env(), **dict(kv.split("=", 1) for kv in args.env)}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=None if args.verbose else subprocess.DEVNULL,
+        stderr=None if args.verbose else subprocess.DEVNULL,
+    )
+    try:
+        async with aiohttp.ClientSession() as http:
+            for _ in range(100):
+                try:
+                    async with http.get(f"http://127.0.0.1:{port}/api/health") as resp:
+                        if resp.status == 200:
+                            break
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("app server did not start")
+
+        tracks = [load_audio(p) for p in (args.wav or [None])]
+        url = f"ws://127.0.0.1:{port}/api/v1/ws"
+        cpu_before = _process_cpu_s(server.pid)
+        wall = time.perf_counter()
+        results = await asyncio.gather(*(
+            run_session(url, *tracks[i % len(tracks)], args.speed, args.tail)
+            for i in range(args.sessions)
+        ))
+        wall = time.perf_counter() - wall
+        cpu_after = _process_cpu_s(server.pid)
+    finally:
+        # Keep the loop (and the mock) running while the app shuts down
+        server.terminate()
+        await asyncio.to_thread(server.wait, 15)
+        await mock.stop()
+
+    cpu_ms = None
+    if cpu_before is not None and cpu_after is not None:
+        cpu_ms = round((cpu_after - cpu_before) * 1000 / args.sessions, 1)
+    return {
+        "sessions": args.sessions,
+        "speed": args.speed,
+        "wall_s": round(wall, 2),
+        "connect_ms": _summary([r.connect_ms for r in results if r.connect_ms is not None]),
+        "first_reply_ms": _summary([v for r in results for v in r.first_reply_ms]),
+        "first_delta_ms": _summary([v for r in results for v in r.first_delta_ms]),
+        "intent_to_tts_ms": _summary([v for r in results for v in r.intent_to_tts_ms]),
+        "cpu_ms_per_session": cpu_ms,
+        "messages": sum(r.messages for r in results),
+        "errors": [e for r in results for e in r.errors],
+        "mock": mock.stats,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay audio through /api/v1/ws against a mock Realtime API")
+    parser.add_argument("wav", nargs="*", help="WAV files to replay (default: synthetic track)")
+    parser.add_argument("--sessions", type=int, default=1, help="concurrent sessions")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    parser.add_argument("--tail", type=float, default=2.0, help="seconds to wait after the last chunk")
+    parser.add_argument("--script", help="MockScript JSON for the mock server")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra app settings")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--verbose", action="store_true", help="show app server logs")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.json:
+        Path(args.json).write_text(text)
+    if report["errors"] or not report["first_reply_ms"]["n"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
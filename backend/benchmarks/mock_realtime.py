@@ -0,0 +1,313 @@
+"""
+Local stand-in for the OpenAI Realtime WebSocket API.
+
+Speaks the events ``OpenAIRealtimeClient`` consumes (session.created /
+session.updated, speech_started / speech_stopped, committed,
+transcription delta / completed, response.* deltas, error) with scriptable
+latencies and content, so the voice pipeline can be exercised and
+benchmarked offline.
+
+Speech detection runs on the appended pcm16 audio itself and is measured
+in audio time, so results do not depend on how fast audio is replayed.
+
+Run standalone::
+
+    python -m backend.benchmarks.mock_realtime --port 9100 [--script turns.json]
+
+then start the app with::
+
+    OPENAI_API_KEY=sk-mock \\
+    OPENAI_API_BASE=http://127.0.0.1:9100/v1 \\
+    OPENAI_REALTIME_URL=ws://127.0.0.1:9100/v1/realtime \\
+    uvicorn backend.app.main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+import numpy as np
+from aiohttp import WSMsgType, web
+
+log = logging.getLogger(__name__)
+
+SAMPLE_RATE = 24_000
+
+
+@dataclass
+class Turn:
+    transcript: str
+    reply: str
+
+
+@dataclass
+class MockScript:
+    """What the mock hears and says, and how slowly it does it."""
+
+    turns: List[Turn] = field(default_factory=lambda: [
+        Turn("next step", "Okay, moving on to the next step."),
+        Turn("repeat that", "Sure, here is the current step again."),
+    ])
+    session_created_ms: float = 20.0
+    session_updated_ms: float = 20.0
+    transcription_ms: float = 150.0
+    first_delta_ms: float = 300.0
+    delta_interval_ms: float = 30.0
+    speech_threshold: float = 0.02     # RMS of pcm16 / 32768
+    silence_ms: float = 500.0
+    error_after_appends: Optional[int] = None
+    # Close the socket with 1011 after this many appends, on the first `drops` connections
+    drop_after_appends: Optional[int] = None
+    drops: int = 1
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MockScript":
+        data = dict(data)
+        if "turns" in data:
+            data["turns"] = [Turn(**t) for t in data["turns"]]
+        return cls(**data)
+
+    @classmethod
+    def from_file(cls, path: str) -> "MockScript":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def _event(event_type: str, **fields) -> str:
+    return json.dumps({"event_id": f"event_{uuid.uuid4().hex[:12]}", "type": event_type, **fields})
+
+
+class MockRealtimeConnection:
+    """State for one client connection."""
+
+    def __init__(self, ws: web.WebSocketResponse, script: MockScript, stats: dict) -> None:
+        self.ws = ws
+        self.script = script
+        self.stats = stats
+        self.turns = itertools.cycle(script.turns)
+        self.session = {
+            "id": f"sess_{uuid.uuid4().hex[:12]}",
+            "modalities": ["audio", "text"],
+            "turn_detection": {"type": "server_vad", "create_response": True},
+        }
+        self.appends = 0
+        self.in_speech = False
+        self.audio_ms = 0.0
+        self.silence_run_ms = 0.0
+        self.speech_start_ms = 0.0
+        self.pending_turn: Optional[Turn] = None
+        self.response_task: Optional[asyncio.Task] = None
+        self.response_id: Optional[str] = None
+
+    async def send(self, event_type: str, **fields) -> None:
+        if not self.ws.closed:
+            payload = _event(event_type, **fields)
+            await self.ws.send_str(payload)
+            self.stats["events_sent"] += 1
+            self.stats["bytes_sent"] += len(payload)
+
+    async def run(self) -> None:
+        await asyncio.sleep(self.script.session_created_ms / 1000)
+        await self.send("session.created", session=self.session)
+
+        async for msg in self.ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            event = json.loads(msg.data)
+            await self.handle(event)
+
+        if self.response_task:
+            self.response_task.cancel()
+
+    async def handle(self, event: dict) -> None:
+        event_type = event.get("type")
+        if event_type == "session.update":
+            self.session.update(event.get("session", {}))
+            await asyncio.sleep(self.script.session_updated_ms / 1000)
+            await self.send("session.updated", session=self.session)
+        elif event_type == "input_audio_buffer.append":
+            await self.on_audio(base64.b64decode(event.get("audio", "")))
+        elif event_type == "input_audio_buffer.commit":
+            await self.end_of_speech()
+        elif event_type == "response.create":
+            self.start_response(self.pending_turn or next(self.turns))
+        elif event_type == "response.cancel":
+            if self.response_task and not self.response_task.done():
+                self.response_task.cancel()
+                self.stats["responses_cancelled"] += 1
+                await self.send("response.done", response={"id": self.response_id, "status": "cancelled"})
+        else:
+            log.debug(f"mock: ignoring client event {event_type}")
+
+    async def on_audio(self, pcm: bytes) -> None:
+        self.appends += 1
+        self.stats["appends"] += 1
+        self.stats["audio_bytes"] += len(pcm)
+        if self.script.error_after_appends and self.appends == self.script.error_after_appends:
+            await self.send("error", error={"type": "invalid_request_error", "message": "scripted error"})
+        if self.script.drop_after_appends and self.appends == self.script.drop_after_appends:
+            if self.stats["drops"] < self.script.drops:
+                self.stats["drops"] += 1
+                await self.ws.close(code=1011, message=b"scripted drop")
+                return
+
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if not len(samples):
+            return
+        chunk_ms = 1000 * len(samples) / SAMPLE_RATE
+        rms = float(np.sqrt(np.mean((samples / 32768.0) ** 2)))
+        self.audio_ms += chunk_ms
+        if self.session.get("turn_detection") is None:
+            return  # turns end on input_audio_buffer.commit
+
+        if rms >= self.script.speech_threshold:
+            self.silence_run_ms = 0.0
+            if not self.in_speech:
+                self.in_speech = True
+                self.speech_start_ms = self.audio_ms - chunk_ms
+                await self.send("input_audio_buffer.speech_started", audio_start_ms=int(self.speech_start_ms))
+        elif self.in_speech:
+            self.silence_run_ms += chunk_ms
+            if self.silence_run_ms >= self.script.silence_ms:
+                await self.end_of_speech()
+
+    async def end_of_speech(self) -> None:
+        self.in_speech = False
+        self.silence_run_ms = 0.0
+        item_id = f"item_{uuid.uuid4().hex[:12]}"
+        await self.send("input_audio_buffer.speech_stopped", audio_end_ms=int(self.audio_ms), item_id=item_id)
+        await self.send("input_audio_buffer.committed", item_id=item_id)
+        await self.send("conversation.item.created", item={"id": item_id, "type": "message", "role": "user", "content": []})
+
+        turn = next(self.turns)
+        self.pending_turn = turn
+        self.stats["turns"] += 1
+        asyncio.create_task(self.transcribe(item_id, turn))
+        turn_detection = self.session.get("turn_detection")
+        if turn_detection is not None and turn_detection.get("create_response", True):
+            self.start_response(turn)
+
+    async def transcribe(self, item_id: str, turn: Turn) -> None:
+        # Partial transcript word by word, then the completed one
+        words = turn.transcript.split(" ")
+        step = self.script.transcription_ms / 1000 / (len(words) + 1)
+        for i, word in enumerate(words):
+            await asyncio.sleep(step)
+            await self.send(
+                "conversation.item.input_audio_transcription.delta",
+                item_id=item_id, content_index=0, delta=word if i == 0 else " " + word,
+            )
+        await asyncio.sleep(step)
+        await self.send(
+            "conversation.item.input_audio_transcription.completed",
+            item_id=item_id, content_index=0, transcript=turn.transcript,
+        )
+
+    def start_response(self, turn: Turn) -> None:
+        if self.response_task and not self.response_task.done():
+            self.response_task.cancel()
+        self.response_task = asyncio.create_task(self.respond(turn))
+
+    async def respond(self, turn: Turn) -> None:
+        response_id = self.response_id = f"resp_{uuid.uuid4().hex[:12]}"
+        with_audio = "audio" in self.session.get("modalities", [])
+        delta_type = "response.audio_transcript.delta" if with_audio else "response.text.delta"
+        # ~delta_interval_ms of silent pcm16 per word, like real audio deltas
+        audio_b64 = base64.b64encode(bytes(int(SAMPLE_RATE * self.script.delta_interval_ms / 1000) * 2)).decode()
+
+        await self.send("response.created", response={"id": response_id, "status": "in_progress"})
+        await asyncio.sleep(self.script.first_delta_ms / 1000)
+        words = turn.reply.split(" ")
+        for i, word in enumerate(words):
+            if with_audio:
+                await self.send("response.audio.delta", response_id=response_id, delta=audio_b64)
+            await self.send(delta_type, response_id=response_id, delta=word if i == 0 else " " + word)
+            self.stats["deltas"] += 1
+            await asyncio.sleep(self.script.delta_interval_ms / 1000)
+        await self.send("response.done", response={"id": response_id, "status": "completed"})
+        await self.send("rate_limits.updated", rate_limits=[{"name": "tokens", "limit": 40000, "remaining": 39000}])
+
+
+class MockRealtimeServer:
+    """aiohttp app serving ``/v1/realtime`` (WebSocket) and ``/v1/models``."""
+
+    def __init__(self, script: Optional[MockScript] = None) -> None:
+        self.script = script or MockScript()
+        self.stats = dict.fromkeys(
+            ("connections", "appends", "audio_bytes", "events_sent", "bytes_sent", "turns", "deltas", "responses_cancelled", "drops"), 0
+        )
+        self.app = web.Application()
+        self.app.router.add_get("/v1/realtime", self.realtime)
+        self.app.router.add_get("/v1/models", self.models)
+        self._runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+
+    async def models(self, request: web.Request) -> web.Response:
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            return web.json_response({"error": "missing key"}, status=401)
+        return web.json_response({"object": "list", "data": [{"id": "gpt-4o-realtime-preview", "object": "model"}]})
+
+    async def realtime(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=4 * 1024 * 1024)
+        await ws.prepare(request)
+        self.stats["connections"] += 1
+        await MockRealtimeConnection(ws, self.script, self.stats).run()
+        return ws
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        log.info(f"🧪 Mock Realtime API listening on ws://{host}:{self.port}/v1/realtime")
+        return self.port
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def env(self, host: str = "127.0.0.1") -> dict:
+        """Environment overrides that point the app at this server."""
+        return {
+            "OPENAI_API_KEY": "sk-mock",
+            "OPENAI_API_BASE": f"http://{host}:{self.port}/v1",
+            "OPENAI_REALTIME_URL": f"ws://{host}:{self.port}/v1/realtime",
+        }
+
+
+async def _serve(args) -> None:
+    script = MockScript.from_file(args.script) if args.script else MockScript()
+    server = MockRealtimeServer(script)
+    await server.start(args.host, args.port)
+    print(json.dumps({"script": asdict(script), "env": server.env(args.host)}, indent=2))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local mock of the OpenAI Realtime API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--script", help="JSON file with MockScript fields")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Replay a session capture (see ``services/session_capture.py``) through
+the server's audio pipeline: receive -> DSP/VAD -> send, with the
+captured client format, as fast as the DSP allows (or in real time).
+
+Reports throughput and pipeline/VAD stats, can write what would have gone
+upstream as a 24 kHz WAV, and prints the captured event timeline::
+
+    python -m backend.benchmarks.replay_capture captures/<session>.wav [--out upstream.wav] [--events]
+
+For a full-stack repro against the mock Realtime API, pass the same WAV
+to ``backend.benchmarks.e2e_latency``.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+from backend.app.core.audio_pipeline import AudioPipeline
+from backend.app.core.audio_processor import AudioProcessor
+from backend.app.core.config import get_settings
+from backend.app.services.session_capture import load_capture
+
+
+class ReplaySource:
+    """Feeds captured frames to ``AudioPipeline`` in place of the browser socket."""
+
+    def __init__(self, processor: AudioProcessor, frames, interval_s: float = 0.0) -> None:
+        self.processor = processor
+        self.frames = frames
+        self.interval_s = interval_s
+
+    async def receive_frames(self, _websocket):
+        for frame in self.frames:
+            if self.interval_s:
+                await asyncio.sleep(self.interval_s)
+            yield frame
+
+    def process(self, frame: bytes) -> bytes:
+        return self.processor.process(frame)
+
+
+def _summary(entry: dict) -> str:
+    event = entry["event"]
+    text = event.get("transcript") or event.get("delta") or event.get("text") or ""
+    if event.get("type") == "error":
+        text = json.dumps(event.get("error"))
+    return f"{entry['t']:8.3f}s  audio {entry['audio_s']:7.2f}s  {entry['dir']:>3}  {event.get('type')}  {text}"
+
+
+async def replay(path: str, frame_ms: int, realtime: bool, out: Optional[str] = None) -> dict:
+    fmt, audio, events, header = load_capture(path)
+    frame = max(1, fmt.sample_rate * frame_ms // 1000)
+    frames = [audio[i:i + frame].tobytes() for i in range(0, len(audio), frame)]
+
+    processor = AudioProcessor()
+    processor.set_format(fmt)
+    sent = []
+
+    async def sink(pcm: bytes) -> None:
+        sent.append(pcm)
+
+    # Finite source, so the stages drain and finish instead of being cancelled
+    pipeline = AudioPipeline(ReplaySource(processor, frames, frame_ms / 1000 if realtime else 0.0), sink)
+    started = time.perf_counter()
+    await pipeline.run(None)
+    elapsed = time.perf_counter() - started
+
+    upstream = b"".join(sent)
+    if out:
+        rate = get_settings().sampling_rate_out
+        sf.write(out, np.frombuffer(upstream, dtype=np.int16), rate, subtype="PCM_16")
+
+    audio_s = len(audio) / fmt.sample_rate
+    return {
+        "capture": header,
+        "format": fmt.to_message(),
+        "audio_s": round(audio_s, 2),
+        "frames": len(frames),
+        "wall_s": round(elapsed, 3),
+        "speedup": round(audio_s / elapsed, 1) if elapsed else None,
+        "upstream_s": round(len(upstream) / 2 / get_settings().sampling_rate_out, 2),
+        "pipeline": pipeline.stats(),
+        "vad": processor.vad.stats() if processor.vad is not None else None,
+        "events": len(events),
+        "_timeline": [_summary(entry) for entry in events],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("wav", help="capture WAV (its .events.jsonl is read if present)")
+    parser.add_argument("--frame-ms", type=int, default=85, help="client frame size to replay with")
+    parser.add_argument("--realtime", action="store_true", help="pace frames at capture speed")
+    parser.add_argument("--out", help="write the upstream (post-DSP) audio to this WAV")
+    parser.add_argument("--events", action="store_true", help="print the captured event timeline")
+    args = parser.parse_args()
+
+    report = asyncio.run(replay(args.wav, args.frame_ms, args.realtime, args.out))
+    timeline = report.pop("_timeline")
+    print(json.dumps(report, indent=2))
+    if args.events:
+        print("\n".join(timeline))
+
+
+if __name__ == "__main__":
+    main()
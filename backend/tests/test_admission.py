@@ -0,0 +1,44 @@
+import asyncio
+
+from backend.app.services.admission import AdmissionController
+
+
+def _controller(**overrides):
+    options = dict(
+        max_sessions=2, max_upstream=10, pool_size=0, lag_budget_ms=100, cpu_budget=0,
+        queue_size=1, queue_timeout_s=0.2, retry_after_s=3,
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+def test_capacity_counts_pooled_upstream_sockets():
+    assert _controller(max_sessions=50, max_upstream=10, pool_size=4).capacity == 6
+
+
+def test_queues_then_rejects_with_retry_hint():
+    async def run():
+        admission = _controller()
+        assert (await admission.admit()).admitted
+        assert (await admission.admit()).admitted
+
+        queued = asyncio.create_task(admission.admit())
+        await asyncio.sleep(0.01)
+        rejected = await admission.admit()  # queue of one is taken
+        admission.release()
+        waited = await queued
+        timed_out = await admission.admit()
+        return rejected, waited, timed_out, admission.stats()
+
+    rejected, waited, timed_out, stats = asyncio.run(run())
+    assert not rejected.admitted and rejected.retry_after_s == 3
+    assert waited.admitted and waited.waited_s > 0
+    assert not timed_out.admitted and timed_out.reason == "queue timeout"
+    assert stats["active"] == 2 and stats["rejected"] == 2
+
+
+def test_event_loop_lag_holds_new_sessions():
+    admission = _controller(queue_size=0)
+    admission.lag_ms = 250
+    result = asyncio.run(admission.admit())
+    assert not result.admitted and result.reason == "overloaded"
@@ -0,0 +1,39 @@
+from backend.app.services.answer_cache import AnswerCache, answer_key, normalize_question
+from backend.app.services.recipe_parser import RecipeParser
+
+RECIPE = RecipeParser.parse_text("Beef soup\n1. Cut the beef.\n2. Simmer for 20 minutes.", "beef")
+
+
+def test_key_ignores_filler_and_punctuation():
+    assert normalize_question("Um, chefu -- what can I serve with this?") == "what i serve with this"
+    assert answer_key(RECIPE, "What can I serve with this?") == answer_key(RECIPE, "so, what can i serve with this")
+    other = RecipeParser.parse_text("Pancakes\n1. Mix.\n2. Fry.", "pancakes")
+    assert answer_key(other, "What can I serve with this?") != answer_key(RECIPE, "What can I serve with this?")
+
+
+def test_only_llm_questions_about_the_recipe_are_cached():
+    assert answer_key(RECIPE, "can I use pork instead of beef") is not None
+    # The StateMachine answers these; the LLM never sees them
+    for question in ("what ingredients do I need", "how many steps are there"):
+        assert answer_key(RECIPE, question) is None, question
+    # Navigation, timers and replies to the last question depend on the session
+    for question in ("next step please", "say that again", "what do I do now", "what's next",
+                     "how much time is left", "is it done yet", "yes", "thank you"):
+        assert answer_key(RECIPE, question) is None, question
+
+
+def test_lru_byte_budget_and_ttl(monkeypatch):
+    cache = AnswerCache(max_entries=10, max_bytes=10, ttl_s=60)
+    cache.put("a", "12345")
+    cache.put("b", "12345")
+    assert cache.get("a") == "12345"  # now most recent
+    cache.put("c", "123")
+    assert cache.get("b") is None and cache.get("a") and cache.get("c")
+    assert cache.bytes == 8 and cache.evictions == 1
+
+    clock = [0.0]
+    monkeypatch.setattr("backend.app.services.answer_cache.time.monotonic", lambda: clock[0])
+    cache.put("d", "1")
+    clock[0] = 61.0
+    assert cache.get("d") is None
+    assert cache.stats()["hit_rate"] == 0.6
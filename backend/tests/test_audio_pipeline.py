@@ -0,0 +1,68 @@
+import asyncio
+from backend.app.core.audio_pipeline import AudioPipeline, OverflowPolicy, StageQueue
+
+
+def test_drop_oldest_keeps_newest_chunks():
+    async def run():
+        q = StageQueue("test", 2, OverflowPolicy.DROP_OLDEST)
+        for chunk in (b"a", b"b", b"c"):
+            await q.put(chunk)
+        await q.close()
+        return [await q.get(), await q.get(), await q.get()], q.stats()
+
+    items, stats = asyncio.run(run())
+    assert items == [b"b", b"c", None]
+    assert stats["dropped"] == 1
+
+
+def test_merge_appends_to_newest_chunk():
+    async def run():
+        q = StageQueue("test", 2, OverflowPolicy.MERGE)
+        for chunk in (b"a", b"b", b"c"):
+            await q.put(chunk)
+        return [await q.get(), await q.get()], q.stats()
+
+    items, stats = asyncio.run(run())
+    assert items == [b"a", b"bc"]
+    assert stats["merged"] == 1
+
+
+class FakeProcessor:
+    def __init__(self, frames):
+        self.frames = frames
+
+    async def receive_frames(self, websocket):
+        for frame in self.frames:
+            yield frame
+
+    def process(self, frame):
+        return frame.upper()
+
+
+def test_pipeline_runs_stages_in_order():
+    sent = []
+
+    async def sink(pcm):
+        await asyncio.sleep(0)
+        sent.append(pcm)
+
+    async def run():
+        pipeline = AudioPipeline(FakeProcessor([b"one", b"two", b"three"]), sink)
+        await pipeline.run(websocket=None)
+        return pipeline.stats()
+
+    stats = asyncio.run(run())
+    assert b"".join(sent) == b"ONETWOTHREE"
+    assert stats["receive"]["enqueued"] == 3
+
+
+def test_coalescer_packs_fixed_size_appends():
+    from backend.app.core.audio_pipeline import Coalescer
+
+    coalescer = Coalescer(target_bytes=10, deadline_s=0.05)
+    assert coalescer.add(b"a" * 6, now=0.0) == []
+    assert abs(coalescer.time_left(now=0.01) - 0.04) < 1e-9
+    assert coalescer.add(b"b" * 6, now=0.02) == [b"a" * 6 + b"b" * 4]
+    assert coalescer.add(b"c" * 10, now=0.03) == [b"bb" + b"c" * 8]
+    assert coalescer.flush(deadline=True) == b"cc"
+    assert coalescer.stats()["deadline_flushes"] == 1
@@ -0,0 +1,72 @@
+import asyncio
+
+import numpy as np
+import pytest
+from backend.app.core.audio_format import HEADER, HEADER_MAGIC, AudioFormat, AudioFormatError, split_header
+from backend.app.core.audio_processor import AudioProcessor
+
+
+class FakeWebSocket:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.sent = []
+
+    async def receive(self):
+        if not self.messages:
+            return {"type": "websocket.disconnect", "code": 1000}
+        return self.messages.pop(0)
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+def test_pcm16_at_output_rate_passes_through_without_copy():
+    processor = AudioProcessor()
+    processor.set_format(AudioFormat(24_000, "int16", 1))
+    frame = np.arange(2048, dtype=np.int16).tobytes()
+
+    assert processor.process(frame) is frame
+
+
+def test_header_declares_format_and_is_stripped():
+    pcm = np.zeros(480, dtype=np.int16).tobytes()
+    frame = HEADER.pack(HEADER_MAGIC, 24_000, 1, 1) + pcm
+
+    fmt, payload = split_header(frame)
+    assert fmt == AudioFormat(24_000, "int16", 1)
+    assert bytes(payload) == pcm
+
+
+def test_handshake_switches_format_before_audio():
+    pcm = np.zeros(4096, dtype=np.int16).tobytes()
+    ws = FakeWebSocket([
+        {"type": "websocket.receive", "text": '{"type": "audio_format", "sample_rate": 48000, "format": "int16", "channels": 2}'},
+        {"type": "websocket.receive", "bytes": pcm},
+    ])
+
+    async def run():
+        processor = AudioProcessor()
+        chunks = [c async for c in _until_disconnect(processor.stream_chunks(ws))]
+        return processor, chunks
+
+    processor, chunks = asyncio.run(run())
+    assert ws.sent[0]["accepted"] is True
+    assert processor.format_locked
+    # 2048 stereo frames at 48 kHz -> 1024 mono samples at 24 kHz
+    assert len(chunks[0]) == 1024 * 2
+
+
+def test_format_is_fixed_once_audio_flows():
+    processor = AudioProcessor()
+    processor.format_locked = True
+    with pytest.raises(AudioFormatError):
+        processor.set_format(AudioFormat(16_000, "int16", 1))
+
+
+async def _until_disconnect(agen):
+    from starlette.websockets import WebSocketDisconnect
+    try:
+        async for item in agen:
+            yield item
+    except WebSocketDisconnect:
+        return
@@ -0,0 +1,66 @@
+import asyncio
+
+import numpy as np
+from backend.app.core.audio_format import AudioFormat
+from backend.app.core.config import Settings
+from backend.app.services.batch import process_recording, split_utterances
+from backend.app.services.openai_client import OpenAIRealtimeClient
+from backend.benchmarks.mock_realtime import MockRealtimeServer, MockScript, Turn
+
+RECIPE = "Pancakes\n1. Whisk the batter.\n2. Heat the pan.\n3. Fry until golden."
+
+
+def _track(rate: int, voiced_s: float, gaps_s: list) -> np.ndarray:
+    """Voiced bursts separated by silences of ``gaps_s``."""
+    voiced = (0.3 * np.sin(np.arange(int(rate * voiced_s)) / 10)).astype(np.float32)
+    parts = [voiced]
+    for gap in gaps_s:
+        parts += [np.zeros(int(rate * gap), dtype=np.float32), voiced]
+    return np.concatenate(parts + [np.zeros(rate // 2, dtype=np.float32)])
+
+
+def test_split_utterances_on_pauses():
+    rate = 24_000
+    pcm = (_track(rate, 0.5, [1.0, 0.2]) * 32767).astype(np.int16)
+    spans = split_utterances(pcm, rate, threshold_db=-45, silence_ms=500, pad_ms=0)
+    # The 200 ms pause is within an utterance; the 1 s one splits
+    assert [(round(s / rate, 2), round(e / rate, 2)) for s, e in spans] == [(0.0, 0.5), (1.5, 2.7)]
+    assert split_utterances(np.zeros(rate, dtype=np.int16), rate, -45, 500) == []
+
+
+def test_recording_drives_state_machine_against_mock():
+    script = MockScript(
+        turns=[
+            Turn("next step", "Unused."),
+            Turn("next step", "Unused."),
+            Turn("what can I substitute for milk", "Use water."),
+        ],
+        first_delta_ms=0, delta_interval_ms=0, transcription_ms=0,
+    )
+    rate = 48_000
+    audio = _track(rate, 0.6, [1.0, 1.0])[:, None]
+
+    async def run():
+        mock = MockRealtimeServer(script)
+        await mock.start()
+        client = OpenAIRealtimeClient(server_vad=False)
+        client.settings = Settings(**{k.lower(): v for k, v in mock.env().items()})
+        try:
+            return await process_recording(audio, AudioFormat(rate), RECIPE, client=client), mock.stats
+        finally:
+            await mock.stop()
+
+    result, stats = asyncio.run(run())
+    turns = result["turns"]
+    assert [t["transcript"] for t in turns] == ["next step", "next step", "what can I substitute for milk"]
+    assert [t["intent"] for t in turns] == ["next", "next", "unknown"]
+    assert turns[0]["tts"][0].startswith("Great! Let me help you with this recipe. Step one: Whisk the batter.")
+    assert turns[1]["tts"] == ["Next step: Heat the pan."]
+    # Navigation turns are answered locally; only the question reaches the LLM
+    assert [t["reply"] for t in turns] == [None, None, "Use water."]
+    assert result["transitions"] == [
+        {"turn": 0, "from": 0, "to": 0, "started": True},
+        {"turn": 1, "from": 0, "to": 1, "started": True},
+    ]
+    assert result["final_step"] == 1
+    assert stats["turns"] == 3
@@ -0,0 +1,37 @@
+import logging
+
+from backend.app.core import hotlog
+from backend.app.core.hotlog import SampledLogger
+
+
+class Boom:
+    def __str__(self):
+        raise AssertionError("formatted a line that was not emitted")
+
+
+def test_sampled_logger_emits_one_in_n(caplog, monkeypatch):
+    monkeypatch.setitem(hotlog._every, "test", 3)
+    sampled = SampledLogger(logging.getLogger("chefu.test"), "test")
+    with caplog.at_level(logging.INFO, logger="chefu.test"):
+        for i in range(1, 10):
+            sampled.info("chunk %d", i)
+    assert [r.getMessage() for r in caplog.records] == ["chunk 3", "chunk 6", "chunk 9"]
+
+
+def test_sampled_logger_is_lazy(caplog, monkeypatch):
+    monkeypatch.setitem(hotlog._every, "test", 0)
+    sampled = SampledLogger(logging.getLogger("chefu.test"), "test")
+    with caplog.at_level(logging.DEBUG, logger="chefu.test"):
+        sampled.info("never %s", Boom())
+    monkeypatch.setitem(hotlog._every, "test", 1)
+    with caplog.at_level(logging.INFO, logger="chefu.test"):
+        sampled.debug("below level %s", Boom())
+    assert caplog.records == []
+
+
+def test_deferred_queue_handler_does_not_format():
+    records = []
+    handler = hotlog._DeferredQueueHandler(None)
+    handler.enqueue = records.append
+    handler.handle(logging.LogRecord("chefu.test", logging.INFO, __file__, 1, "late %s", (Boom(),), None))
+    assert records[0].args and records[0].msg == "late %s"
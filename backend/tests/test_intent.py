@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+
+from backend.app.core.intent import IncrementalIntentDetector, IntentMatcher, classify_intent
+from backend.app.core.state_machine import Intent
+
+CORPUS = Path(__file__).resolve().parents[1] / "benchmarks" / "intent_corpus.json"
+
+
+def test_corpus_accuracy():
+    corpus = json.loads(CORPUS.read_text())
+    misses = [(text, want, classify_intent(text)) for text, want in corpus if classify_intent(text) != Intent(want)]
+    assert not misses
+
+
+def test_matches_whole_words_only():
+    assert classify_intent("that looks good") == Intent.UNKNOWN
+    assert classify_intent("GO!") == Intent.NEXT
+
+
+def test_longer_phrase_outscores_its_prefix():
+    matcher = IntentMatcher({Intent.REPEAT: ["current"], Intent.STEP_QUESTION: ["current step"]})
+    assert matcher.classify("what's the current step") == Intent.STEP_QUESTION
+    assert matcher.classify("what's current") == Intent.REPEAT
+
+
+def test_incremental_commits_once_words_are_complete():
+    detector = IncrementalIntentDetector()
+    assert detector.feed("Next") is None  # could still be "nextly"
+    assert detector.feed(" step") == Intent.NEXT
+    assert detector.feed(" please.") is None  # one intent per utterance
+    assert detector.finish("Next step please.") is None
+
+    assert detector.feed("go") is None
+    assert detector.feed("od") is None
+    assert detector.finish("good") == Intent.UNKNOWN
+
+
+def test_incremental_waits_for_longer_phrases():
+    detector = IncrementalIntentDetector()
+    assert detector.feed("what") is None
+    assert detector.feed(" step") is None  # "step" may still be "steps"
+    assert detector.feed(" are we on") == Intent.STEP_QUESTION
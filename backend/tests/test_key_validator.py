@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+from backend.app.services.key_validator import ApiKeyValidator, KeyStatus
+
+
+class CountingValidator(ApiKeyValidator):
+    def __init__(self, **kwargs):
+        super().__init__("sk-test", ttl_s=60, timeout_s=1, base_url="http://localhost", **kwargs)
+        self.fetches = 0
+
+    async def _fetch_status(self):
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        return KeyStatus(True, time.monotonic(), latency_ms=10)
+
+
+def test_connection_storm_shares_one_check():
+    validator = CountingValidator()
+
+    async def run():
+        results = await asyncio.gather(*(validator.validate() for _ in range(50)))
+        await validator.validate()
+        return results
+
+    results = asyncio.run(run())
+    assert all(r.valid for r in results)
+    assert validator.fetches == 1
+
+
+def test_unconfigured_key_is_invalid_without_upstream_call():
+    validator = ApiKeyValidator("your_openai_api_key_here", ttl_s=60, timeout_s=1, base_url="http://localhost")
+
+    status = asyncio.run(validator.validate())
+    assert status.valid is False
+    assert validator.checks == 0
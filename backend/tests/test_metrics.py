@@ -0,0 +1,37 @@
+import threading
+
+from backend.app.core import audio_pipeline, metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("test_latency_seconds", "test", (0.1, 0.5), registry=[])
+    for value in (0.05, 0.1, 0.3, 2.0):
+        histogram.observe(value)
+    lines = histogram.render()
+    assert 'test_latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 'test_latency_seconds_bucket{le="0.5"} 3' in lines
+    assert 'test_latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "test_latency_seconds_count 4" in lines
+    assert "test_latency_seconds_sum 2.45" in lines
+
+
+def test_counter_sums_per_thread_shards():
+    counter = metrics.Counter("test_events_total", "test", registry=[])
+
+    def work():
+        for _ in range(10_000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.value == 40_000
+
+
+def test_render_exposes_pipeline_metrics():
+    assert audio_pipeline.QUEUE_DEPTH is metrics.QUEUE_DEPTH
+    text = metrics.render()
+    assert "# TYPE chefu_push_audio_seconds histogram" in text
+    assert 'chefu_audio_queue_depth{stage="receive"} 0' in text
@@ -0,0 +1,128 @@
+import asyncio
+
+import numpy as np
+import pytest
+from backend.app.core.config import Settings
+from backend.app.services import openai_client
+from backend.app.services.openai_client import OpenAIRealtimeClient
+from backend.benchmarks.mock_realtime import MockRealtimeServer, MockScript, Turn
+
+
+@pytest.mark.parametrize("raw_text_frames", [True, False])
+def test_client_round_trip_against_mock(monkeypatch, raw_text_frames):
+    # The mock only reads text frames, so the public send() fallback must produce them too
+    monkeypatch.setattr(openai_client, "RAW_TEXT_FRAMES", raw_text_frames)
+    script = MockScript(
+        turns=[Turn("next step", "Moving on.")],
+        first_delta_ms=0, delta_interval_ms=0, transcription_ms=0,
+    )
+
+    async def run():
+        mock = MockRealtimeServer(script)
+        await mock.start()
+        client = OpenAIRealtimeClient()
+        client.settings = Settings(**{k.lower(): v for k, v in mock.env().items()})
+        received = []
+        try:
+            async with client:
+                voiced = (0.3 * np.sin(np.arange(12_000) / 10) * 32767).astype(np.int16)
+                await client.push_audio(voiced.tobytes())
+                await client.push_audio(np.zeros(24_000, dtype=np.int16).tobytes())
+
+                async def collect():
+                    async for delta in client.receive_text_deltas():
+                        received.append(delta)
+                        text = "".join(d for d in received if not d.startswith("["))
+                        if text.endswith("on.") and "[TRANSCRIPTION: next step]" in received:
+                            return
+
+                await asyncio.wait_for(collect(), timeout=5)
+        finally:
+            await mock.stop()
+        return received, mock.stats
+
+    received, stats = asyncio.run(run())
+    assert "[TRANSCRIPTION: next step]" in received
+    assert [d for d in received if d.startswith("[PARTIAL:")] == ["[PARTIAL: next]", "[PARTIAL:  step]"]
+    assert "".join(d for d in received if not d.startswith("[")) == "Moving on."
+    assert stats["turns"] == 1
+
+
+def test_cancelled_response_deltas_are_dropped():
+    script = MockScript(
+        turns=[Turn("next step", "This reply is cancelled.")],
+        first_delta_ms=200, delta_interval_ms=0, transcription_ms=50,
+    )
+
+    async def run():
+        mock = MockRealtimeServer(script)
+        await mock.start()
+        client = OpenAIRealtimeClient()
+        client.settings = Settings(**{k.lower(): v for k, v in mock.env().items()})
+        received = []
+        try:
+            async with client:
+                voiced = (0.3 * np.sin(np.arange(12_000) / 10) * 32767).astype(np.int16)
+                await client.push_audio(voiced.tobytes())
+                await client.push_audio(np.zeros(24_000, dtype=np.int16).tobytes())
+
+                async def collect():
+                    async for delta in client.receive_text_deltas():
+                        received.append(delta)
+                        if delta.startswith("[PARTIAL:"):
+                            await client.cancel_response()
+
+                try:
+                    await asyncio.wait_for(collect(), timeout=0.6)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await mock.stop()
+        return received, mock.stats
+
+    received, stats = asyncio.run(run())
+    assert "[TRANSCRIPTION: next step]" in received
+    assert [d for d in received if not d.startswith("[")] == []
+    assert stats["responses_cancelled"] == 1
+
+
+def test_dropped_socket_reconnects_and_replays_audio():
+    script = MockScript(
+        turns=[Turn("next step", "Moving on.")],
+        first_delta_ms=0, delta_interval_ms=0, transcription_ms=0, drop_after_appends=3,
+    )
+
+    async def run():
+        mock = MockRealtimeServer(script)
+        await mock.start()
+        client = OpenAIRealtimeClient()
+        client.settings = Settings(
+            **{k.lower(): v for k, v in mock.env().items()}, upstream_reconnect_base_s=0.01
+        )
+        received = []
+        try:
+            async with client:
+                async def collect():
+                    async for delta in client.receive_text_deltas():
+                        received.append(delta)
+                        text = "".join(d for d in received if not d.startswith("["))
+                        if text.endswith("on.") and "[TRANSCRIPTION: next step]" in received:
+                            return
+
+                task = asyncio.create_task(collect())
+                # 0.5 s of speech then silence, in 100 ms chunks; the socket drops after the third
+                voiced = (0.3 * np.sin(np.arange(12_000) / 10) * 32767).astype(np.int16)
+                audio = np.concatenate([voiced, np.zeros(24_000, dtype=np.int16)])
+                for i in range(0, len(audio), 2_400):
+                    await client.push_audio(audio[i:i + 2_400].tobytes())
+                    await asyncio.sleep(0.01)
+                await asyncio.wait_for(task, timeout=5)
+        finally:
+            await mock.stop()
+        return received, client, mock.stats
+
+    received, client, stats = asyncio.run(run())
+    assert stats["drops"] == 1 and stats["connections"] == 2
+    assert client.reconnects == 1
+    assert "[TRANSCRIPTION: next step]" in received
+    assert "".join(d for d in received if not d.startswith("[")) == "Moving on."
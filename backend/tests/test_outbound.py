@@ -0,0 +1,55 @@
+import asyncio
+
+from starlette.websockets import WebSocketState
+from backend.app.api.outbound import OutboundWriter
+
+
+class FakeWebSocket:
+    application_state = WebSocketState.CONNECTED
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+def test_deltas_are_batched_within_window():
+    ws = FakeWebSocket()
+
+    async def run():
+        writer = OutboundWriter(ws, window_ms=20, max_bytes=1000)
+        for word in ["Chop", " the", " onions", "."]:
+            await writer.delta(word)
+        await asyncio.sleep(0.05)
+        return writer.stats()
+
+    stats = asyncio.run(run())
+    assert ws.sent == [{"delta": "Chop the onions."}]
+    assert stats["deltas_in"] == 4 and stats["frames_sent"] == 1
+    assert stats["bytes_saved"] > 0
+
+
+def test_control_message_flushes_pending_deltas_first():
+    ws = FakeWebSocket()
+
+    async def run():
+        writer = OutboundWriter(ws, window_ms=1000, max_bytes=1000)
+        await writer.delta("Next")
+        await writer.send({"tts": "Step two"})
+        await writer.close()
+
+    asyncio.run(run())
+    assert ws.sent == [{"delta": "Next"}, {"tts": "Step two"}]
+
+
+def test_byte_budget_forces_flush():
+    ws = FakeWebSocket()
+
+    async def run():
+        writer = OutboundWriter(ws, window_ms=1000, max_bytes=8)
+        await writer.delta("1234")
+        await writer.delta("5678")
+        return list(ws.sent)
+
+    assert asyncio.run(run()) == [{"delta": "12345678"}]
@@ -0,0 +1,26 @@
+import base64
+import json
+
+from backend.app.services.realtime_codec import AppendEncoder, dumps, loads, sniff_type
+
+
+def test_append_envelope_is_valid_json():
+    encoder = AppendEncoder(initial_pcm_bytes=16)
+    for pcm in (b"\x01\x02" * 4, b"\x03\x04" * 100, b"\x05"):
+        event = json.loads(bytes(encoder.encode(pcm)))
+        assert event == {"type": "input_audio_buffer.append", "audio": base64.b64encode(pcm).decode()}
+
+
+def test_dumps_loads_round_trip():
+    message = {"type": "session.update", "session": {"modalities": ["text"]}}
+    assert loads(dumps(message)) == message
+
+
+def test_sniff_type_reads_the_prefix_only():
+    audio = json.dumps({"event_id": "event_1", "type": "response.audio.delta", "delta": "A" * 100})
+    assert sniff_type(audio) == "response.audio.delta"
+    assert sniff_type(audio.encode()) == "response.audio.delta"
+    assert sniff_type('{ "type" : "rate_limits.updated", "rate_limits": []}') == "rate_limits.updated"
+    # Anywhere else, the caller falls back to a full decode
+    assert sniff_type('{"delta": "x", "type": "response.text.delta"}') is None
+    assert sniff_type('{"response": {"type": "x"}, "type": "response.done"}') is None
@@ -0,0 +1,56 @@
+import asyncio
+
+from backend.app.services.realtime_pool import RealtimeSessionPool
+
+
+class FakeClient:
+    created = 0
+
+    def __init__(self):
+        FakeClient.created += 1
+        self.connected = False
+        self.closed = False
+
+    async def connect(self):
+        await asyncio.sleep(0)
+        self.connected = True
+        return self
+
+    async def ping(self, timeout=5.0):
+        return self.connected
+
+    async def close(self):
+        self.connected = False
+        self.closed = True
+
+
+def test_pool_hands_out_warm_sessions_and_refills():
+    async def run():
+        pool = RealtimeSessionPool(size=2, max_idle_s=60, check_interval_s=60, client_factory=FakeClient)
+        pool.start()
+        for _ in range(20):
+            await asyncio.sleep(0)
+        client = await pool.acquire()
+        for _ in range(20):
+            await asyncio.sleep(0)
+        stats = pool.stats()
+        await pool.stop()
+        return client, stats
+
+    client, stats = asyncio.run(run())
+    assert client.connected
+    assert stats["hits"] == 1 and stats["misses"] == 0
+    assert stats["ready"] == 2
+
+
+def test_expired_sessions_are_discarded():
+    async def run():
+        pool = RealtimeSessionPool(size=1, max_idle_s=0, check_interval_s=60, client_factory=FakeClient)
+        await pool._add_one()
+        stale = pool._idle[0].client
+        client = await pool.acquire()
+        return pool.stats(), stale, client
+
+    stats, stale, client = asyncio.run(run())
+    assert stale.closed and client is not stale
+    assert stats["expired"] == 1 and stats["misses"] == 1
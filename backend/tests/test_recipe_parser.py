@@ -1,4 +1,6 @@
 import asyncio
+
+import pytest
 from backend.app.services.recipe_parser import RecipeParser
 
 
@@ -9,7 +11,7 @@ def test_regex_parse():
         return await RecipeParser.parse(text)
 
     recipe = asyncio.run(run())
-    assert recipe.steps == ["step one", "step two"]
+    assert recipe.steps == ("step one", "step two")
 
 
 def test_fallback_parse():
@@ -19,4 +21,33 @@ def test_fallback_parse():
         return await RecipeParser.parse(text)
 
     recipe = asyncio.run(run())
-    assert recipe.steps == ["step one", "step two"]
+    assert recipe.steps == ("step one", "step two")
+
+
+def test_structured_parse():
+    text = (
+        "Beef soup\n\nIngredients:\n- 500 g beef\n- 1 ½ tbsp soy sauce\n\n"
+        "Instructions\n1. Cut the beef.\n2. Simmer for 1 hour and 30 minutes.\n3. Rest 10-15 mins, then serve."
+    )
+    recipe = RecipeParser.parse_text(text)
+    assert recipe.title == "Beef soup"
+    assert recipe.ingredients == ("500 g beef", "1 ½ tbsp soy sauce")
+    assert recipe.spoken_ingredients == ("500 grams beef", "1 and a half tablespoons soy sauce")
+    assert recipe.steps[1] == "Simmer for 1 hour and 30 minutes."
+    assert [(t.step, t.duration.total_seconds()) for t in recipe.timers] == [(1, 5400), (2, 600)]
+    assert recipe.spoken_steps[2] == "Rest 10 to 15 minutes, then serve."
+
+
+def test_same_content_shares_one_recipe():
+    async def run():
+        first = await RecipeParser.parse("Soup\n1. Boil water.\n2. Add salt.")
+        second = await RecipeParser.parse("  Soup\r\n\r\n1.   Boil water.\n2. Add salt.  ")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert first.content_hash
+    # Shared between sessions, so no session can change it for the others
+    for sequence in (first.steps, first.timers, first.ingredients, first.spoken_steps, first.spoken_ingredients):
+        with pytest.raises(AttributeError):
+            sequence.append("x")
@@ -0,0 +1,32 @@
+import numpy as np
+from backend.app.core.resampler import StreamingResampler, design_filter
+
+
+def _sine(rate, seconds=1.0, freq=440.0):
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_chunked_matches_one_shot():
+    for rate_in, rate_out in [(48_000, 24_000), (44_100, 24_000), (16_000, 24_000)]:
+        x = _sine(rate_in)
+        whole = StreamingResampler(rate_in, rate_out).resample(x).copy()
+
+        streaming = StreamingResampler(rate_in, rate_out)
+        parts = [streaming.resample(x[i:i + 4096]).copy() for i in range(0, len(x), 4096)]
+
+        assert len(whole) == rate_out
+        np.testing.assert_allclose(np.concatenate(parts), whole, atol=1e-6)
+
+
+def test_process_returns_pcm16_at_output_rate():
+    resampler = StreamingResampler(48_000, 24_000)
+    pcm = resampler.process(_sine(48_000, seconds=4096 / 48_000).tobytes())
+    audio = np.frombuffer(pcm, dtype=np.int16)
+
+    assert len(audio) == 2048
+    assert 16_000 < np.abs(audio[100:]).max() <= 16_384
+
+
+def test_filters_are_cached():
+    assert design_filter(48_000, 24_000) is design_filter(48_000, 24_000)
@@ -0,0 +1,45 @@
+import asyncio
+
+import numpy as np
+
+from backend.app.core.audio_format import AudioFormat
+from backend.app.services.session_capture import SessionCapture, load_capture
+
+
+def test_ring_keeps_only_the_newest_audio():
+    fmt = AudioFormat(16_000, "int16")
+    capture = SessionCapture("s1", seconds=0.5, max_events=10, directory="unused", keep=1)
+    frame = np.zeros(1_600, dtype=np.int16).tobytes()  # 100 ms
+    for _ in range(20):
+        capture.audio(frame, fmt)
+    assert capture.audio_s == 2.0
+    assert capture.stats()["buffered_s"] == 0.5
+
+
+def test_spill_round_trip(tmp_path):
+    fmt = AudioFormat(48_000, "float32", channels=2)
+    capture = SessionCapture("s2", seconds=1.0, max_events=2, directory=str(tmp_path), keep=5)
+    capture.meta = {"recipe_hash": "abc"}
+    audio = np.random.default_rng(0).uniform(-0.5, 0.5, (96_000, 2)).astype(np.float32)
+    for i in range(0, len(audio), 4_800):
+        capture.audio(audio[i:i + 4_800].tobytes(), fmt)
+    capture.event({"type": "response.audio.delta", "delta": "AAAA"})
+    for n in range(3):
+        capture.event({"type": "response.text.delta", "delta": str(n)})
+
+    wav = asyncio.run(capture.spill())
+    loaded_fmt, loaded, events, header = load_capture(str(wav))
+    assert loaded_fmt == fmt
+    np.testing.assert_array_equal(loaded, audio[-48_000:])
+    assert [e["event"]["delta"] for e in events] == ["1", "2"]
+    assert header["recipe_hash"] == "abc" and header["wav_offset_s"] == 1.0
+
+
+def test_spill_prunes_old_captures(tmp_path):
+    fmt = AudioFormat(24_000, "int16")
+    for n in range(3):
+        capture = SessionCapture(f"s{n}", seconds=1.0, max_events=1, directory=str(tmp_path), keep=2)
+        capture.audio(b"\0\0" * 240, fmt)
+        asyncio.run(capture.spill())
+    assert len(list(tmp_path.glob("*.wav"))) == 2
+    assert len(list(tmp_path.glob("*.events.jsonl"))) == 2
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from backend.app.api.websocket import open_session
+from backend.app.core.timer_manager import TimerManager
+from backend.app.core.timer_scheduler import TimerScheduler
+from backend.app.models.recipe import Recipe, Timer
+from backend.app.services.session_store import (
+    MemorySessionStore,
+    SessionSnapshot,
+    SessionStore,
+    SqliteSessionStore,
+    get_session_store,
+)
+
+
+def test_stores_round_trip_and_expire(tmp_path):
+    async def run(store):
+        await store.put(SessionSnapshot("s1", "h1", idx=2, started=True, timers=[{"label": "Step 3", "deadline": 1.0}]))
+        await store.put_recipe("h1", "Soup\n1. Boil.")
+        got = await store.get("s1")
+        recipe = await store.get_recipe("h1")
+        store.ttl_s = -1
+        expired = await store.get("s1")
+        return got, recipe, expired
+
+    for store in (MemorySessionStore(60), SqliteSessionStore(str(tmp_path / "sessions.db"), 60)):
+        got, recipe, expired = asyncio.run(run(store))
+        assert (got.idx, got.started, got.timers) == (2, True, [{"label": "Step 3", "deadline": 1.0}])
+        assert recipe == "Soup\n1. Boil."
+        assert expired is None
+
+
+def test_older_generation_cannot_overwrite(tmp_path):
+    async def run(store):
+        await store.put(SessionSnapshot("s1", "h1", idx=4, started=True, generation=1))
+        stale = await store.put(SessionSnapshot("s1", "h1", idx=1, started=True, generation=0))
+        current = await store.put(SessionSnapshot("s1", "h1", idx=5, started=True, generation=1))
+        return stale, current, (await store.get("s1")).idx
+
+    for store in (MemorySessionStore(60), SqliteSessionStore(str(tmp_path / "sessions.db"), 60)):
+        assert asyncio.run(run(store)) == (False, True, 5)
+
+
+def test_incomplete_store_fails_on_construction():
+    class GetOnlyStore(SessionStore):
+        async def get(self, session_id):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        GetOnlyStore(60)
+
+
+def test_timers_continue_from_snapshot():
+    recipe = Recipe(
+        title="Soup",
+        steps=["Boil for 10 minutes.", "Rest 5 minutes.", "Simmer 1 minute."],
+        timers=[
+            Timer(label="Step 1", duration=timedelta(minutes=10), step=0),
+            Timer(label="Step 2", duration=timedelta(minutes=5), step=1),
+            Timer(label="Step 3", duration=timedelta(minutes=1), step=2),
+        ],
+    )
+
+    async def tts(text):
+        pass
+
+    async def run():
+        before = TimerManager(recipe, tts, TimerScheduler())
+        before.start_all()
+        before.pause("Step 2")
+        state = before.snapshot()
+        await before.cancel_all()
+        state[2]["deadline"] = time.time() - 1  # ran out while disconnected
+
+        after = TimerManager(recipe, tts, TimerScheduler())
+        finished = after.restore(state)
+        remaining = {t.label: t.remaining_sec for t in after.active()}
+        paused = after.handles["Step 2"].state
+        await after.cancel_all()
+        return finished, remaining, paused
+
+    finished, remaining, paused = asyncio.run(run())
+    assert finished == ["Step 3"]
+    assert remaining == {"Step 1": 600, "Step 2": 300}
+    assert paused == "paused"
+
+
+def test_resume_reuses_the_session_and_recipe():
+    async def run():
+        session_id, recipe, snapshot = await open_session("Soup\n1. Boil water.\n2. Add salt.")
+        assert snapshot is None
+        await get_session_store().put(SessionSnapshot(session_id, recipe.content_hash, idx=1, started=True))
+        resumed = await open_session(f'{{"type": "resume", "session_id": "{session_id}"}}')
+        unknown = await open_session('{"type": "resume", "session_id": "nope"}')
+        return session_id, recipe, resumed, unknown
+
+    session_id, recipe, resumed, unknown = asyncio.run(run())
+    assert resumed[0] == session_id and resumed[1] is recipe and resumed[2].idx == 1
+    assert resumed[2].generation == 1
+    assert unknown is None
+
+
+def test_resume_fences_off_the_old_connection():
+    async def run():
+        store = get_session_store()
+        session_id, recipe, _ = await open_session("Stew\n1. Brown the meat.\n2. Add stock.\n3. Simmer.")
+        await store.put(SessionSnapshot(session_id, recipe.content_hash, idx=0, started=True))
+        _, _, snapshot = await open_session(f'{{"type": "resume", "session_id": "{session_id}"}}')
+        # The resumed connection moves on, then the dropped one tears down late
+        await store.put(SessionSnapshot(session_id, recipe.content_hash, idx=2, started=True, generation=snapshot.generation))
+        stale = await store.put(SessionSnapshot(session_id, recipe.content_hash, idx=0, started=True))
+        return stale, (await store.get(session_id)).idx
+
+    assert asyncio.run(run()) == (False, 2)
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import timedelta
+
+from backend.app.core.state_machine import Intent, StateMachine
+from backend.app.core.timer_manager import TimerManager
+from backend.app.core.timer_scheduler import TimerScheduler
+from backend.app.models.recipe import Recipe, Timer
+
+
+def test_fires_in_deadline_order_and_skips_cancelled():
+    async def run():
+        scheduler = TimerScheduler()
+        fired = []
+        scheduler.add(0.03, lambda: fired.append("c"))
+        scheduler.add(0.01, lambda: fired.append("a"))
+        cancelled = scheduler.add(0.02, lambda: fired.append("b"))
+        scheduler.cancel(cancelled)
+        await asyncio.sleep(0.06)
+        return fired, scheduler.stats()
+
+    fired, stats = asyncio.run(run())
+    assert fired == ["a", "c"]
+    assert stats["fired"] == 2 and stats["active"] == 0
+
+
+def test_pause_resume_and_owner_cancel():
+    async def run():
+        scheduler = TimerScheduler()
+        fired = []
+        timer = scheduler.add(0.05, lambda: fired.append("paused"))
+        scheduler.pause(timer)
+        await asyncio.sleep(0.08)
+        assert fired == [] and 0.04 < scheduler.remaining(timer) <= 0.05
+        scheduler.resume(timer)
+
+        owner = object()
+        for i in range(100):
+            scheduler.add(0.01, lambda: fired.append("owned"), owner=owner)
+        assert scheduler.cancel_owner(owner) == 100
+        await asyncio.sleep(0.08)
+        return fired, scheduler.stats()
+
+    fired, stats = asyncio.run(run())
+    assert fired == ["paused"]
+    assert stats["owners"] == 0 and stats["cancelled"] == 100
+
+
+def test_timer_query_reports_real_remaining_time():
+    spoken = []
+
+    async def tts(text):
+        spoken.append(text)
+
+    async def run():
+        recipe = Recipe(
+            title="Soup",
+            steps=["Boil water.", "Simmer for 20 minutes."],
+            timers=[Timer(label="Step 2", duration=timedelta(minutes=20), step=1)],
+        )
+        timers = TimerManager(recipe, tts, TimerScheduler())
+        sm = StateMachine(recipe, tts, timers)
+        await sm.handle(Intent.TIMER_QUERY)
+        await sm.handle(Intent.NEXT)
+        await sm.handle(Intent.NEXT)
+        await sm.handle(Intent.TIMER_QUERY)
+        await timers.cancel_all()
+
+    asyncio.run(run())
+    assert spoken[0] == "No timer is running right now."
+    assert spoken[2].endswith("I've started a 20 minute timer.")
+    assert spoken[3] == "The Step 2 timer has 20 minutes remaining."
+
+
+def test_finished_step_timer_does_not_restart():
+    spoken = []
+
+    async def tts(text):
+        spoken.append(text)
+
+    async def run():
+        recipe = Recipe(
+            title="Soup",
+            steps=["Boil water.", "Simmer for 1 second."],
+            timers=[Timer(label="Step 2", duration=timedelta(seconds=0.05), step=1)],
+        )
+        scheduler = TimerScheduler()
+        timers = TimerManager(recipe, tts, scheduler)
+        sm = StateMachine(recipe, tts, timers)
+        await sm.handle(Intent.NEXT)
+        await sm.handle(Intent.NEXT)
+        await asyncio.sleep(0.1)
+        # NEXT on the last step, and a direct restart of the step, both leave it finished
+        await sm.handle(Intent.NEXT)
+        assert timers.start_for_step(1) == []
+        await asyncio.sleep(0.1)
+        return scheduler.stats()
+
+    stats = asyncio.run(run())
+    assert sum("I've started" in text for text in spoken) == 1
+    assert sum("timer finished" in text for text in spoken) == 1
+    assert stats["fired"] == 1
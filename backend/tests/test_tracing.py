@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+from backend.app.core.tracing import JsonlTraceExporter, TurnTracer
+
+
+def test_turn_marks_spans_and_export(tmp_path):
+    path = tmp_path / "turns.jsonl"
+    exporter = JsonlTraceExporter(str(path), max_bytes=1_000_000, backups=1)
+    tracer = TurnTracer("s1", exporter)
+
+    async def turn():
+        tracer.on_event("input_audio_buffer.speech_started")
+        tracer.on_event("input_audio_buffer.speech_stopped")
+        tracer.on_event("response.text.delta")
+        await asyncio.sleep(0.01)
+        tracer.on_event("response.text.delta")  # only the first delta is marked
+        tracer.mark("intent")
+        with tracer.span("state_machine"):
+            await asyncio.sleep(0.01)
+        return tracer.tag({"tts": "Step one"})
+
+    message = asyncio.run(turn())
+    trace_id = message["trace_id"]
+    tracer.on_event("input_audio_buffer.speech_started")  # next turn closes this one
+    assert tracer.trace_id != trace_id
+    exporter.close()
+
+    record = json.loads(path.read_text().splitlines()[0])
+    assert record["trace_id"] == trace_id and record["turn"] == 1
+    assert list(record["marks"]) == ["speech_stopped", "first_delta", "intent"]
+    assert record["marks"]["intent"] >= record["marks"]["first_delta"] + 10
+    (span,) = record["spans"]
+    assert span["name"] == "state_machine" and span["end_ms"] - span["start_ms"] >= 10
+
+
+def test_tracer_without_exporter_is_inert():
+    tracer = TurnTracer("s2")
+    tracer.on_event("input_audio_buffer.speech_started")
+    tracer.mark("intent")
+    with tracer.span("state_machine"):
+        pass
+    assert tracer.trace_id is None and tracer.tag({"tts": "hi"}) == {"tts": "hi"}
+    tracer.finish()
+
+
+def test_response_still_streaming_stays_with_its_turn():
+    exported = []
+
+    class Exporter:
+        def start(self, trace):
+            pass
+
+        def export(self, trace):
+            exported.append(trace)
+
+    tracer = TurnTracer("s3", Exporter())
+    tracer.on_event("input_audio_buffer.speech_started")
+    tracer.on_event("response.created", "r1")
+    tracer.on_event("input_audio_buffer.speech_started")  # user barges in
+    tracer.on_event("response.text.delta", "r1")
+    tracer.on_event("response.done", "r1")
+    assert [t.turn for t in exported] == [1]
+    assert list(exported[0].marks) == ["response_created", "first_delta", "response_done"]
+    assert tracer.current.turn == 2 and tracer.current.marks == {}
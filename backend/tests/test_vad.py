@@ -0,0 +1,45 @@
+import numpy as np
+from backend.app.core.config import Settings
+from backend.app.core.vad import EnergyVAD
+
+RATE = 24_000
+CHUNK = 2048
+
+
+def _chunks(signal):
+    pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+    return [pcm[i:i + CHUNK].tobytes() for i in range(0, len(pcm), CHUNK)]
+
+
+def _tone(seconds, amplitude=0.3):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return amplitude * np.sin(2 * np.pi * 220 * t)
+
+
+def test_silence_is_dropped():
+    vad = EnergyVAD(Settings(vad_enabled=True), RATE)
+    noise = np.random.default_rng(0).normal(0, 0.001, RATE * 2)
+
+    out = b"".join(vad.gate(c) for c in _chunks(noise))
+    assert out == b""
+
+
+def test_speech_passes_with_preroll_and_hangover():
+    settings = Settings(vad_enabled=True, vad_preroll_ms=100, vad_hangover_ms=200)
+    vad = EnergyVAD(settings, RATE)
+    signal = np.concatenate([np.zeros(RATE), _tone(0.5), np.zeros(RATE)])
+
+    out = b"".join(vad.gate(c) for c in _chunks(signal))
+    kept = len(out) // 2
+    # tone + up to 100 ms pre-roll + ~200 ms hangover (frame-rounded)
+    assert RATE * 0.5 < kept <= RATE * (0.5 + 0.1 + 0.2 + 0.04)
+
+
+def test_keepalive_replaces_long_silence():
+    settings = Settings(vad_enabled=True, vad_silence_mode="keepalive", vad_keepalive_ms=500)
+    vad = EnergyVAD(settings, RATE)
+
+    out = [vad.gate(c) for c in _chunks(np.zeros(RATE * 2))]
+    keepalives = [c for c in out if c]
+    assert 3 <= len(keepalives) <= 4
+    assert all(c == bytes(len(c)) for c in keepalives)
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core import audio_pipeline, timer_scheduler, tracing
+from backend.app.core.config import get_settings
+from backend.app.services import admission, answer_cache, key_validator, realtime_pool, session_store
+from backend.app.services.recipe_parser import RecipeParser
+from backend.benchmarks.mock_realtime import MockRealtimeServer, MockScript, Turn
+
+RECIPE = "Pancakes\n1. Whisk the batter.\n2. Heat the pan.\n3. Fry until golden."
+SINGLETONS = (
+    get_settings,
+    key_validator.get_key_validator,
+    realtime_pool.get_realtime_pool,
+    admission.get_admission_controller,
+    session_store.get_session_store,
+    answer_cache.get_answer_cache,
+    timer_scheduler.get_timer_scheduler,
+    audio_pipeline.get_dsp_executor,
+    tracing.get_trace_exporter,
+)
+
+
+@pytest.fixture
+def app_with_mock(monkeypatch):
+    """The app pointed at a mock Realtime API running on its own event-loop thread."""
+
+    def serve(script: MockScript, **env):
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        mock = MockRealtimeServer(script)
+        asyncio.run_coroutine_threadsafe(mock.start(), loop).result(5)
+        for key, value in {**mock.env(), "REALTIME_POOL_SIZE": "0", **env}.items():
+            monkeypatch.setenv(key, value)
+        for singleton in SINGLETONS:
+            singleton.cache_clear()
+        served.append((mock, loop))
+        from backend.app.main import app
+        return TestClient(app), mock
+
+    served = []
+    yield serve
+    for mock, loop in served:
+        asyncio.run_coroutine_threadsafe(mock.stop(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+    for singleton in SINGLETONS:
+        singleton.cache_clear()
+
+
+def _utterance(rate: int = 48_000) -> list:
+    """0.5 s of voiced audio then 1 s of silence, as browser float32 frames."""
+    voiced = (0.3 * np.sin(np.arange(rate // 2) / 10)).astype(np.float32)
+    audio = np.concatenate([voiced, np.zeros(rate, dtype=np.float32)])
+    return [audio[i:i + 4096].tobytes() for i in range(0, len(audio), 4096)]
+
+
+def test_reply_before_transcript_advances_once(app_with_mock):
+    # whisper-1 style: the reply streams well before the user's transcript arrives
+    script = MockScript(
+        turns=[Turn("next step", "Okay, let's move on to the next step of the recipe now then.")],
+        transcription_ms=1200, first_delta_ms=50, delta_interval_ms=10,
+    )
+    client, _ = app_with_mock(script)
+    with client, client.websocket_connect("/api/v1/ws") as ws:
+        ws.send_text(RECIPE)
+        messages = [ws.receive_json()]
+        ws.send_text("READY")
+        messages.append(ws.receive_json())  # greeting
+        for frame in _utterance():
+            ws.send_bytes(frame)
+        while "transcription" not in messages[-1]:
+            messages.append(ws.receive_json())
+        time.sleep(0.3)  # the transcript's own intent is handled after it is sent
+
+    spoken = [m["tts"] for m in messages if "tts" in m]
+    assert spoken[-1] == "Great! Let me help you with this recipe. Step one: Whisk the batter."
+    snapshot = asyncio.run(session_store.get_session_store().get(messages[0]["session_id"]))
+    assert (snapshot.idx, snapshot.started) == (0, True)
+
+
+def test_intent_answered_turn_skips_the_answer_cache(app_with_mock):
+    script = MockScript(
+        turns=[Turn("what ingredients do I need", "Flour, eggs and milk.")],
+        transcription_ms=0, first_delta_ms=300,
+    )
+    client, _ = app_with_mock(script)
+    recipe = asyncio.run(RecipeParser.parse(RECIPE))
+    answers = answer_cache.get_answer_cache()
+    answers.put(f"{recipe.content_hash}:{answer_cache.normalize_question('what ingredients do I need')}", "A cached answer.")
+    with client, client.websocket_connect("/api/v1/ws") as ws:
+        ws.send_text(RECIPE)
+        messages = [ws.receive_json()]
+        ws.send_text("READY")
+        messages.append(ws.receive_json())  # greeting
+        for frame in _utterance():
+            ws.send_bytes(frame)
+        # The transcript is fully handled before the first reply delta is forwarded;
+        # a cache hit would cancel the reply and speak a second answer instead
+        spoken = []
+        while "delta" not in messages[-1] and len(spoken) < 2:
+            messages.append(ws.receive_json())
+            spoken = [m["tts"] for m in messages[2:] if "tts" in m]
+
+    assert spoken == ["This recipe doesn't list its ingredients separately. I'll mention them as we go through the steps."]
+    assert answers.hits == answers.misses == 0
+
+
+def test_repeated_llm_question_is_answered_from_cache(app_with_mock):
+    reply = "Serve it with rice and a green salad."
+    script = MockScript(
+        turns=[Turn("what can I serve with this", reply)],
+        transcription_ms=0, first_delta_ms=300, delta_interval_ms=10,
+    )
+    client, mock = app_with_mock(script)
+    answers = answer_cache.get_answer_cache()
+    with client, client.websocket_connect("/api/v1/ws") as ws:
+        ws.send_text(RECIPE)
+        ws.receive_json()
+        ws.send_text("READY")
+        ws.receive_json()  # greeting
+        for frame in _utterance():
+            ws.send_bytes(frame)
+        streamed = ""
+        while streamed.strip() != reply:
+            streamed += ws.receive_json().get("delta", "")
+        time.sleep(0.3)  # the reply is cached once its response.done is handled
+
+        # Same question again: the cached reply is spoken and the LLM's cancelled
+        for frame in _utterance():
+            ws.send_bytes(frame)
+        messages, streamed = [], ""
+        while not any("tts" in m for m in messages) and streamed.strip() != reply:
+            messages.append(ws.receive_json())
+            streamed += messages[-1].get("delta", "")
+        time.sleep(0.5)
+
+    assert [m["tts"] for m in messages if "tts" in m] == [reply]
+    assert (answers.hits, answers.misses) == (1, 1)
+    assert mock.stats["responses_cancelled"] == 1
+    assert mock.stats["deltas"] == len(reply.split())
@@ -9,6 +9,12 @@ let audioCtx, processor, vad;
 let isConnected = false;
 let isSpeaking = false;
 let isListening = false;
+// Resume state: the server hands out a session id; a dropped socket reconnects with it
+let sessionId = null;
+let userEnded = false;
+let reconnectAttempts = 0;
+let lastTraceId = null; // server turn trace, quote it in bug reports
+const MAX_RECONNECT_ATTEMPTS = 5;
 
 // Add debugging info
 console.log("chefu - JavaScript loaded");
@@ -38,6 +44,8 @@ function updateButtonState() {
 
 function endSession() {
   console.log("🛑 Ending cooking session");
+  userEnded = true;
+  sessionId = null;
   if (ws) {
     ws.close();
   }
@@ -54,12 +62,17 @@ function endSession() {
   updateButtonState();
 }
 
-async function startCooking() {
-  console.log("🚀 Start button clicked!");
+async function startCooking(resume = false) {
+  resume = resume === true;  // also used as a click handler
+  console.log(resume ? "🔄 Resuming session" : "🚀 Start button clicked!");
   
   try {
-    // Clear any previous transcript
-    transcriptEl.textContent = "";
+    if (!resume) {
+      // Clear any previous transcript
+      transcriptEl.textContent = "";
+      userEnded = false;
+      sessionId = null;
+    }
     
     // Check if we have a recipe
     if (!recipeEl.value.trim()) {
@@ -86,18 +99,33 @@ async function startCooking() {
       isConnected = true;
       updateButtonState();
       
-      transcriptEl.textContent = "Connected! Initializing microphone...\n";
-      
-      console.log("Sending recipe text to server...");
-      ws.send(recipeEl.value);        // first frame = recipe text
-      
-      console.log("Initializing microphone...");
-      await initMic();                // then start audio
+      if (resume && sessionId) {
+        // first frame = resume request; the recipe is only a fallback if the session expired
+        console.log("Resuming session", sessionId);
+        transcriptEl.textContent += "\n[🔄 Reconnected, resuming...]\n";
+        ws.send(JSON.stringify({ type: "resume", session_id: sessionId, recipe: recipeEl.value }));
+      } else {
+        transcriptEl.textContent = "Connected! Initializing microphone...\n";
+        console.log("Sending recipe text to server...");
+        ws.send(recipeEl.value);      // first frame = recipe text
+      }
       
-      transcriptEl.textContent += "Microphone ready! Starting conversation...\n";
+      if (!audioCtx || audioCtx.state === "closed") {
+        console.log("Initializing microphone...");
+        await initMic();              // then start audio
+        transcriptEl.textContent += "Microphone ready! Starting conversation...\n";
+      }
       
       console.log("Sending ready signal to start conversation...");
       ws.send("READY");               // signal that we're ready for conversation
+
+      // Declare our audio format so the server can skip resampling
+      ws.send(JSON.stringify({
+        type: "audio_format",
+        sample_rate: audioCtx.sampleRate,
+        format: "int16",
+        channels: 1
+      }));
       
       console.log("🎤 Voice interaction started!");
     };
@@ -105,6 +133,7 @@ async function startCooking() {
     ws.onmessage = (evt) => {
       console.log("📨 Message received from server:", evt.data);
       const data = JSON.parse(evt.data);
+      if (data.trace_id) lastTraceId = data.trace_id;
       
       // Handle AI response text deltas
       if (data.delta) {
@@ -126,11 +155,31 @@ async function startCooking() {
       
       // Handle errors
       if (data.error) {
-        console.error("❌ Server error:", data.error);
+        console.error("❌ Server error:", data.error, "trace:", lastTraceId);
         transcriptEl.textContent += `\n[❌ Error: ${data.error}]\n`;
       }
       
+      if (data.type === "queued") {
+        console.log("🚦 Server busy, queued at position", data.position);
+        transcriptEl.textContent += `\n[🚦 Server busy - you're number ${data.position} in line...]\n`;
+      }
+      if (data.retry_after) {
+        transcriptEl.textContent += `\n[🚦 Please try again in ${data.retry_after} seconds]\n`;
+      }
+
+      if (data.type === "session") {
+        if (data.session_id) {
+          sessionId = data.session_id;
+          reconnectAttempts = 0;
+        }
+        console.log(data.resumed ? "🔄 Session resumed:" : "🆔 Session started:", data);
+      }
+
       // Handle test mode confirmations (for debugging)
+      if (data.type === "audio_format") {
+        console.log(data.accepted ? "🎚️ Audio format accepted:" : "⚠️ Audio format rejected:", data);
+      }
+
       if (data.type === "audio_received") {
         console.log("🎵 Audio confirmed received:", data);
         if (data.chunk_number % 10 === 0) {  // Only show every 10th to avoid spam
@@ -263,13 +312,22 @@ async function startCooking() {
 
     ws.onclose = (event) => {
       console.log("❌ WebSocket disconnected:", event.code, event.reason);
+      if (!userEnded && sessionId && reconnectAttempts < MAX_RECONNECT_ATTEMPTS) {
+        // Flaky network: keep the mic and resume the same session
+        const delay = Math.min(8000, 500 * 2 ** reconnectAttempts++);
+        console.log(`🔄 Reconnecting in ${delay} ms (attempt ${reconnectAttempts})`);
+        isConnected = false;
+        setTimeout(() => startCooking(true), delay);
+        return;
+      }
       endSession();
     };
 
     ws.onerror = (error) => {
       console.error("💥 WebSocket error:", error);
-      alert("Connection failed. Please make sure the server is running at http://localhost:8000");
-      endSession();
+      if (!sessionId) {
+        alert("Connection failed. Please make sure the server is running at http://localhost:8000");
+      }
     };
 
   } catch (error) {
@@ -290,12 +348,13 @@ async function initMic() {
       throw new Error("Your browser doesn't support microphone access. Please use HTTPS or localhost.");
     }
     
-    audioCtx = new AudioContext({ sampleRate: 48000 });
+    // Capture at the OpenAI input rate so the server can pass pcm16 straight through
+    audioCtx = new AudioContext({ sampleRate: 24000 });
     console.log("🎵 AudioContext created, sample rate:", audioCtx.sampleRate);
     
     const stream = await navigator.mediaDevices.getUserMedia({ 
       audio: {
-        sampleRate: 48000,
+        sampleRate: 24000,
         channelCount: 1,
         echoCancellation: true,
         noiseSuppression: true
@@ -305,7 +364,7 @@ async function initMic() {
     console.log("✅ Microphone access granted, stream:", stream.getTracks()[0].getSettings());
     
     const source = audioCtx.createMediaStreamSource(stream);
-    processor = audioCtx.createScriptProcessor(4096, 1, 1);
+    processor = audioCtx.createScriptProcessor(2048, 1, 1);  // ~85 ms at 24 kHz
     console.log("🎛️ Audio nodes created");
 
     vad = VAD({ 
@@ -333,8 +392,14 @@ async function initMic() {
       
       // Send audio only when voice is detected, WebSocket is open, AND we're in listening mode
       if (vad.triggered && ws && ws.readyState === WebSocket.OPEN && isListening && !isSpeaking) {
-        console.log("📡 Sending audio chunk, size:", float32.buffer.byteLength);
-        ws.send(float32.buffer);
+        // Convert float32 [-1, 1] to int16 PCM (half the bytes of float32)
+        const int16 = new Int16Array(float32.length);
+        for (let i = 0; i < float32.length; i++) {
+          const s = Math.max(-1, Math.min(1, float32[i]));
+          int16[i] = s * 32767;
+        }
+        console.log("📡 Sending audio chunk, size:", int16.buffer.byteLength);
+        ws.send(int16.buffer);
       }
     };
 